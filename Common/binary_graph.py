@@ -0,0 +1,241 @@
+#! usr/bin/env python3
+"""
+Binary, memory-mappable file format for CSR graphs (extension .csrg).
+
+Parsing the text inputs (split per line, split(",") per edge) costs seconds on large graphs at every start.
+The binary format stores the CSRGraph buffers as they are in memory, so loading is an mmap with no copy
+and no parsing, and processes that load the same file share its pages through the page cache.
+
+Layout (little endian, every section starts at a multiple of 8 bytes):
+    header:  magic b"CSRG", format version (uint32), num_nodes (uint64), num_edges (uint64),
+             weight typecode (b"q", b"d" or b"-" for unweighted), label kind (uint8), label start (int64)
+    offsets: num_nodes + 1 int64
+    targets: num_edges int32
+    weights: num_edges int64/float64 (only for weighted graphs)
+    labels:  kind 0: none, the label of dense id i is label start + i
+             kind 1: num_nodes int64
+             kind 2: byte length (uint64) followed by the utf-8 labels separated by newlines
+"""
+
+import mmap
+import struct
+from array import array
+
+from csr_graph import CSRGraph, NodeInterner, buffer_typecode, load_adjacency_list, load_edge_list
+
+BINARY_EXTENSION = ".csrg"
+_MAGIC = b"CSRG"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sIQQcB6xq")
+
+_LABELS_RANGE = 0
+_LABELS_INT = 1
+_LABELS_STR = 2
+
+
+class RangeInterner(NodeInterner):
+    """Interner of the labels start, start + 1, ..., start + n - 1, without a dict."""
+
+    def __init__(self, start, count):
+        self.start = start
+        self.labels = range(start, start + count)
+
+    def intern(self, label):
+        raise TypeError("the labels of a memory-mapped graph are read-only")
+
+    def id_of(self, label):
+        if not isinstance(label, int) or not 0 <= label - self.start < len(self.labels):
+            raise KeyError(label)
+        return label - self.start
+
+    def __contains__(self, label):
+        return isinstance(label, int) and 0 <= label - self.start < len(self.labels)
+
+
+class LazyInterner(NodeInterner):
+    """Interner over a read-only label sequence; the label -> id dict is only built on first use."""
+
+    def __init__(self, labels):
+        self.labels = labels
+        self._ids = None
+
+    @property
+    def ids(self):
+        if self._ids is None:
+            self._ids = {label: node_id for node_id, label in enumerate(self.labels)}
+        return self._ids
+
+    def intern(self, label):
+        raise TypeError("the labels of a memory-mapped graph are read-only")
+
+
+def _sorted_by_label(graph):
+    """Renumbers a graph with integer labels so that dense ids follow the label order.
+
+    Contiguous integer labels (1..n in the course files) then need no label table at all.
+    """
+    labels = graph.labels
+    order = sorted(range(graph.num_nodes), key=labels.__getitem__)
+    new_id = array("i", bytes(4 * graph.num_nodes))
+    for i, old in enumerate(order):
+        new_id[old] = i
+    tails = array("i")
+    offsets = graph.offsets
+    for u in range(graph.num_nodes):
+        tails.extend([new_id[u]] * (offsets[u + 1] - offsets[u]))
+    heads = array("i", (new_id[v] for v in graph.targets))
+    interner = NodeInterner(labels[old] for old in order)
+    return CSRGraph.from_edges(tails, heads, graph.weights, interner, graph.num_nodes)
+
+
+def _pad(f):
+    """Pads the file to the next multiple of 8 bytes."""
+    f.write(bytes(-f.tell() % 8))
+
+
+def save_binary_graph(graph, output_file):
+    """Writes a CSRGraph to the binary format.
+
+    Args:
+        graph (CSRGraph): The graph. Integer labels are renumbered in sorted order first.
+        output_file (str): Path of the .csrg file.
+    """
+    with open(output_file, "wb") as f:
+        write_binary_graph(graph, f)
+
+
+def write_binary_graph(graph, f, sort_labels=True):
+    """Writes a CSRGraph in the binary format to an open binary file (or io.BytesIO).
+
+    Args:
+        graph (CSRGraph): The graph.
+        f: The file object, positioned at a multiple of 8 bytes.
+        sort_labels (bool): Renumber integer labels in sorted order first. With False the dense ids of the
+                            graph are kept (unsorted labels are then stored as a label table).
+    """
+    labels = graph.labels
+    if all(isinstance(label, int) for label in labels):
+        if sort_labels and any(labels[i] > labels[i + 1] for i in range(len(labels) - 1)):
+            graph = _sorted_by_label(graph)
+            labels = graph.labels
+        start = labels[0] if labels else 0
+        contiguous = all(label == start + i for i, label in enumerate(labels))
+        label_kind = _LABELS_RANGE if contiguous else _LABELS_INT
+    else:
+        start = 0
+        label_kind = _LABELS_STR
+
+    weight_code = "-" if graph.weights is None else buffer_typecode(graph.weights)
+    f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, graph.num_nodes, graph.num_edges, weight_code.encode(), label_kind,
+                         start))
+    f.write(array("q", graph.offsets).tobytes())
+    f.write(array("i", graph.targets).tobytes())
+    _pad(f)
+    if graph.weights is not None:
+        f.write(array(weight_code, graph.weights).tobytes())
+    if label_kind == _LABELS_INT:
+        f.write(array("q", labels).tobytes())
+    elif label_kind == _LABELS_STR:
+        data = "\n".join(str(label) for label in labels).encode("utf-8")
+        f.write(struct.pack("<Q", len(data)))
+        f.write(data)
+
+
+def read_text_graph(input_file, file_format):
+    """Parses a text input file of the course projects into a CSRGraph.
+
+    Args:
+        input_file (str): Path to the text file.
+        file_format (str): "scc" (unweighted directed edge list, Project_week1),
+                           "dijkstra" (weighted adjacency list, Project_week2) or
+                           "prim" (weighted undirected edge list with a header line, string labels as parse_graph).
+
+    Returns:
+        CSRGraph: The parsed graph.
+    """
+    if file_format == "scc":
+        return load_edge_list(input_file)
+    if file_format == "dijkstra":
+        return load_adjacency_list(input_file)
+    if file_format == "prim":
+        return load_edge_list(input_file, weighted=True, undirected=True, skip_header=True, label_type=str)
+    raise ValueError(f"unknown file format: {file_format}")
+
+
+def convert_text_file(input_file, output_file, file_format):
+    """Converts a text input file of the course projects to the binary format.
+
+    Args:
+        input_file (str): Path to the text file.
+        output_file (str): Path of the .csrg file.
+        file_format (str): "scc" (unweighted directed edge list, Project_week1),
+                           "dijkstra" (weighted adjacency list, Project_week2) or
+                           "prim" (weighted undirected edge list with a header line, string labels as parse_graph).
+
+    Returns:
+        CSRGraph: The parsed graph.
+    """
+    graph = read_text_graph(input_file, file_format)
+    save_binary_graph(graph, output_file)
+    return graph
+
+
+def load_binary_graph(filename):
+    """Memory-maps a .csrg file as a CSRGraph without copying the buffers.
+
+    The offsets, targets and weights of the returned graph are read-only memoryviews on the mapping,
+    which stays open as long as the graph (graph.mapping).
+
+    Args:
+        filename (str): Path of the .csrg file.
+
+    Returns:
+        CSRGraph: The graph.
+    """
+    with open(filename, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        graph = graph_from_buffer(mapping)
+    except ValueError:
+        mapping.close()
+        raise ValueError(f"{filename} is not a binary graph file (version {_FORMAT_VERSION})")
+    graph.mapping = mapping
+    return graph
+
+
+def graph_from_buffer(buffer):
+    """Returns a CSRGraph whose arrays are memoryviews on a buffer in the binary format (no copy).
+
+    Args:
+        buffer: Any object with the buffer protocol (mmap, shared memory block, bytes).
+
+    Returns:
+        CSRGraph: The graph. The buffer must stay alive and unchanged as long as the graph is used.
+    """
+    magic, version, num_nodes, num_edges, weight_code, label_kind, start = _HEADER.unpack_from(buffer, 0)
+    if magic != _MAGIC or version != _FORMAT_VERSION:
+        raise ValueError(f"not a binary graph (version {_FORMAT_VERSION})")
+
+    view = memoryview(buffer)
+    position = _HEADER.size
+    offsets = view[position:position + 8 * (num_nodes + 1)].cast("q")
+    position += 8 * (num_nodes + 1)
+    targets = view[position:position + 4 * num_edges].cast("i")
+    position += 4 * num_edges
+    position += -position % 8
+    weights = None
+    if weight_code != b"-":
+        weights = view[position:position + 8 * num_edges].cast(weight_code.decode())
+        position += 8 * num_edges
+
+    if label_kind == _LABELS_RANGE:
+        interner = RangeInterner(start, num_nodes)
+    elif label_kind == _LABELS_INT:
+        interner = LazyInterner(view[position:position + 8 * num_nodes].cast("q"))
+    else:
+        (length,) = struct.unpack_from("<Q", buffer, position)
+        position += 8
+        data = bytes(view[position:position + length]).decode("utf-8")
+        interner = LazyInterner(data.split("\n") if num_nodes else [])
+
+    return CSRGraph(offsets, targets, weights, interner)
@@ -0,0 +1,322 @@
+#! usr/bin/env python3
+"""
+Compressed sparse row (CSR) graph shared by the graph projects (SCC, Dijkstra, Prim, clustering).
+
+The dict-of-lists adjacency lists used in the course scripts keep one Python list per vertex and one
+tuple per edge. A CSR graph keeps the whole graph in three flat buffers instead:
+    - offsets: the edges of vertex u are the slice offsets[u]:offsets[u+1]
+    - targets: the head of every edge, grouped by tail
+    - weights: the length/cost of every edge (None for unweighted graphs)
+Vertices are dense integers 0..n-1. Arbitrary vertex labels (ints or strings) are mapped to dense ids
+by a NodeInterner, so algorithms can index plain arrays instead of hashing dict keys.
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the array module is always available
+    np = None
+
+
+class NodeInterner:
+    """Maps arbitrary hashable vertex labels to dense integer ids 0..n-1, in order of first appearance."""
+
+    def __init__(self, labels=()):
+        """Initialize the interner, optionally with an iterable of labels.
+
+        Args:
+            labels (iterable): Labels to intern up front.
+        """
+        self.ids = {}
+        self.labels = []
+        for label in labels:
+            self.intern(label)
+
+    def intern(self, label):
+        """Return the dense id of label, assigning the next free id if the label is new.
+
+        Args:
+            label (hashable): A vertex label.
+
+        Returns:
+            int: The dense id of the label.
+        """
+        node_id = self.ids.get(label)
+        if node_id is None:
+            node_id = len(self.labels)
+            self.ids[label] = node_id
+            self.labels.append(label)
+        return node_id
+
+    def id_of(self, label):
+        """Return the dense id of an already interned label (KeyError if unknown)."""
+        return self.ids[label]
+
+    def label_of(self, node_id):
+        """Return the label of a dense id."""
+        return self.labels[node_id]
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __contains__(self, label):
+        return label in self.ids
+
+
+def buffer_typecode(buffer):
+    """Typecode of an array, or format of a memoryview (memory-mapped or shared memory graph buffers)."""
+    return getattr(buffer, "typecode", None) or buffer.format
+
+
+def _weight_typecode(weights):
+    """Pick an array typecode for the weights: 'q' if they are all integers, 'd' otherwise."""
+    if all(isinstance(w, int) for w in weights):
+        return "q"
+    return "d"
+
+
+class CSRGraph:
+    """Directed graph in compressed sparse row layout. Undirected graphs store every edge in both directions."""
+
+    def __init__(self, offsets, targets, weights=None, interner=None):
+        """Wrap existing CSR buffers.
+
+        Args:
+            offsets (array): n+1 edge offsets, typecode 'q'.
+            targets (array): m edge heads as dense ids, typecode 'i'.
+            weights (array or None): m edge weights, typecode 'q' or 'd'.
+            interner (NodeInterner or None): Label mapping. If None the labels are the dense ids themselves.
+        """
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        if interner is None:
+            interner = NodeInterner(range(len(offsets) - 1))
+        self.interner = interner
+
+    @property
+    def num_nodes(self):
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    @property
+    def labels(self):
+        """List mapping dense id -> original vertex label."""
+        return self.interner.labels
+
+    def __len__(self):
+        return self.num_nodes
+
+    def neighbors(self, u):
+        """Return the heads of the edges leaving dense vertex u."""
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+    def edges(self, u):
+        """Return (head, weight) pairs of the edges leaving dense vertex u."""
+        start, end = self.offsets[u], self.offsets[u + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def degree(self, u):
+        return self.offsets[u + 1] - self.offsets[u]
+
+    @classmethod
+    def from_edges(cls, tails, heads, weights=None, interner=None, num_nodes=None):
+        """Build a CSR graph from parallel sequences of dense tail ids, head ids and optional weights.
+
+        Edges keep their input order within each tail (stable counting sort), so traversals visit
+        neighbors in the same order as the equivalent dict adjacency list.
+
+        Args:
+            tails (sequence of int): Dense tail id of every edge.
+            heads (sequence of int): Dense head id of every edge.
+            weights (sequence or None): Weight of every edge.
+            interner (NodeInterner or None): Label mapping of the dense ids.
+            num_nodes (int or None): Number of vertices, defaults to len(interner) or max id + 1.
+
+        Returns:
+            CSRGraph: The graph.
+        """
+        if num_nodes is None:
+            if interner is not None:
+                num_nodes = len(interner)
+            else:
+                num_nodes = max(max(tails, default=-1), max(heads, default=-1)) + 1
+        num_edges = len(tails)
+        weight_code = None
+        if isinstance(weights, (array, memoryview)):
+            weight_code = buffer_typecode(weights)
+        elif weights is not None:
+            weight_code = _weight_typecode(weights)
+
+        if np is not None and num_edges:
+            tails_np = np.asarray(tails, dtype=np.int64)
+            order = np.argsort(tails_np, kind="stable")
+            counts = np.bincount(tails_np, minlength=num_nodes)
+            offsets = array("q", [0])
+            offsets.frombytes(np.cumsum(counts, dtype=np.int64).tobytes())
+            targets = array("i", np.asarray(heads, dtype=np.int32)[order].tobytes())
+            sorted_weights = None
+            if weights is not None:
+                dtype = np.int64 if weight_code == "q" else np.float64
+                sorted_weights = array(weight_code, np.asarray(weights, dtype=dtype)[order].tobytes())
+            return cls(offsets, targets, sorted_weights, interner)
+
+        # counting sort of the edges by tail
+        offsets = array("q", bytes(8 * (num_nodes + 1)))
+        for u in tails:
+            offsets[u + 1] += 1
+        for u in range(num_nodes):
+            offsets[u + 1] += offsets[u]
+        position = array("q", offsets[:-1])
+        targets = array("i", bytes(4 * num_edges))
+        sorted_weights = array(weight_code, bytes(8 * num_edges)) if weights is not None else None
+        for i in range(num_edges):
+            u = tails[i]
+            slot = position[u]
+            position[u] = slot + 1
+            targets[slot] = heads[i]
+            if sorted_weights is not None:
+                sorted_weights[slot] = weights[i]
+        return cls(offsets, targets, sorted_weights, interner)
+
+    @classmethod
+    def from_adj_list(cls, adj_list):
+        """Build a CSR graph from a dict adjacency list, as produced by the course parsers.
+
+        Args:
+            adj_list (dict): vertex -> list of neighbors, or vertex -> list of (neighbor, weight) tuples.
+
+        Returns:
+            CSRGraph: The graph, with vertex labels interned in dict order.
+        """
+        interner = NodeInterner(adj_list.keys())
+        tails = array("i")
+        heads = array("i")
+        weights = None
+        for vertex, neighbors in adj_list.items():
+            u = interner.id_of(vertex)
+            for neighbor in neighbors:
+                if isinstance(neighbor, tuple):
+                    if weights is None:
+                        weights = []
+                    neighbor, weight = neighbor
+                    weights.append(weight)
+                tails.append(u)
+                heads.append(interner.intern(neighbor))
+        return cls.from_edges(tails, heads, weights, interner)
+
+    def to_adj_list(self):
+        """Convert back to a dict adjacency list keyed by the original labels."""
+        labels = self.labels
+        adj_list = {}
+        for u in range(self.num_nodes):
+            if self.weights is None:
+                adj_list[labels[u]] = [labels[v] for v in self.neighbors(u)]
+            else:
+                adj_list[labels[u]] = [(labels[v], w) for v, w in self.edges(u)]
+        return adj_list
+
+    def reverse(self):
+        """Return the transposed graph (every edge u->v becomes v->u), sharing the interner."""
+        tails = array("i", bytes(4 * self.num_edges))
+        offsets = self.offsets
+        for u in range(self.num_nodes):
+            for slot in range(offsets[u], offsets[u + 1]):
+                tails[slot] = u
+        return CSRGraph.from_edges(self.targets, tails, self.weights, self.interner, self.num_nodes)
+
+    def as_numpy(self):
+        """Return zero-copy NumPy views (offsets, targets, weights) of the buffers. Requires numpy."""
+        if np is None:
+            raise ImportError("numpy is required for CSRGraph.as_numpy")
+        offsets = np.frombuffer(self.offsets, dtype=np.int64)
+        targets = np.frombuffer(self.targets, dtype=np.int32)
+        weights = None
+        if self.weights is not None:
+            weights = np.frombuffer(self.weights, dtype=np.int64 if buffer_typecode(self.weights) == "q" else np.float64)
+        return offsets, targets, weights
+
+    def nbytes(self):
+        """Total size in bytes of the CSR buffers (labels not included)."""
+        size = self.offsets.itemsize * len(self.offsets) + self.targets.itemsize * len(self.targets)
+        if self.weights is not None:
+            size += self.weights.itemsize * len(self.weights)
+        return size
+
+
+def load_edge_list(filename, weighted=False, undirected=False, skip_header=False, label_type=int):
+    """Parse an edge list file ("tail head [weight]" per line) into a CSR graph.
+
+    This covers the SCC input (unweighted, directed), the Prim input and the clustering input
+    (weighted, undirected, with a header line).
+
+    Args:
+        filename (str): Path to the input file.
+        weighted (bool): If True the third column is the edge weight.
+        undirected (bool): If True every edge is stored in both directions.
+        skip_header (bool): If True the first line (vertex/edge counts) is skipped.
+        label_type (callable): Converts the vertex tokens into labels (int, str, ...).
+
+    Returns:
+        CSRGraph: The graph, with vertex labels interned in order of first appearance.
+    """
+    interner = NodeInterner()
+    intern = interner.intern
+    tails = array("i")
+    heads = array("i")
+    weights = [] if weighted else None
+    with open(filename, "r") as f:
+        if skip_header:
+            next(f)
+        for line in f:
+            fields = line.split()
+            if not fields:
+                continue
+            u = intern(label_type(fields[0]))
+            v = intern(label_type(fields[1]))
+            tails.append(u)
+            heads.append(v)
+            if weighted:
+                weights.append(int(fields[2]))
+            if undirected:
+                tails.append(v)
+                heads.append(u)
+                if weighted:
+                    weights.append(weights[-1])
+    if weighted:
+        weights = array("q", weights)
+    return CSRGraph.from_edges(tails, heads, weights, interner)
+
+
+def load_adjacency_list(filename):
+    """Parse a weighted adjacency list file ("vertex neighbor,length neighbor,length ...") into a CSR graph.
+
+    This is the Dijkstra input format of course 2, week 2.
+
+    Args:
+        filename (str): Path to the input file.
+
+    Returns:
+        CSRGraph: The graph, with vertex labels interned in file order.
+    """
+    interner = NodeInterner()
+    intern = interner.intern
+    tails = array("i")
+    heads = array("i")
+    weights = array("q")
+    with open(filename, "r") as f:
+        for line in f:
+            fields = line.split()
+            if not fields:
+                continue
+            u = intern(int(fields[0]))
+            for token in fields[1:]:
+                neighbor, length = token.split(",")
+                tails.append(u)
+                heads.append(intern(int(neighbor)))
+                weights.append(int(length))
+    return CSRGraph.from_edges(tails, heads, weights, interner)
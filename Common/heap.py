@@ -0,0 +1,225 @@
+#! usr/bin/env python3
+"""
+Generic binary or d-ary heap, min or max, for the median finders, Dijkstra, Prim and Huffman code.
+
+The heap of Median_finder_own_Heap_class.py grew from repeated insert calls, swapped entries through a method
+call per level and decided the order with (a < b) == self.is_min_heap on every comparison. This Heap:
+- builds from an iterable in O(n) (heapify, bottom-up sift-down),
+- sifts by moving a hole (one store per level instead of a swap), with the comparison (operator.lt for a
+  min-heap, operator.gt for a max-heap) chosen once in the constructor,
+- has pushpop and replace, which push and pop with a single sift,
+- takes a configurable arity: children of i are arity * i + 1 ... arity * i + arity, so a 4-ary heap is half
+  as deep as a binary one and reads the children of a node from one contiguous slice,
+- orders by an optional key function (entries are then (key, insertion count, value), ties pop first in,
+  first out and the values themselves are never compared),
+- can store numeric keys in an array.array (typecode "q" or "d") instead of a list of Python objects.
+
+With arity 2 and no key the list layout is that of heapq: Heap(values=...).heap is a valid heapq heap (for a
+min-heap) and a heapq list can be assigned to .heap. A binary min-heap stored in a list therefore runs the C
+functions of heapq for its operations (unless a subclass overrides bubble_up/bubble_down, e.g. IndexedHeap);
+the other layouts sift in Python.
+"""
+
+import heapq
+import operator
+from array import array
+from itertools import count
+
+
+class Heap:
+    """Min-heap or max-heap of values, see the module docstring."""
+
+    def __init__(self, is_min_heap=True, values=None, arity=2, key=None, typecode=None):
+        """Initializes a heap, empty or built from values in O(n).
+
+        Args:
+            is_min_heap (bool): If True, the heap acts as a min-heap. If False, it acts as a max-heap.
+            values (iterable): Initial values.
+            arity (int): Number of children of every node (2 for a binary heap, 4 for a 4-ary heap).
+            key (callable): Orders the values by key(value) instead of the values themselves.
+            typecode (str): Stores the values in an array.array of this typecode ("q", "d", ...), for numbers.
+        """
+        if arity < 2:
+            raise ValueError("arity must be at least 2")
+        if key is not None and typecode is not None:
+            raise ValueError("an array-backed heap orders its numbers directly, it takes no key function")
+        self.is_min_heap = is_min_heap
+        self.arity = arity
+        self.key = key
+        self.typecode = typecode
+        # higher(a, b) is True if entry a belongs closer to the root than entry b
+        self.higher = operator.lt if is_min_heap else operator.gt
+        self._order = count()
+        self.use_heapq = (is_min_heap and arity == 2 and typecode is None
+                          and type(self).bubble_up is Heap.bubble_up and type(self).bubble_down is Heap.bubble_down)
+        self.heap = array(typecode) if typecode is not None else []
+        if values is not None:
+            self.heapify(values)
+
+    def _entry(self, value):
+        """Returns the stored entry of a value."""
+        if self.key is None:
+            return value
+        return (self.key(value), next(self._order), value)
+
+    def _value(self, entry):
+        """Returns the value of a stored entry."""
+        return entry if self.key is None else entry[2]
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __bool__(self):
+        return len(self.heap) > 0
+
+    def __iter__(self):
+        """Iterates over the values in storage order (not sorted)."""
+        return (self._value(entry) for entry in self.heap)
+
+    def heapify(self, values):
+        """Replaces the contents of the heap with values, in O(n).
+
+        Args:
+            values (iterable): The new values.
+        """
+        entries = [self._entry(value) for value in values] if self.key is not None else values
+        self.heap = array(self.typecode, entries) if self.typecode is not None else list(entries)
+        if self.use_heapq:
+            heapq.heapify(self.heap)
+            return
+        for index in reversed(range((len(self.heap) - 2) // self.arity + 1)):
+            self.bubble_down(index)
+
+    def insert(self, value):
+        """Inserts a value, O(log n)."""
+        if self.use_heapq:
+            heapq.heappush(self.heap, self._entry(value))
+            return
+        self.heap.append(self._entry(value))
+        self.bubble_up(len(self.heap) - 1)
+
+    push = insert
+
+    def remove_root(self):
+        """Removes and returns the root value (min or max depending on the type), or None if the heap is empty."""
+        heap = self.heap
+        if len(heap) == 0:
+            return None
+        if self.use_heapq:
+            return self._value(heapq.heappop(heap))
+        last_entry = heap.pop()
+        if len(heap) == 0:
+            return self._value(last_entry)
+        root = heap[0]
+        heap[0] = last_entry
+        self.bubble_down(0)
+        return self._value(root)
+
+    def pop(self):
+        """Removes and returns the root value.
+
+        Raises:
+            IndexError: If the heap is empty.
+        """
+        if len(self.heap) == 0:
+            raise IndexError("pop from an empty heap")
+        return self.remove_root()
+
+    def root(self):
+        """Returns the root value without removing it, or None if the heap is empty."""
+        if len(self.heap) == 0:
+            return None
+        return self._value(self.heap[0])
+
+    def pushpop(self, value):
+        """Pushes a value then pops the root, with one sift (faster than insert followed by remove_root).
+
+        Returns:
+            The root after the push: value itself if it belongs before the current root.
+        """
+        heap = self.heap
+        entry = self._entry(value)
+        if len(heap) == 0 or not self.higher(heap[0], entry):
+            return value
+        if self.use_heapq:
+            return self._value(heapq.heapreplace(heap, entry))
+        root = heap[0]
+        heap[0] = entry
+        self.bubble_down(0)
+        return self._value(root)
+
+    def replace(self, value):
+        """Pops the root then pushes a value, with one sift. The result can be larger than value (min-heap).
+
+        Raises:
+            IndexError: If the heap is empty.
+        """
+        heap = self.heap
+        if len(heap) == 0:
+            raise IndexError("replace on an empty heap")
+        if self.use_heapq:
+            return self._value(heapq.heapreplace(heap, self._entry(value)))
+        root = heap[0]
+        heap[0] = self._entry(value)
+        self.bubble_down(0)
+        return self._value(root)
+
+    def bubble_up(self, index):
+        """Moves the entry at index towards the root until its parent belongs before it.
+
+        Args:
+            index (int): The index of the entry to bubble up.
+        """
+        heap, higher, arity = self.heap, self.higher, self.arity
+        entry = heap[index]
+        while index > 0:
+            parent_index = (index - 1) // arity
+            parent = heap[parent_index]
+            if not higher(entry, parent):
+                break
+            heap[index] = parent
+            index = parent_index
+        heap[index] = entry
+
+    def bubble_down(self, index):
+        """Moves the entry at index towards the leaves until no child belongs before it.
+
+        Args:
+            index (int): The index of the entry to bubble down.
+        """
+        heap, higher, arity = self.heap, self.higher, self.arity
+        n = len(heap)
+        entry = heap[index]
+        while True:
+            first = arity * index + 1
+            if first >= n:
+                break
+            # Child that belongs closest to the root
+            best = first
+            best_entry = heap[first]
+            if arity == 2:
+                if first + 1 < n and higher(heap[first + 1], best_entry):
+                    best = first + 1
+                    best_entry = heap[best]
+            else:
+                for child in range(first + 1, min(first + arity, n)):
+                    if higher(heap[child], best_entry):
+                        best = child
+                        best_entry = heap[child]
+            if not higher(best_entry, entry):
+                break
+            heap[index] = best_entry
+            index = best
+        heap[index] = entry
+
+    def swap(self, i, j):
+        """Swaps two entries in the heap.
+
+        Args:
+            i, j (int): Indices of the entries to swap.
+        """
+        self.heap[i], self.heap[j] = self.heap[j], self.heap[i]
+
+    def __str__(self):
+        """Returns a string representation of the heap (values in storage order)."""
+        return str(list(self))
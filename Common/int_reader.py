@@ -0,0 +1,103 @@
+#! usr/bin/env python3
+"""
+Bulk reader for the whitespace-separated integer data files of the course projects.
+
+The parsers of the projects read a file with readlines() and call split() and int() on every line, which
+dominates the load time of large inputs. read_int_columns reads the file in large binary chunks and converts
+a whole chunk at once (np.fromstring with NumPy, one bytes.split() and map(int) per chunk without it), then
+returns one compact column per field: NumPy int64 arrays, or array('q') when numpy is not installed.
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHUNK_SIZE = 1 << 24
+
+
+def _chunks(f, chunk_size):
+    """Yields chunks of a binary file that end on a line boundary."""
+    tail = b""
+    while True:
+        block = f.read(chunk_size)
+        if not block:
+            break
+        block = tail + block
+        end = block.rfind(b"\n") + 1
+        if end == 0:
+            tail = block
+            continue
+        tail = block[end:]
+        yield block[:end]
+    if tail.strip():
+        yield tail
+
+
+def _parse_chunk(chunk, use_numpy):
+    """Converts a chunk of whitespace-separated integers."""
+    if use_numpy:
+        # raises ValueError on a token that is not an integer
+        return np.fromstring(chunk, dtype=np.int64, sep=" ")
+    return array("q", map(int, chunk.split()))
+
+
+def read_int_columns(filename, num_columns=None, header_lines=0, use_numpy=None, chunk_size=CHUNK_SIZE):
+    """Reads a file of whitespace-separated integers, a fixed number of integers per line.
+
+    Args:
+        filename (str): Path to the input file.
+        num_columns (int): Number of integers per line. Default: the number of fields of the first data line.
+        header_lines (int): Number of header lines (counts like "number of jobs") before the data.
+        use_numpy (bool): Return NumPy arrays (default: if numpy is installed) or array('q') columns.
+        chunk_size (int): Number of bytes converted at a time.
+
+    Returns:
+        tuple: (header, columns). header is a list with the integers of every header line, columns a list
+               of num_columns columns (NumPy int64 arrays or array('q')), one value per data line.
+
+    Raises:
+        ValueError: If a token is not an integer or the number of integers is not a multiple of num_columns.
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    elif use_numpy and np is None:
+        raise ImportError("numpy is not installed")
+
+    with open(filename, "rb") as f:
+        header = [[int(token) for token in f.readline().split()] for _ in range(header_lines)]
+        first = f.readline()
+        while first and not first.strip():
+            first = f.readline()
+        if num_columns is None:
+            num_columns = max(len(first.split()), 1)
+        parts = [_parse_chunk(first, use_numpy)] if first.strip() else []
+        parts.extend(_parse_chunk(chunk, use_numpy) for chunk in _chunks(f, chunk_size))
+
+    if use_numpy:
+        values = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+    else:
+        values = array("q")
+        for part in parts:
+            values.extend(part)
+    if len(values) % num_columns:
+        raise ValueError(f"{filename}: {len(values)} integers do not form rows of {num_columns}")
+
+    if use_numpy:
+        table = values.reshape(-1, num_columns)
+        columns = [np.ascontiguousarray(table[:, i]) for i in range(num_columns)]
+    else:
+        columns = [values[i::num_columns] for i in range(num_columns)]
+    return header, columns
+
+
+def read_int_column(filename, header_lines=0, use_numpy=None, chunk_size=CHUNK_SIZE):
+    """Reads a file with one integer per line (read_int_columns with a single column).
+
+    Returns:
+        tuple: (header, column).
+    """
+    header, (column,) = read_int_columns(filename, 1, header_lines, use_numpy, chunk_size)
+    return header, column
@@ -0,0 +1,181 @@
+#! usr/bin/env python3
+"""
+Content-addressed on-disk cache for the results of expensive runs on the course input files.
+
+A result is stored under a key built from the name of the computation, the SHA-256 of the input file
+contents and the parameters, so a cached answer is found again whatever the path of the file, and an edited
+file never returns a stale answer. Every entry is a pickle file in the cache directory. The directory is
+bounded in size: when it grows beyond max_bytes, the least recently used entries (oldest modification
+time, refreshed on every hit) are deleted.
+
+The cache is on by default. It is turned off with ResultCache(enabled=False), by setting the environment
+variable ALGORITHMS_CACHE=0, or with the --no-cache flag of the project scripts. ALGORITHMS_CACHE_DIR
+moves the cache directory.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "algorithms_standford")
+DEFAULT_MAX_BYTES = 512 * 2**20
+_SUFFIX = ".pkl"
+
+
+def file_digest(filename, chunk_size=2**20):
+    """Returns the SHA-256 hex digest of the contents of a file."""
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU cache of pickled results in a local directory, with hit/miss statistics."""
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES, enabled=None):
+        """Creates the cache (the directory is created on the first store).
+
+        Args:
+            cache_dir (str): Cache directory (default: $ALGORITHMS_CACHE_DIR or ~/.cache/algorithms_standford).
+            max_bytes (int): Maximum total size of the cached entries.
+            enabled (bool): False turns the cache off (every call computes). Default: on unless
+                            the environment variable ALGORITHMS_CACHE is "0".
+        """
+        if cache_dir is None:
+            cache_dir = os.environ.get("ALGORITHMS_CACHE_DIR", DEFAULT_CACHE_DIR)
+        if enabled is None:
+            enabled = os.environ.get("ALGORITHMS_CACHE", "1") != "0"
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        # (path, size, mtime) -> digest, so a file is hashed once per process
+        self._digests = {}
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _file_digest(self, filename):
+        stat = os.stat(filename)
+        signature = (os.path.abspath(filename), stat.st_size, stat.st_mtime_ns)
+        digest = self._digests.get(signature)
+        if digest is None:
+            digest = self._digests[signature] = file_digest(filename)
+        return digest
+
+    def key(self, name, input_file=None, params=None):
+        """Returns the cache key of a computation.
+
+        Args:
+            name (str): Name of the computation (function name, plus a version if its output changes).
+            input_file (str): Input file whose contents the result depends on, if any.
+            params (dict): Other parameters of the computation; their repr is part of the key.
+        """
+        digest = hashlib.sha256()
+        digest.update(name.encode())
+        if input_file is not None:
+            digest.update(self._file_digest(input_file).encode())
+        digest.update(repr(sorted((params or {}).items())).encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + _SUFFIX)
+
+    def get(self, key, default=None):
+        """Returns the cached value of a key, or default (counted as a hit or a miss)."""
+        if not self.enabled:
+            return default
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return default
+        self.hits += 1
+        # most recently used
+        os.utime(path)
+        return value
+
+    def put(self, key, value):
+        """Stores a value, then evicts the least recently used entries beyond max_bytes."""
+        if not self.enabled:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # write to a temporary file first, so a concurrent reader never sees a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self._path(key))
+        self.stores += 1
+        self._evict(keep=self._path(key))
+
+    def _entries(self):
+        """(mtime, size, path) of every cache entry."""
+        entries = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(_SUFFIX):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self, keep):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.evictions += 1
+
+    def cached(self, name, input_file, params, compute):
+        """Returns the cached result of a computation, or computes and stores it.
+
+        Args:
+            name, input_file, params: The key of the computation (see key()).
+            compute (callable): Function without arguments that computes the result on a miss.
+        """
+        if not self.enabled:
+            return compute()
+        key = self.key(name, input_file, params)
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def size(self):
+        """Total size in bytes of the cached entries."""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        return sum(size for _, size, _ in self._entries())
+
+    def clear(self):
+        """Deletes every cached entry."""
+        if os.path.isdir(self.cache_dir):
+            for _, _, path in self._entries():
+                os.remove(path)
+
+    def stats(self):
+        """Returns the cache statistics as a dict."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "bytes": self.size(),
+        }
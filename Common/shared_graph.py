@@ -0,0 +1,120 @@
+#! usr/bin/env python3
+"""
+Graph store in multiprocessing.shared_memory, for process pools that work on the same graph.
+
+A process pool normally gets the graph by pickling: every worker receives its own copy of the buffers
+(or re-parses the input file). SharedGraphStore writes one parsed graph into a shared memory block, laid
+out exactly like the .csrg binary format (see binary_graph.py), and the workers attach to the block by
+its name: attach_graph(name) returns a read-only CSRGraph whose arrays are memoryviews on the shared pages,
+so the fan-out costs no copy and no parsing whatever the number of workers.
+
+    with SharedGraphStore.from_file("SCC_input_file.txt", "scc") as store:
+        with ProcessPoolExecutor(initializer=attach_graph, initargs=(store.name,)) as pool:
+            ...   # the tasks call attach_graph(name) again, which returns the graph attached by the initializer
+
+The process that creates the store owns the block and unlinks it when the store is closed.
+"""
+
+import io
+from multiprocessing import resource_tracker, shared_memory
+
+from binary_graph import graph_from_buffer, read_text_graph, write_binary_graph
+
+# graphs attached by the current process: name -> (SharedMemory, CSRGraph)
+_attached = {}
+
+
+class SharedGraphStore:
+    """Owner of a CSRGraph copied into a shared memory block."""
+
+    def __init__(self, graph):
+        """Copies a CSRGraph into a new shared memory block.
+
+        Args:
+            graph (CSRGraph): The graph (any of the SCC, Dijkstra or Prim graphs). The shared copy keeps its
+                              dense vertex ids, so results indexed by dense id apply to both.
+        """
+        data = io.BytesIO()
+        write_binary_graph(graph, data, sort_labels=False)
+        data = data.getbuffer()
+        self.shared_memory = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        self.shared_memory.buf[:len(data)] = data
+        self.graph = graph_from_buffer(self.shared_memory.buf.toreadonly())
+
+    @classmethod
+    def from_file(cls, input_file, file_format):
+        """Parses a text input file and copies the graph into shared memory.
+
+        Args:
+            input_file (str): Path to the text file.
+            file_format (str): "scc", "dijkstra" or "prim" (see binary_graph.read_text_graph).
+        """
+        return cls(read_text_graph(input_file, file_format))
+
+    @property
+    def name(self):
+        """Name of the shared memory block, to pass to attach_graph in the workers."""
+        return self.shared_memory.name
+
+    def close(self):
+        """Releases and deletes the shared memory block. The workers must be done with it."""
+        if self.shared_memory is not None:
+            self.graph = None
+            _close(self.shared_memory)
+            self.shared_memory.unlink()
+            self.shared_memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _close(block):
+    """Closes a block; if views on it are still referenced the mapping stays until they are released."""
+    try:
+        block.close()
+    except BufferError:
+        pass
+
+
+def _open_shared_memory(name):
+    """Opens an existing block without making this process responsible for deleting it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # before Python 3.13 every attach registers the block with the resource tracker, which deletes it
+        # when this process exits (or warns about it), so registration is skipped for the attach
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def attach_graph(name):
+    """Attaches to a SharedGraphStore by name and returns its graph as a read-only CSRGraph (no copy).
+
+    The graph is attached once per process; later calls return the same graph. It can be used as the
+    initializer of a process pool.
+
+    Args:
+        name (str): SharedGraphStore.name.
+
+    Returns:
+        CSRGraph: The graph, backed by the shared memory block.
+    """
+    attached = _attached.get(name)
+    if attached is None:
+        block = _open_shared_memory(name)
+        attached = _attached[name] = (block, graph_from_buffer(block.buf.toreadonly()))
+    return attached[1]
+
+
+def detach_graph(name):
+    """Releases the graph attached by this process (the views on the block must not be used anymore)."""
+    attached = _attached.pop(name, None)
+    if attached is not None:
+        _close(attached[0])
@@ -0,0 +1,105 @@
+#! usr/bin/env python3
+"""
+Constant-memory readers for the input formats of the course projects, and a helper to chain them.
+
+Every reader is a generator that reads its file line by line and yields one record at a time, so nothing is
+buffered and the first record is available as soon as the first line has been read:
+
+    iter_values(filename, header_lines=0)   one integer per line (median maintenance, 2-sum, Huffman weights)
+    iter_rows(filename, header_lines=0)     a tuple of integers per line (jobs, knapsack items, edge lists)
+    iter_adjacency(filename)                (vertex, [(neighbor, length), ...]) per line (Dijkstra input)
+    read_header(filename)                   the integers of the first line (number of jobs, knapsack size, ...)
+
+A pipeline is a reader followed by stages. Every stage is a function that takes the iterator produced by the
+previous stage: a transform returns another iterator (usually a generator, so the records keep streaming),
+the last stage may be a consumer that returns a single result. pipeline() just applies the stages in order:
+
+    result = pipeline(iter_values("Median_maint_data_wk3_Graphs.txt"),   # reader
+                      running_medians,                                    # transform: number -> median
+                      lambda medians: sum(medians) % 10000)               # consumer
+
+(running_medians is in Project_week3/Project_wk3_median_finder_in_built_heap.py), which is the same as
+sum(running_medians(iter_values(...))) % 10000 written outside in. Records flow through all stages one at a
+time, so the memory use is that of the stages themselves, not of the input.
+"""
+
+
+def iter_rows(filename, header_lines=0, converter=int):
+    """Yields the fields of every non-empty line as a tuple.
+
+    Args:
+        filename (str): Path to the input file.
+        header_lines (int): Number of lines to skip at the start of the file.
+        converter (callable): Converts every field (int by default, str keeps the tokens).
+
+    Yields:
+        tuple: The converted fields of a line.
+    """
+    with open(filename, "r") as f:
+        for _ in range(header_lines):
+            next(f, None)
+        for line in f:
+            fields = line.split()
+            if fields:
+                yield tuple(map(converter, fields))
+
+
+def iter_values(filename, header_lines=0):
+    """Yields the integer of every non-empty line of a one-column file.
+
+    Args:
+        filename (str): Path to the input file.
+        header_lines (int): Number of lines to skip at the start of the file.
+
+    Yields:
+        int: The number on a line.
+    """
+    with open(filename, "r") as f:
+        for _ in range(header_lines):
+            next(f, None)
+        for line in f:
+            if line.strip():
+                yield int(line)
+
+
+def iter_adjacency(filename):
+    """Yields the lines of a weighted adjacency list file ("vertex neighbor,length ..." per line).
+
+    Args:
+        filename (str): Path to the input file.
+
+    Yields:
+        tuple: (vertex, [(neighbor, length), ...]).
+    """
+    with open(filename, "r") as f:
+        for line in f:
+            fields = line.split()
+            if not fields:
+                continue
+            edges = []
+            for field in fields[1:]:
+                neighbor, length = field.split(",")
+                edges.append((int(neighbor), int(length)))
+            yield int(fields[0]), edges
+
+
+def read_header(filename):
+    """Returns the integers of the first line of a file as a list."""
+    with open(filename, "r") as f:
+        return [int(token) for token in f.readline().split()]
+
+
+def pipeline(source, *stages):
+    """Chains a reader (or any iterable) with transforms and an optional final consumer.
+
+    Args:
+        source (iterable): The records, typically one of the readers of this module.
+        *stages (callable): Functions applied in order, each to the result of the previous one.
+
+    Returns:
+        The result of the last stage (an iterator if the last stage is a transform).
+    """
+    result = source
+    for stage in stages:
+        result = stage(result)
+    return result
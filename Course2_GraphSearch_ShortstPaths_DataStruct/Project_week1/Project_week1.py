@@ -3,10 +3,20 @@
 """Kosaraju algorithm in order to find the size of the largest Strongly connected components (SCCs) of a graph"""
 
 #Import my function to visualize the graph
+import os
 import sys
 from Visualize_a_Graph import visualize_graph
 sys.setrecursionlimit(10000000)
 
+#shared CSR graph core lives in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from csr_graph import CSRGraph, load_edge_list
+from binary_graph import BINARY_EXTENSION, load_binary_graph
+from result_cache import ResultCache
+from scc_pearce import pearce_scc
+from scc_parallel import parallel_scc
+from scc_external import largest_k_scc_sizes
+
 
 def parse_input(input_file):
     """Function to parse the input file into adj_list
@@ -26,6 +36,17 @@ def parse_input(input_file):
     return adj_list
 
 
+def parse_input_csr(input_file, binary=False):
+    """Function to parse the input file into a CSR graph (see Common/csr_graph.py)
+    Input:: txt file wih the vertex label in first column is the tail and the vertex label in second column is the head.
+            With binary=True the .csrg file of the same name is memory-mapped instead (see Common/binary_graph.py).
+
+    Outputs: CSRGraph with the vertex labels interned in the same order as the keys of parse_input
+    """
+    if binary:
+        return load_binary_graph(f"{input_file}{BINARY_EXTENSION}")
+    return load_edge_list(f"{input_file}.txt")
+
 
 def reverse_graph(adj_list):
     """This function reverse the graph in order to be used for Kosaraju algorithm
@@ -76,16 +97,16 @@ def DFS_iterative(graph, node, visited_nodes, scc):
                 if neighbor not in visited_nodes:
                     stack.append(neighbor)
 
-        else:
-            scc.append(node)
-
 
 def kosaraju(adj_list):
     """Finds the strongly connected components (SCCs) of the graph using Kosaraju's algorithm.
 
-    Input: Adjacency list (dict).
+    Input: Adjacency list (dict) or CSRGraph.
     Output: List of SCCs, where each SCC is a list of nodes.
     """
+    if isinstance(adj_list, CSRGraph):
+        return kosaraju_csr(adj_list)
+
     # Step 1: Reverse the graph
     reversed_graph = reverse_graph(adj_list)
 
@@ -110,6 +131,68 @@ def kosaraju(adj_list):
     return sccs
 
 
+def kosaraju_csr(graph):
+    """Kosaraju's algorithm on a CSRGraph, working on dense vertex ids and flat arrays.
+
+    Both DFS passes use an explicit stack of (vertex, next edge slot), so the finishing order is the
+    same as DFFS_recursive on the equivalent dict adjacency list.
+
+    Input: CSRGraph.
+    Output: List of SCCs, where each SCC is a list of the original vertex labels.
+    """
+    n = graph.num_nodes
+    offsets, targets = graph.offsets, graph.targets
+
+    # Step 1: First DFS pass to compute finishing times
+    visited = bytearray(n)
+    finishing_times = []
+    for start in range(n):
+        if visited[start]:
+            continue
+        visited[start] = 1
+        stack = [start]
+        edge_slots = [offsets[start]]
+        while stack:
+            node = stack[-1]
+            slot = edge_slots[-1]
+            end = offsets[node + 1]
+            while slot < end and visited[targets[slot]]:
+                slot += 1
+            if slot < end:
+                neighbor = targets[slot]
+                edge_slots[-1] = slot + 1
+                visited[neighbor] = 1
+                stack.append(neighbor)
+                edge_slots.append(offsets[neighbor])
+            else:
+                stack.pop()
+                edge_slots.pop()
+                finishing_times.append(node)
+
+    # Step 2: Second DFS pass on the reversed graph to identify SCCs
+    reversed_graph = graph.reverse()
+    rev_offsets, rev_targets = reversed_graph.offsets, reversed_graph.targets
+    labels = graph.labels
+    visited = bytearray(n)
+    sccs = []
+    for node in reversed(finishing_times):
+        if visited[node]:
+            continue
+        visited[node] = 1
+        scc = []
+        stack = [node]
+        while stack:
+            curr_node = stack.pop()
+            scc.append(labels[curr_node])
+            for slot in range(rev_offsets[curr_node], rev_offsets[curr_node + 1]):
+                neighbor = rev_targets[slot]
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    stack.append(neighbor)
+        sccs.append(scc)
+
+    return sccs
+
 
 def largest5_sccs(sccs):
     """Calculates the 5 largest SCCs from a list of SCCs.
@@ -125,18 +208,47 @@ def largest5_sccs(sccs):
 
     return largest_sccs_formatted
 
-def main():
-    #Parse the input data
-    data = parse_input('SCC_input_file')
-    #visualize graph
-    #visualize_graph(data)
-    #find the SCCs
-    sccs = kosaraju(data)
+def largest5_sccs_of_file(mode="kosaraju"):
+    """Finds the sizes of the 5 largest SCCs of the input file.
 
+    mode: "kosaraju" (dict adjacency list, two DFS passes) or
+          "pearce" (CSR graph, single recursion-free DFS, see scc_pearce.py) or
+          "parallel" (CSR graph, trimming + forward-backward on a process pool, see scc_parallel.py) or
+          "external" (edges sorted into on-disk runs and memory-mapped, see scc_external.py)
+    """
+    if mode == "external":
+        return largest_k_scc_sizes('SCC_input_file.txt', k=5)
+
+    if mode == "pearce":
+        data = parse_input_csr('SCC_input_file')
+        _, sccs = pearce_scc(data)
+    elif mode == "parallel":
+        data = parse_input_csr('SCC_input_file')
+        _, sccs = parallel_scc(data)
+    else:
+        #Parse the input data
+        data = parse_input('SCC_input_file')
+        #visualize graph
+        #visualize_graph(data)
+        #find the SCCs
+        sccs = kosaraju(data)
+
+    return largest5_sccs(sccs)
+
+
+def main(mode="kosaraju", use_cache=True):
+    """Prints the sizes of the 5 largest SCCs of the input file (see largest5_sccs_of_file for the modes).
+
+    The answer is cached under the contents of the input file and the mode (see Common/result_cache.py), so
+    every engine runs at least once; the version in the cache name is bumped when the computation changes.
+    use_cache=False always recomputes it.
+    """
+    cache = ResultCache(enabled=use_cache)
+    top5 = cache.cached("largest5_sccs:v1", 'SCC_input_file.txt', {"mode": mode}, lambda: largest5_sccs_of_file(mode))
     #Print the largest SCCs
-    top5 = largest5_sccs(sccs)
     print(top5)
 
 if __name__ == "__main__":
 
-    main()
\ No newline at end of file
+    args = [arg for arg in sys.argv[1:] if arg != "--no-cache"]
+    main(args[0] if args else "kosaraju", use_cache="--no-cache" not in sys.argv)
\ No newline at end of file
@@ -0,0 +1,223 @@
+#! usr/bin/env python3
+
+"""Out-of-core (semi-external) SCC sizes for edge files larger than RAM.
+
+parse_input in Project_week1.py reads the whole edge file and builds two dict adjacency lists. Here the
+edges never have to fit in memory at once:
+    1. The edge file is streamed in chunks that fit the memory budget. Every chunk is sorted by tail
+       (forward run) and by head (reverse run) and written to a temporary directory.
+    2. The runs are merged into one forward and one reverse CSR (offsets + targets files).
+    3. Both CSR files are memory-mapped and Kosaraju's two passes run on them, so the operating system
+       pages edges in and out as needed.
+Only O(n) per-vertex state (visited flags, finishing order, DFS stack) stays in memory. Vertex labels
+must be non-negative integers below 2**31, as in SCC_input_file.txt."""
+
+import heapq
+import mmap
+import os
+import shutil
+import tempfile
+from array import array
+
+# bytes per edge while a run is sorted in memory (packed python int + list slot + array copy)
+_BYTES_PER_SORTED_EDGE = 64
+# labels are packed into 32 bits per endpoint and stored as int32 CSR targets
+_LABEL_LIMIT = 2**31
+
+
+def _write_run(packed_edges, directory, name):
+    """Sorts packed (key << 32 | value) edges and writes them to a run file. Returns the file path."""
+    packed_edges.sort()
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        array("q", packed_edges).tofile(f)
+    return path
+
+
+def _read_run(path, block_size):
+    """Yields the packed edges of a run file, reading block_size edges at a time."""
+    with open(path, "rb") as f:
+        while True:
+            block = array("q")
+            try:
+                block.fromfile(f, block_size)
+            except EOFError:
+                # last, partial block: fromfile keeps the items it could read
+                pass
+            if not block:
+                return
+            yield from block
+
+
+def _build_runs(input_file, directory, edges_per_run):
+    """Streams the edge file into sorted forward and reverse runs.
+
+    Output: (forward_runs, reverse_runs, num_nodes, present) where present flags the vertices seen in the file.
+    Raises ValueError on a label outside [0, 2**31), which the packed edges and int32 targets cannot hold.
+    """
+    forward_runs = []
+    reverse_runs = []
+    forward = []
+    backward = []
+    max_label = -1
+    present = bytearray()
+    with open(input_file, "r") as f:
+        for line_number, line in enumerate(f, 1):
+            fields = line.split()
+            if not fields:
+                continue
+            tail, head = int(fields[0]), int(fields[1])
+            if tail < 0 or head < 0 or tail >= _LABEL_LIMIT or head >= _LABEL_LIMIT:
+                raise ValueError(f"{input_file}, line {line_number}: vertex labels must be integers in "
+                                 f"[0, 2**31), got {line.strip()!r}")
+            if tail > max_label or head > max_label:
+                max_label = max(max_label, tail, head)
+                present.extend(bytes(max_label + 1 - len(present)))
+            present[tail] = 1
+            present[head] = 1
+            forward.append(tail << 32 | head)
+            backward.append(head << 32 | tail)
+            if len(forward) >= edges_per_run:
+                forward_runs.append(_write_run(forward, directory, f"forward_{len(forward_runs)}.run"))
+                reverse_runs.append(_write_run(backward, directory, f"reverse_{len(reverse_runs)}.run"))
+                forward = []
+                backward = []
+    if forward:
+        forward_runs.append(_write_run(forward, directory, f"forward_{len(forward_runs)}.run"))
+        reverse_runs.append(_write_run(backward, directory, f"reverse_{len(reverse_runs)}.run"))
+    return forward_runs, reverse_runs, max_label + 1, present
+
+
+def _merge_runs(runs, num_nodes, directory, name, memory_budget):
+    """K-way merges sorted runs into a CSR on disk (name.offsets as int64, name.targets as int32).
+
+    Output: (offsets_path, targets_path).
+    """
+    block_size = max(1, memory_budget // (16 * max(1, len(runs))))
+    offsets = array("q", bytes(8 * (num_nodes + 1)))
+    targets_path = os.path.join(directory, f"{name}.targets")
+    with open(targets_path, "wb") as f:
+        buffer = array("i")
+        for packed in heapq.merge(*(_read_run(path, block_size) for path in runs)):
+            offsets[(packed >> 32) + 1] += 1
+            buffer.append(packed & 0xFFFFFFFF)
+            if len(buffer) >= block_size:
+                buffer.tofile(f)
+                buffer = array("i")
+        buffer.tofile(f)
+    for path in runs:
+        os.remove(path)
+
+    for v in range(num_nodes):
+        offsets[v + 1] += offsets[v]
+    offsets_path = os.path.join(directory, f"{name}.offsets")
+    with open(offsets_path, "wb") as f:
+        offsets.tofile(f)
+    return offsets_path, targets_path
+
+
+def _map(path, typecode, files):
+    """Memory-maps a file read-only and returns a typed memoryview on it (empty array for empty files)."""
+    if os.path.getsize(path) == 0:
+        return array(typecode)
+    f = open(path, "rb")
+    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    files.append((f, mapped))
+    return memoryview(mapped).cast(typecode)
+
+
+def _finishing_order(num_nodes, present, offsets, targets):
+    """First Kosaraju pass: iterative DFS on the forward CSR. Output: array('i') of vertices by finishing time."""
+    visited = bytearray(num_nodes)
+    finishing_times = array("i")
+    stack = array("i")
+    edge_slots = array("q")
+    for start in range(num_nodes):
+        if visited[start] or not present[start]:
+            continue
+        visited[start] = 1
+        stack.append(start)
+        edge_slots.append(offsets[start])
+        while stack:
+            node = stack[-1]
+            slot = edge_slots[-1]
+            end = offsets[node + 1]
+            while slot < end and visited[targets[slot]]:
+                slot += 1
+            if slot < end:
+                neighbor = targets[slot]
+                edge_slots[-1] = slot + 1
+                visited[neighbor] = 1
+                stack.append(neighbor)
+                edge_slots.append(offsets[neighbor])
+            else:
+                stack.pop()
+                edge_slots.pop()
+                finishing_times.append(node)
+    return finishing_times
+
+
+def _component_sizes(num_nodes, finishing_times, offsets, targets):
+    """Second Kosaraju pass on the reverse CSR. Output: array('q') with the size of every SCC."""
+    visited = bytearray(num_nodes)
+    sizes = array("q")
+    stack = array("i")
+    for node in reversed(finishing_times):
+        if visited[node]:
+            continue
+        visited[node] = 1
+        stack.append(node)
+        size = 0
+        while stack:
+            curr_node = stack.pop()
+            size += 1
+            for slot in range(offsets[curr_node], offsets[curr_node + 1]):
+                neighbor = targets[slot]
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    stack.append(neighbor)
+        sizes.append(size)
+    return sizes
+
+
+def external_scc_sizes(input_file, memory_budget=256 * 2**20, work_dir=None):
+    """Computes the sizes of all SCCs of an edge file without loading the edges into memory.
+
+    Input:
+    - input_file: Path of the edge file ("tail head" per line).
+    - memory_budget: Bytes used for sorting runs and merge buffers (the per-vertex arrays come on top).
+    - work_dir: Directory for the temporary run and CSR files (default: the system temp directory).
+    Output: array('q') with the size of every SCC.
+    """
+    directory = tempfile.mkdtemp(prefix="scc_external_", dir=work_dir)
+    files = []
+    try:
+        edges_per_run = max(1, memory_budget // _BYTES_PER_SORTED_EDGE)
+        forward_runs, reverse_runs, num_nodes, present = _build_runs(input_file, directory, edges_per_run)
+        forward_paths = _merge_runs(forward_runs, num_nodes, directory, "forward", memory_budget)
+        reverse_paths = _merge_runs(reverse_runs, num_nodes, directory, "reverse", memory_budget)
+
+        offsets = _map(forward_paths[0], "q", files)
+        targets = _map(forward_paths[1], "i", files)
+        finishing_times = _finishing_order(num_nodes, present, offsets, targets)
+
+        offsets = _map(reverse_paths[0], "q", files)
+        targets = _map(reverse_paths[1], "i", files)
+        sizes = _component_sizes(num_nodes, finishing_times, offsets, targets)
+        # release the views before the maps are closed
+        del offsets, targets
+        return sizes
+    finally:
+        for f, mapped in files:
+            mapped.close()
+            f.close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def largest_k_scc_sizes(input_file, k=5, memory_budget=256 * 2**20, work_dir=None):
+    """Calculates the k largest SCC sizes of an edge file out of core.
+
+    Output: The sizes in descending order, separated by commas, as largest5_sccs formats them.
+    """
+    sizes = external_scc_sizes(input_file, memory_budget, work_dir)
+    return ",".join(str(size) for size in heapq.nlargest(k, sizes))
@@ -0,0 +1,224 @@
+#! usr/bin/env python3
+
+"""Incremental SCC maintenance under streaming edge insertions.
+
+Instead of rerunning kosaraju after every batch of new edges, IncrementalSCC keeps
+    - the components in a union-find structure (every component is represented by one of its vertices),
+    - the condensation DAG (edges between components) with a topological order of its components.
+A new edge u -> v that agrees with the order costs O(1). Otherwise only the components whose position
+lies between the two endpoints are searched and reordered (Pearce-Kelly dynamic topological order), and
+if the edge closes a cycle the components on that cycle are merged into one. The sizes of the
+components are kept in a heap, so the largest SCCs are available without touching the whole graph."""
+
+import heapq
+import os
+import sys
+
+#shared CSR graph core lives in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from csr_graph import CSRGraph, NodeInterner
+from scc_pearce import pearce_scc
+
+
+class IncrementalSCC:
+    """SCCs of a directed graph that only grows (new vertices and edges)."""
+
+    def __init__(self):
+        """Initializes an empty graph."""
+        self.interner = NodeInterner()
+        # union-find parent of every dense vertex id, the root is the component representative
+        self.parent = []
+        # size and topological position, valid for representatives only
+        self.size = []
+        self.order = []
+        self.next_order = 0
+        # condensation DAG between representatives
+        self.out_edges = {}
+        self.in_edges = {}
+        # (-size, representative) entries, stale entries are skipped when queried
+        self.size_heap = []
+
+    @classmethod
+    def from_adj_list(cls, adj_list):
+        """Builds the structure from an adjacency list (dict, as parse_input returns) or a CSRGraph.
+
+        The initial SCCs come from a single pearce_scc run; later edges are added incrementally.
+        """
+        graph = adj_list if isinstance(adj_list, CSRGraph) else CSRGraph.from_adj_list(adj_list)
+        component_of, sccs = pearce_scc(graph)
+        num_components = len(sccs)
+
+        self = cls()
+        self.interner = graph.interner
+        n = graph.num_nodes
+        representative = [-1] * num_components
+        self.parent = [0] * n
+        self.size = [0] * n
+        self.order = [0] * n
+        for v in range(n):
+            component = component_of[v]
+            if representative[component] == -1:
+                representative[component] = v
+                # pearce_scc numbers the components in reverse topological order
+                self.order[v] = num_components - 1 - component
+                self.size[v] = len(sccs[component])
+                self.size_heap.append((-self.size[v], v))
+            self.parent[v] = representative[component]
+        self.next_order = num_components
+        heapq.heapify(self.size_heap)
+
+        offsets, targets = graph.offsets, graph.targets
+        for u in range(n):
+            rep_u = self.parent[u]
+            for slot in range(offsets[u], offsets[u + 1]):
+                rep_v = self.parent[targets[slot]]
+                if rep_u != rep_v:
+                    self.out_edges.setdefault(rep_u, set()).add(rep_v)
+                    self.in_edges.setdefault(rep_v, set()).add(rep_u)
+        return self
+
+    def _vertex(self, label):
+        """Returns the dense id of a vertex label, adding the vertex as a new singleton SCC if needed."""
+        node_id = self.interner.intern(label)
+        if node_id == len(self.parent):
+            self.parent.append(node_id)
+            self.size.append(1)
+            self.order.append(self.next_order)
+            self.next_order += 1
+            heapq.heappush(self.size_heap, (-1, node_id))
+        return node_id
+
+    def find(self, node_id):
+        """Returns the representative of the component of a dense vertex id (with path halving)."""
+        parent = self.parent
+        while parent[node_id] != node_id:
+            parent[node_id] = parent[parent[node_id]]
+            node_id = parent[node_id]
+        return node_id
+
+    def add_edge(self, u, v):
+        """Adds the edge u -> v (vertex labels, new vertices are created).
+
+        Output: True if the edge merged components, False otherwise.
+        """
+        rep_u = self.find(self._vertex(u))
+        rep_v = self.find(self._vertex(v))
+        if rep_u == rep_v:
+            return False
+        out_u = self.out_edges.setdefault(rep_u, set())
+        if rep_v in out_u:
+            return False
+        out_u.add(rep_v)
+        self.in_edges.setdefault(rep_v, set()).add(rep_u)
+
+        order = self.order
+        upper, lower = order[rep_u], order[rep_v]
+        if upper < lower:
+            # the order is still topological
+            return False
+
+        # components reachable from v, positioned up to u
+        forward = {rep_v}
+        stack = [rep_v]
+        closes_cycle = False
+        while stack:
+            x = stack.pop()
+            for y in self.out_edges.get(x, ()):
+                if y == rep_u:
+                    closes_cycle = True
+                if order[y] <= upper and y not in forward:
+                    forward.add(y)
+                    stack.append(y)
+
+        # components reaching u, positioned from v on
+        backward = {rep_u}
+        stack = [rep_u]
+        while stack:
+            x = stack.pop()
+            for y in self.in_edges.get(x, ()):
+                if order[y] >= lower and y not in backward:
+                    backward.add(y)
+                    stack.append(y)
+
+        # the searched components take the same set of positions again: first the ones reaching u,
+        # then the merged component (if any), and the ones reachable from v in the last positions
+        slots = sorted(order[x] for x in forward | backward)
+        if closes_cycle:
+            cycle = forward & backward
+            backward -= cycle
+            forward -= cycle
+        head = sorted(backward, key=order.__getitem__)
+        tail = sorted(forward, key=order.__getitem__)
+        for slot, x in zip(slots, head):
+            order[x] = slot
+        for slot, x in zip(slots[len(slots) - len(tail):], tail):
+            order[x] = slot
+        if closes_cycle:
+            merged = self._merge(cycle)
+            order[merged] = slots[len(head)]
+        return closes_cycle
+
+    def add_edges(self, edges):
+        """Adds a batch of (u, v) edges. Output: the number of edges that merged components."""
+        return sum(self.add_edge(u, v) for u, v in edges)
+
+    def _merge(self, components):
+        """Merges a set of representatives into one component. Output: the new representative."""
+        out_edges, in_edges = self.out_edges, self.in_edges
+        # keep the representative with most condensation edges, so fewer edges move
+        rep = max(components, key=lambda x: len(out_edges.get(x, ())) + len(in_edges.get(x, ())))
+        rep_out = out_edges.setdefault(rep, set())
+        rep_in = in_edges.setdefault(rep, set())
+        for x in components:
+            if x == rep:
+                continue
+            self.parent[x] = rep
+            self.size[rep] += self.size[x]
+            for y in out_edges.pop(x, ()):
+                in_edges[y].discard(x)
+                if y not in components:
+                    in_edges[y].add(rep)
+                    rep_out.add(y)
+            for y in in_edges.pop(x, ()):
+                out_edges[y].discard(x)
+                if y not in components:
+                    out_edges[y].add(rep)
+                    rep_in.add(y)
+        rep_out.difference_update(components)
+        rep_in.difference_update(components)
+        heapq.heappush(self.size_heap, (-self.size[rep], rep))
+        return rep
+
+    def largest_sizes(self, k=5):
+        """Returns the sizes of the k largest SCCs in descending order."""
+        top = []
+        heap = self.size_heap
+        while heap and len(top) < k:
+            negative_size, rep = heapq.heappop(heap)
+            # stale: the component was merged into another or has grown since this entry
+            if self.parent[rep] == rep and self.size[rep] == -negative_size:
+                top.append((negative_size, rep))
+        for entry in top:
+            heapq.heappush(heap, entry)
+        return [-negative_size for negative_size, _ in top]
+
+    def largest_sccs(self, k=5):
+        """Calculates the k largest SCC sizes, formatted like largest5_sccs."""
+        return ",".join(str(size) for size in self.largest_sizes(k))
+
+    def component_of(self, label):
+        """Returns the representative label of the SCC containing a vertex label."""
+        return self.interner.label_of(self.find(self.interner.id_of(label)))
+
+    def topological_order(self):
+        """Returns the representative labels of the components in topological order of the condensation."""
+        reps = [v for v in range(len(self.parent)) if self.parent[v] == v]
+        reps.sort(key=self.order.__getitem__)
+        return [self.interner.label_of(v) for v in reps]
+
+    def sccs(self):
+        """Returns the list of SCCs, where each SCC is a list of nodes (like kosaraju). O(n)."""
+        members = {}
+        for v in range(len(self.parent)):
+            members.setdefault(self.find(v), []).append(self.interner.label_of(v))
+        return list(members.values())
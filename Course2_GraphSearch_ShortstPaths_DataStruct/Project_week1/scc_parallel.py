@@ -0,0 +1,253 @@
+#! usr/bin/env python3
+
+"""Parallel SCC decomposition with trimming and forward-backward (FB) reachability.
+
+Every subproblem is a set of vertices that is closed under SCCs (no SCC is split between two subproblems):
+    1. Trim: repeatedly remove vertices with no in-edges or no out-edges inside the set, each is a trivial SCC.
+    2. Pick a pivot, compute the set F reachable from it and the set B that reaches it (inside the set).
+       F & B is the SCC of the pivot, and F - B, B - F and the rest are three independent subproblems.
+    3. Small subproblems are finished with the serial single pass algorithm of scc_pearce.py.
+The subproblems are handed to a process pool. Every worker receives the CSR buffers once, at start up.
+
+Running this file benchmarks the scaling with the number of workers on synthetic power-law graphs."""
+
+import os
+import random
+import sys
+import time
+from array import array
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+#shared CSR graph core lives in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from csr_graph import CSRGraph, NodeInterner
+from shared_graph import SharedGraphStore, attach_graph
+from scc_pearce import pearce_scc, scc_labels
+
+# graph buffers of the current process, set by _init_worker
+_graph = {}
+
+
+def _init_worker(offsets, targets, rev_offsets, rev_targets):
+    """Stores the forward and reverse CSR buffers in the worker process, once per worker."""
+    _graph["offsets"] = offsets
+    _graph["targets"] = targets
+    _graph["rev_offsets"] = rev_offsets
+    _graph["rev_targets"] = rev_targets
+    # membership marks of the current subproblem, reused between tasks
+    _graph["mark"] = bytearray(len(offsets) - 1)
+
+
+def _init_shared_worker(name, reverse_name):
+    """Attaches the forward and reverse graphs from shared memory instead of receiving pickled copies."""
+    graph, reversed_graph = attach_graph(name), attach_graph(reverse_name)
+    _init_worker(graph.offsets, graph.targets, reversed_graph.offsets, reversed_graph.targets)
+
+
+def _trim(subset, mark, offsets, targets, rev_offsets, rev_targets, sccs):
+    """Removes vertices with no in-edges or no out-edges inside the subset, repeatedly.
+
+    Every removed vertex is appended to sccs as a trivial SCC and unmarked.
+    Output: array('i') with the remaining vertices.
+    """
+    out_degree = {}
+    in_degree = {}
+    queue = deque()
+    for v in subset:
+        out_degree[v] = sum(1 for slot in range(offsets[v], offsets[v + 1]) if mark[targets[slot]])
+        in_degree[v] = sum(1 for slot in range(rev_offsets[v], rev_offsets[v + 1]) if mark[rev_targets[slot]])
+        if out_degree[v] == 0 or in_degree[v] == 0:
+            queue.append(v)
+
+    while queue:
+        v = queue.popleft()
+        if not mark[v]:
+            continue
+        mark[v] = 0
+        sccs.append(array("i", [v]))
+        for slot in range(offsets[v], offsets[v + 1]):
+            w = targets[slot]
+            if mark[w]:
+                in_degree[w] -= 1
+                if in_degree[w] == 0:
+                    queue.append(w)
+        for slot in range(rev_offsets[v], rev_offsets[v + 1]):
+            w = rev_targets[slot]
+            if mark[w]:
+                out_degree[w] -= 1
+                if out_degree[w] == 0:
+                    queue.append(w)
+
+    return array("i", (v for v in subset if mark[v]))
+
+
+def _reach(pivot, mark, offsets, targets):
+    """Returns the set of marked vertices reachable from the pivot along marked vertices."""
+    reached = {pivot}
+    stack = [pivot]
+    while stack:
+        v = stack.pop()
+        for slot in range(offsets[v], offsets[v + 1]):
+            w = targets[slot]
+            if mark[w] and w not in reached:
+                reached.add(w)
+                stack.append(w)
+    return reached
+
+
+def _serial_sccs(subset, offsets, targets, mark):
+    """Finishes a small subproblem with the serial algorithm on its induced subgraph."""
+    local = NodeInterner(subset)
+    tails = array("i")
+    heads = array("i")
+    for i, v in enumerate(subset):
+        for slot in range(offsets[v], offsets[v + 1]):
+            w = targets[slot]
+            if mark[w]:
+                tails.append(i)
+                heads.append(local.id_of(w))
+    induced = CSRGraph.from_edges(tails, heads, interner=local)
+    component_of = scc_labels(induced)
+    sccs = [array("i") for _ in range(max(component_of) + 1)]
+    for i, component in enumerate(component_of):
+        sccs[component].append(subset[i])
+    return sccs
+
+
+def _solve_subproblem(subset, serial_cutoff):
+    """Runs one trim + forward-backward step on a subproblem.
+
+    Input: subset (array('i') of dense vertex ids, closed under SCCs), serial_cutoff (int).
+    Output: (sccs, subproblems), the SCCs found (arrays of vertex ids) and the remaining subproblems.
+    """
+    offsets, targets = _graph["offsets"], _graph["targets"]
+    rev_offsets, rev_targets = _graph["rev_offsets"], _graph["rev_targets"]
+    mark = _graph["mark"]
+    for v in subset:
+        mark[v] = 1
+
+    sccs = []
+    remaining = _trim(subset, mark, offsets, targets, rev_offsets, rev_targets, sccs)
+    subproblems = []
+    if len(remaining) <= serial_cutoff:
+        if remaining:
+            sccs.extend(_serial_sccs(remaining, offsets, targets, mark))
+    else:
+        # pivot with the largest degree product, most likely to sit in a large SCC of a power-law graph
+        pivot = max(remaining, key=lambda v: (offsets[v + 1] - offsets[v]) * (rev_offsets[v + 1] - rev_offsets[v]))
+        forward = _reach(pivot, mark, offsets, targets)
+        backward = _reach(pivot, mark, rev_offsets, rev_targets)
+        pivot_scc = array("i")
+        only_forward = array("i")
+        only_backward = array("i")
+        rest = array("i")
+        for v in remaining:
+            if v in forward:
+                (pivot_scc if v in backward else only_forward).append(v)
+            elif v in backward:
+                only_backward.append(v)
+            else:
+                rest.append(v)
+        sccs.append(pivot_scc)
+        subproblems = [part for part in (only_forward, only_backward, rest) if part]
+
+    for v in remaining:
+        mark[v] = 0
+    return sccs, subproblems
+
+
+def parallel_scc(graph, workers=None, serial_cutoff=10000, shared=True):
+    """Finds the strongly connected components (SCCs) of the graph on a process pool.
+
+    Input:
+    - graph: Adjacency list (dict) or CSRGraph.
+    - workers: Number of worker processes (default os.cpu_count()). With 1 worker everything runs in-process.
+    - serial_cutoff: Subproblems with at most this many vertices are finished with the serial algorithm.
+    - shared: The workers attach to the graph in shared memory (see Common/shared_graph.py) instead of
+      receiving a pickled copy of the buffers each.
+    Output: (component_of, sccs) like pearce_scc. The SCCs are the same as the serial engines find;
+    only the numbering of the components differs.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_adj_list(graph)
+    workers = workers or os.cpu_count() or 1
+    reversed_graph = graph.reverse()
+    buffers = (graph.offsets, graph.targets, reversed_graph.offsets, reversed_graph.targets)
+
+    # the first step (trimming the whole graph and the first pivot) runs in the main process
+    _init_worker(*buffers)
+    found, pending = _solve_subproblem(array("i", range(graph.num_nodes)), serial_cutoff)
+
+    if workers == 1:
+        while pending:
+            sccs, subproblems = _solve_subproblem(pending.pop(), serial_cutoff)
+            found.extend(sccs)
+            pending.extend(subproblems)
+    elif pending:
+        stores = (SharedGraphStore(graph), SharedGraphStore(reversed_graph)) if shared else ()
+        initializer, initargs = ((_init_shared_worker, tuple(store.name for store in stores)) if shared else
+                                 (_init_worker, buffers))
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+                running = {pool.submit(_solve_subproblem, subset, serial_cutoff) for subset in pending}
+                while running:
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        sccs, subproblems = future.result()
+                        found.extend(sccs)
+                        for subset in subproblems:
+                            running.add(pool.submit(_solve_subproblem, subset, serial_cutoff))
+        finally:
+            for store in stores:
+                store.close()
+    _graph.clear()
+
+    component_of = array("i", bytes(4 * graph.num_nodes))
+    labels = graph.labels
+    sccs = []
+    for component, members in enumerate(found):
+        for v in members:
+            component_of[v] = component
+        sccs.append([labels[v] for v in members])
+    return component_of, sccs
+
+
+def power_law_graph(num_nodes, avg_degree=5, exponent=2.1, seed=0):
+    """Generates a random directed graph with power-law distributed in- and out-degrees.
+
+    Input: num_nodes, avg_degree (average out-degree), exponent (of the degree distribution), seed.
+    Output: CSRGraph.
+    """
+    rng = random.Random(seed)
+    alpha = exponent - 1
+    # vertex popularity ~ Pareto, edges pick heads proportionally to it
+    popularity = [rng.paretovariate(alpha) for _ in range(num_nodes)]
+    activity = [rng.paretovariate(alpha) for _ in range(num_nodes)]
+    num_edges = num_nodes * avg_degree
+    tails = array("i", rng.choices(range(num_nodes), weights=activity, k=num_edges))
+    heads = array("i", rng.choices(range(num_nodes), weights=popularity, k=num_edges))
+    return CSRGraph.from_edges(tails, heads, num_nodes=num_nodes)
+
+
+def benchmark(num_nodes=200000, avg_degree=5, worker_counts=(1, 2, 4, 8), serial_cutoff=10000):
+    """Prints the runtime of parallel_scc for each worker count next to the serial single pass engine."""
+    graph = power_law_graph(num_nodes, avg_degree)
+    print(f"power-law graph: {graph.num_nodes} vertices, {graph.num_edges} edges, {os.cpu_count()} cpus")
+
+    start = time.perf_counter()
+    _, serial_sccs = pearce_scc(graph)
+    serial_time = time.perf_counter() - start
+    print(f"serial (pearce): {serial_time:.2f}s, {len(serial_sccs)} SCCs")
+    expected = sorted(sorted(scc) for scc in serial_sccs)
+
+    for workers in worker_counts:
+        start = time.perf_counter()
+        _, sccs = parallel_scc(graph, workers=workers, serial_cutoff=serial_cutoff)
+        elapsed = time.perf_counter() - start
+        same = sorted(sorted(scc) for scc in sccs) == expected
+        print(f"parallel, {workers} workers: {elapsed:.2f}s, speedup {serial_time / elapsed:.2f}, identical: {same}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,118 @@
+#! usr/bin/env python3
+
+"""Single pass SCC algorithm (Pearce's space efficient variant of Tarjan's algorithm), without recursion.
+
+Unlike kosaraju in Project_week1.py it needs only one DFS, no reversed copy of the graph and no
+recursion limit: the DFS runs on an explicit stack and the per-vertex state is kept in flat integer
+arrays (rindex and a root flag), so it works on graphs with millions of vertices."""
+
+import os
+import sys
+from array import array
+
+#shared CSR graph core lives in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from csr_graph import CSRGraph
+
+
+def scc_labels(graph):
+    """Computes the component of every vertex with Pearce's iterative algorithm.
+
+    Input: CSRGraph.
+    Output: array('i') with the component id of every dense vertex id. Components are numbered
+    0, 1, 2, ... in the order they are completed, which is a reverse topological order of the
+    condensation (component 0 has no edges to other components).
+    """
+    n = graph.num_nodes
+    offsets, targets = graph.offsets, graph.targets
+
+    # rindex[v] is 0 while v is unvisited, its DFS index while v is active and
+    # (n - 1 - component id) once its component is completed
+    rindex = array("i", bytes(4 * n))
+    root = bytearray(n)
+    index = 1
+    component = n - 1
+    # vertices whose component is not completed yet (Tarjan's stack)
+    scc_stack = array("i")
+
+    for start in range(n):
+        if rindex[start]:
+            continue
+        rindex[start] = index
+        index += 1
+        root[start] = 1
+        # DFS stack: vertex and the next edge slot to explore
+        dfs_nodes = [start]
+        dfs_slots = [offsets[start]]
+
+        while dfs_nodes:
+            node = dfs_nodes[-1]
+            slot = dfs_slots[-1]
+            end = offsets[node + 1]
+            descended = False
+            while slot < end:
+                neighbor = targets[slot]
+                slot += 1
+                if rindex[neighbor] == 0:
+                    # descend into the neighbor, resume this vertex at the next slot afterwards
+                    dfs_slots[-1] = slot
+                    rindex[neighbor] = index
+                    index += 1
+                    root[neighbor] = 1
+                    dfs_nodes.append(neighbor)
+                    dfs_slots.append(offsets[neighbor])
+                    descended = True
+                    break
+                if rindex[neighbor] < rindex[node]:
+                    rindex[node] = rindex[neighbor]
+                    root[node] = 0
+            if descended:
+                continue
+
+            # all edges of node explored
+            dfs_nodes.pop()
+            dfs_slots.pop()
+            if root[node]:
+                index -= 1
+                node_rindex = rindex[node]
+                while scc_stack and node_rindex <= rindex[scc_stack[-1]]:
+                    member = scc_stack.pop()
+                    rindex[member] = component
+                    index -= 1
+                rindex[node] = component
+                component -= 1
+            else:
+                scc_stack.append(node)
+
+            if dfs_nodes:
+                # propagate the low link to the parent, as after a recursive call returns
+                parent = dfs_nodes[-1]
+                if rindex[node] < rindex[parent]:
+                    rindex[parent] = rindex[node]
+                    root[parent] = 0
+
+    labels = rindex
+    for v in range(n):
+        labels[v] = n - 1 - rindex[v]
+    return labels
+
+
+def pearce_scc(graph):
+    """Finds the strongly connected components (SCCs) of the graph in a single recursion-free DFS.
+
+    Input: Adjacency list (dict) or CSRGraph.
+    Output: (component_of, sccs) where
+        - component_of: array('i') with the component id of every dense vertex id (vertex labels are
+          mapped to dense ids in dict order, see CSRGraph.from_adj_list).
+        - sccs: List of SCCs, where each SCC is a list of nodes, like kosaraju returns.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_adj_list(graph)
+    component_of = scc_labels(graph)
+
+    num_components = max(component_of) + 1 if len(component_of) else 0
+    sccs = [[] for _ in range(num_components)]
+    labels = graph.labels
+    for v, component in enumerate(component_of):
+        sccs[component].append(labels[v])
+    return component_of, sccs
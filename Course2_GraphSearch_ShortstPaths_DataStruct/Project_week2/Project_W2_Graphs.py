@@ -1,25 +1,34 @@
 #! usr/bin/env python3
 
 import heapq
+import os
+import sys
+
+#shared CSR graph core lives in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from csr_graph import CSRGraph, load_adjacency_list
+from binary_graph import BINARY_EXTENSION, load_binary_graph
+from streams import iter_adjacency
+from priority_queues import make_queue
+from delta_stepping import delta_stepping
 
 
 def parse_data(file):
     adj_list_gr = {}
-    with open(file, "r") as f:
-        data = f.readlines()
-
-
-
-    for line in data:
-        line = line.split()
-        if line == []:
-            continue
-        vertex = int(line[0])
-        edges = [(int(neighbor.split(",")[0]), int(neighbor.split(",")[1])) for neighbor in line[1:]]
+    #the lines are streamed, no copy of the whole file is kept
+    for vertex, edges in iter_adjacency(file):
         adj_list_gr[vertex] = edges
     return adj_list_gr
 
 
+def parse_data_csr(file):
+    """Parses the weighted adjacency list file into a CSRGraph (see Common/csr_graph.py).
+    A .csrg file is memory-mapped instead (see Common/binary_graph.py)."""
+    if file.endswith(BINARY_EXTENSION):
+        return load_binary_graph(file)
+    return load_adjacency_list(file)
+
+
 def dijkstra(graph,source_vertex):
 
     """dijkstra algorithm to find shortest path for each vertex
@@ -62,17 +71,34 @@ def dijkstra(graph,source_vertex):
 
 
 
-def dijkstra_minheap(graph, source_vertex):
+def dijkstra_minheap(graph, source_vertex, queue="heapq", goal=None, max_states=None):
     """
         Optimized version of Dijkstra's algorithm using a min-heap (priority queue).
         Inputs:
-        - graph: A dictionary representing the graph as an adjacency list.
+        - graph: A dictionary representing the graph as an adjacency list, a CSRGraph, or an implicit graph:
+          a callable neighbors(state) that yields (neighbor, length) pairs of hashable states.
         - source_vertex: The starting vertex for the algorithm.
+        - queue: The priority queue backend (see priority_queues.py): "heapq" (lazy deletion, default),
+          "indexed" (binary heap with decrease-key), "pairing" (pairing heap), "dial" (bucket queue for
+          small integer lengths), or an already created queue object. Implicit graphs, goal and
+          max_states only work with "heapq" (a ValueError is raised for another queue).
+        - goal: Optional predicate goal(vertex); the search stops as soon as a vertex for which it is true
+          is settled (see dijkstra_implicit).
+        - max_states: Optional limit on the number of reached vertices (see dijkstra_implicit).
 
         Outputs:
         - predecessors: A dictionary showing the vertex immediately before each vertex on the shortest path.
         - distances: A dictionary with the minimum distance from the source to each vertex.
         """
+    if callable(graph) or goal is not None or max_states is not None:
+        if not (isinstance(queue, str) and queue == "heapq"):
+            raise ValueError("implicit graphs, goal and max_states are searched with the heapq queue only")
+        return dijkstra_implicit(_neighbors_function(graph), source_vertex, goal, max_states)
+    if isinstance(graph, CSRGraph):
+        return dijkstra_minheap_csr(graph, source_vertex, queue)
+    if queue != "heapq":
+        return dijkstra_queue(graph, source_vertex, queue)
+
     distances = {vertex : float('inf') for vertex in graph}
     distances[source_vertex] = 0
 
@@ -93,7 +119,7 @@ def dijkstra_minheap(graph, source_vertex):
             distance = curr_distance + length
 
             #if there is a shorted path to the neighbor
-            if distances[curr_vertex] <distances[neighbor]:
+            if distance < distances[neighbor]:
                 distances[neighbor]  = distance
                 predecessors[neighbor] = curr_vertex
                 heapq.heappush(heap, (distance, neighbor))
@@ -101,6 +127,154 @@ def dijkstra_minheap(graph, source_vertex):
     return predecessors, distances
 
 
+def _neighbors_function(graph):
+    """Returns neighbors(vertex) -> iterable of (neighbor, length) for a callable, dict or CSRGraph."""
+    if callable(graph):
+        return graph
+    if isinstance(graph, CSRGraph):
+        labels, id_of = graph.labels, graph.interner.id_of
+        return lambda vertex: ((labels[neighbor], length) for neighbor, length in graph.edges(id_of(vertex)))
+    return graph.__getitem__
+
+
+def dijkstra_implicit(neighbors, source_state, goal=None, max_states=None):
+    """
+        dijkstra_minheap on an implicit graph (grids, puzzle state spaces, ...) that is never built:
+        the edges of a state are generated when the state is settled. Only the reached states are stored,
+        in growable dictionaries, so memory follows the explored part of the state space.
+        Inputs:
+        - neighbors: A callable neighbors(state) that yields (neighbor, length) pairs, lengths >= 0.
+        - source_state: The starting state. States can be any hashable objects.
+        - goal: Optional predicate goal(state). The search stops when the first goal state is settled; its
+          distance and the path to it (reconstruct_path) are then final.
+        - max_states: Optional limit on the number of reached states. A search that exceeds it raises
+          MemoryError instead of exhausting the memory.
+
+        Outputs:
+        - predecessors: A dictionary showing the state immediately before each reached state on the shortest path.
+        - distances: A dictionary with the distance of every reached state (final for the settled states;
+          states that were never reached are not in it).
+        """
+    distances = {source_state: 0}
+    predecessors = {}
+    # the counter breaks distance ties, so the states never have to be compared
+    counter = 0
+    heap = [(0, counter, source_state)]
+
+    while heap:
+        curr_distance, _, curr_state = heapq.heappop(heap)
+        #stale entry, the state was settled with a smaller distance
+        if curr_distance > distances[curr_state]:
+            continue
+        if goal is not None and goal(curr_state):
+            break
+
+        for neighbor, length in neighbors(curr_state):
+            distance = curr_distance + length
+            if distance < distances.get(neighbor, float('inf')):
+                if neighbor not in distances and max_states is not None and len(distances) >= max_states:
+                    raise MemoryError(f"dijkstra_implicit reached more than {max_states} states")
+                distances[neighbor] = distance
+                predecessors[neighbor] = curr_state
+                counter += 1
+                heapq.heappush(heap, (distance, counter, neighbor))
+
+    return predecessors, distances
+
+
+def _create_queue(queue, max_weight):
+    """Returns the queue object for a backend name (max_weight() is only called for "dial")."""
+    if not isinstance(queue, str):
+        return queue
+    return make_queue(queue, max_weight() if queue == "dial" else None)
+
+
+def dijkstra_queue(graph, source_vertex, queue):
+    """
+        dijkstra_minheap with a pluggable priority queue backend. The backends handle decrease-key
+        themselves, so every popped vertex is settled and no visited set is needed.
+        Inputs:
+        - graph: A dictionary representing the graph as an adjacency list.
+        - source_vertex: The starting vertex for the algorithm.
+        - queue: A backend name of priority_queues.make_queue or a queue object.
+
+        Outputs:
+        - predecessors: A dictionary showing the vertex immediately before each vertex on the shortest path.
+        - distances: A dictionary with the minimum distance from the source to each vertex.
+        """
+    queue = _create_queue(queue, lambda: max((length for edges in graph.values() for _, length in edges), default=0))
+    distances = {vertex : float('inf') for vertex in graph}
+    distances[source_vertex] = 0
+    predecessors = {}
+    queue.push(source_vertex, 0)
+
+    while queue:
+        curr_distance, curr_vertex = queue.pop()
+        for neighbor, length in graph[curr_vertex]:
+            distance = curr_distance + length
+            if distance < distances[neighbor]:
+                distances[neighbor] = distance
+                predecessors[neighbor] = curr_vertex
+                queue.push(neighbor, distance)
+
+    return predecessors, distances
+
+
+def dijkstra_minheap_csr(graph, source_vertex, queue="heapq"):
+    """
+        dijkstra_minheap on a CSRGraph. The search runs on dense vertex ids with flat lists for the
+        distances and predecessors; the results are mapped back to the vertex labels at the end.
+        Inputs:
+        - graph: A CSRGraph with edge weights.
+        - source_vertex: The label of the starting vertex.
+        - queue: The priority queue backend, as for dijkstra_minheap.
+
+        Outputs:
+        - predecessors: A dictionary showing the vertex immediately before each vertex on the shortest path.
+        - distances: A dictionary with the minimum distance from the source to each vertex.
+        """
+    n = graph.num_nodes
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    source = graph.interner.id_of(source_vertex)
+
+    dist = [float('inf')] * n
+    dist[source] = 0
+    pred = [-1] * n
+
+    if queue == "heapq":
+        visited = bytearray(n)
+        heap = [(0, source)]
+        while heap:
+            curr_distance, curr_vertex = heapq.heappop(heap)
+            if visited[curr_vertex]:
+                continue
+            visited[curr_vertex] = 1
+
+            for slot in range(offsets[curr_vertex], offsets[curr_vertex + 1]):
+                neighbor = targets[slot]
+                distance = curr_distance + weights[slot]
+                if distance < dist[neighbor]:
+                    dist[neighbor] = distance
+                    pred[neighbor] = curr_vertex
+                    heapq.heappush(heap, (distance, neighbor))
+    else:
+        queue = _create_queue(queue, lambda: max(weights or (), default=0))
+        queue.push(source, 0)
+        while queue:
+            curr_distance, curr_vertex = queue.pop()
+            for slot in range(offsets[curr_vertex], offsets[curr_vertex + 1]):
+                neighbor = targets[slot]
+                distance = curr_distance + weights[slot]
+                if distance < dist[neighbor]:
+                    dist[neighbor] = distance
+                    pred[neighbor] = curr_vertex
+                    queue.push(neighbor, distance)
+
+    labels = graph.labels
+    distances = {labels[v]: dist[v] for v in range(n)}
+    predecessors = {labels[v]: labels[pred[v]] for v in range(n) if pred[v] != -1}
+    return predecessors, distances
+
 
 def reconstruct_path(predecessors, start_vertex, end_vertex):
     """
@@ -125,20 +299,207 @@ def reconstruct_path(predecessors, start_vertex, end_vertex):
     path.reverse()
     return path
 
-def print_path(graph, predecessors):
+def print_path(graph, predecessors, distances, start_vertex=1):
     """
     Prints the shortest paths from the start vertex to all other vertices in the graph.
     Inputs:
     - graph: The graph as an adjacency list.
     - predecessors: The dictionary showing the predecessors of each vertex.
+    - distances: The dictionary with the distance of each vertex.
+    - start_vertex: The source of the shortest paths.
     """
     for vertex in sorted(graph.keys()):
-        path = reconstruct_path(predecessors, 1, vertex)
+        path = reconstruct_path(predecessors, start_vertex, vertex)
         #exlude start vertex from itws own path display
         path_to_display = path[1:] if path else []
         print(f"{vertex} {distances[vertex]} {path_to_display}")
 
 
+def shortest_path_tree_records(predecessors, distances, start_vertex, mode="parent"):
+    """
+    Walks the shortest path tree once, in DFS order from the start vertex, instead of calling
+    reconstruct_path for every vertex (O(n) in total instead of O(n * depth)).
+    Inputs:
+    - predecessors, distances: The output of dijkstra / dijkstra_minheap.
+    - start_vertex: The source of the shortest paths.
+    - mode: "parent" yields (vertex, distance, parent), the parent being None for the start vertex.
+            "path" yields (vertex, distance, path), where path is the list of vertices from the start
+            vertex. The list is shared between records and extended/shortened during the walk, so copy
+            it to keep it.
+
+    Output: generator of records. Vertices that cannot be reached from the start vertex are skipped.
+    """
+    children = {}
+    for vertex, parent in predecessors.items():
+        children.setdefault(parent, []).append(vertex)
+
+    path = []
+    # (vertex, depth) pairs, depth being the length of the path to the parent
+    stack = [(start_vertex, 0)]
+    while stack:
+        vertex, depth = stack.pop()
+        del path[depth:]
+        path.append(vertex)
+        if mode == "parent":
+            yield vertex, distances[vertex], path[-2] if depth else None
+        else:
+            yield vertex, distances[vertex], path
+        for child in reversed(children.get(vertex, ())):
+            stack.append((child, depth + 1))
+
+
+def export_shortest_path_tree(predecessors, distances, start_vertex, output_file, mode="parent"):
+    """
+    Streams the whole shortest path tree to a file, one "vertex distance parent" line per vertex
+    (mode "parent", linear size), or "vertex distance path" lines in the print_path format (mode "path").
+    Output: The number of records written.
+    """
+    count = 0
+    with open(output_file, "w") as f:
+        for vertex, distance, parent_or_path in shortest_path_tree_records(predecessors, distances, start_vertex, mode):
+            if mode == "parent":
+                f.write(f"{vertex} {distance} {'-' if parent_or_path is None else parent_or_path}\n")
+            else:
+                f.write(f"{vertex} {distance} {parent_or_path[1:]}\n")
+            count += 1
+    return count
+
+
+def reverse_adj_list(graph):
+    """
+    Returns the reversed weighted adjacency list (every edge u -> v of length l becomes v -> u).
+    For undirected graphs, such as the course data, the graph is its own reverse.
+    """
+    reversed_graph = {vertex: [] for vertex in graph}
+    for vertex, edges in graph.items():
+        for neighbor, length in edges:
+            reversed_graph.setdefault(neighbor, []).append((vertex, length))
+    return reversed_graph
+
+
+def bidirectional_dijkstra(graph, source_vertex, target_vertex, reverse_graph=None):
+    """
+    Point-to-point shortest path with two Dijkstra searches, forward from the source and backward from
+    the target. It stops as soon as the smallest keys of both heaps add up to at least the best path found.
+    Inputs:
+    - graph: A dictionary representing the graph as an adjacency list.
+    - source_vertex, target_vertex: The end points of the query.
+    - reverse_graph: The reversed adjacency list (reverse_adj_list). Built on every call if not given;
+      pass graph itself for undirected graphs.
+
+    Outputs:
+    - (distance, path, settled): the distance (inf if unreachable), the path as a list of vertices
+      ([] if unreachable) and the number of vertices settled by both searches.
+    """
+    if source_vertex == target_vertex:
+        return 0, [source_vertex], 0
+    if reverse_graph is None:
+        reverse_graph = reverse_adj_list(graph)
+
+    # index 0: forward search, index 1: backward search
+    graphs = (graph, reverse_graph)
+    distances = ({source_vertex: 0}, {target_vertex: 0})
+    predecessors = ({}, {})
+    heaps = ([(0, source_vertex)], [(0, target_vertex)])
+    settled = (set(), set())
+    best, meeting_vertex = float('inf'), None
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        # expand the direction with the smaller heap
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        curr_distance, curr_vertex = heapq.heappop(heaps[side])
+        if curr_vertex in settled[side]:
+            continue
+        settled[side].add(curr_vertex)
+
+        dist, other_dist = distances[side], distances[1 - side]
+        for neighbor, length in graphs[side][curr_vertex]:
+            distance = curr_distance + length
+            if distance < dist.get(neighbor, float('inf')):
+                dist[neighbor] = distance
+                predecessors[side][neighbor] = curr_vertex
+                heapq.heappush(heaps[side], (distance, neighbor))
+            # a path through this edge that the other search already reached
+            if neighbor in other_dist and distance + other_dist[neighbor] < best:
+                best = distance + other_dist[neighbor]
+                meeting_vertex = neighbor
+
+    num_settled = len(settled[0]) + len(settled[1])
+    if meeting_vertex is None:
+        return float('inf'), [], num_settled
+    path = reconstruct_path(predecessors[0], source_vertex, meeting_vertex)
+    vertex = meeting_vertex
+    while vertex != target_vertex:
+        vertex = predecessors[1][vertex]
+        path.append(vertex)
+    return best, path, num_settled
+
+
+def astar(graph, source_vertex, target_vertex, heuristic=None):
+    """
+    Point-to-point shortest path with A*: vertices are settled in order of distance + heuristic and the
+    search stops when the target is settled. Without a heuristic this is Dijkstra with early exit.
+    Inputs:
+    - graph: A dictionary representing the graph as an adjacency list.
+    - source_vertex, target_vertex: The end points of the query.
+    - heuristic: A function heuristic(vertex) that never overestimates the distance from vertex to the
+      target (admissible). Vertices are reopened if a shorter path to them is found later, so the result
+      is exact even if the heuristic is not consistent.
+
+    Outputs:
+    - (distance, path, settled): as bidirectional_dijkstra.
+    """
+    if heuristic is None:
+        heuristic = lambda vertex: 0
+    distances = {source_vertex: 0}
+    predecessors = {}
+    heap = [(heuristic(source_vertex), 0, source_vertex)]
+    closed = set()
+    num_settled = 0
+
+    while heap:
+        _, curr_distance, curr_vertex = heapq.heappop(heap)
+        if curr_vertex in closed or curr_distance > distances[curr_vertex]:
+            continue
+        closed.add(curr_vertex)
+        num_settled += 1
+        if curr_vertex == target_vertex:
+            return curr_distance, reconstruct_path(predecessors, source_vertex, target_vertex), num_settled
+
+        for neighbor, length in graph[curr_vertex]:
+            distance = curr_distance + length
+            if distance < distances.get(neighbor, float('inf')):
+                distances[neighbor] = distance
+                predecessors[neighbor] = curr_vertex
+                closed.discard(neighbor)
+                heapq.heappush(heap, (distance + heuristic(neighbor), distance, neighbor))
+
+    return float('inf'), [], num_settled
+
+
+def shortest_path(graph, source_vertex, target_vertex, method="bidirectional", heuristic=None, reverse_graph=None):
+    """
+    Distance and path between two vertices, without settling the whole graph like dijkstra_minheap.
+    Inputs:
+    - graph: A dictionary representing the graph as an adjacency list.
+    - source_vertex, target_vertex: The end points of the query.
+    - method: "bidirectional" (bidirectional Dijkstra) or "astar" (A* with the given heuristic).
+    - heuristic: Admissible lower bound heuristic(vertex) on the distance to the target, for "astar".
+    - reverse_graph: Reversed adjacency list for "bidirectional" (see bidirectional_dijkstra).
+
+    Outputs:
+    - (distance, path, settled): the distance, the path as in reconstruct_path and the number of
+      settled vertices, to compare with the len(graph) vertices a full dijkstra_minheap run settles.
+    """
+    if method == "bidirectional":
+        return bidirectional_dijkstra(graph, source_vertex, target_vertex, reverse_graph)
+    if method == "astar":
+        return astar(graph, source_vertex, target_vertex, heuristic)
+    raise ValueError(f"unknown shortest path method: {method}")
+
+
 if __name__ == "__main__":
 
     #Parse input to create the adj list
@@ -146,10 +507,20 @@ if __name__ == "__main__":
 
     predecessors,distances = dijkstra(graph, 1)
 
-    print_path(graph, predecessors)
+    print_path(graph, predecessors, distances)
 
     #using min heap
     predecessors1,distances1 = dijkstra_minheap(graph, 1)
 
-    print_path(graph, predecessors1)
+    print_path(graph, predecessors1, distances1)
+
+    #delta-stepping, relaxes a whole bucket of vertices at a time
+    predecessors2,distances2 = delta_stepping(graph, 1)
+
+    print_path(graph, predecessors2, distances2)
+
+    #implicit graph: an unbounded grid, the neighbors are generated on the fly
+    grid_neighbors = lambda cell: [((cell[0] + dx, cell[1] + dy), 1) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))]
+    predecessors3,distances3 = dijkstra_minheap(grid_neighbors, (0, 0), goal=lambda cell: cell == (3, 4))
 
+    print((3, 4), distances3[(3, 4)], reconstruct_path(predecessors3, (0, 0), (3, 4)))
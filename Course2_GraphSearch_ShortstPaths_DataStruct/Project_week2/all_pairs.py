@@ -0,0 +1,193 @@
+#! usr/bin/env python3
+
+"""All-pairs shortest paths with negative edge lengths.
+
+Johnson's algorithm: one Bellman-Ford run (queue based, SPFA) from a virtual source joined to every vertex
+gives potentials h with l(u, v) + h(u) - h(v) >= 0 for every edge, unless there is a negative cycle.
+The reweighted graph has non-negative lengths, so dijkstra_minheap runs from every source on the process
+pool of batch_dijkstra, and d(u, v) = d'(u, v) - h(u) + h(v) undoes the reweighting.
+
+On dense graphs the n Dijkstra runs cost about n * m log n, more than the n^3 of Floyd-Warshall, whose
+inner loop is a single NumPy operation per vertex; all_pairs_shortest_paths picks the algorithm from the
+edge density."""
+
+import os
+import sys
+from array import array
+from collections import deque
+
+#shared CSR graph core lives in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from csr_graph import CSRGraph, load_edge_list, np
+
+from batch_dijkstra import multi_source_distances
+
+
+class NegativeCycleError(ValueError):
+    """The graph has a cycle of negative total length, so shortest paths are undefined."""
+
+
+def _weighted(graph):
+    """
+    Returns the graph as a weighted CSRGraph: adjacency lists are converted, and an unweighted CSRGraph
+    (load_edge_list without weighted=True) gets unit lengths, sharing its offsets and targets.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_adj_list(graph)
+    if graph.weights is None:
+        graph = CSRGraph(graph.offsets, graph.targets, array("q", [1]) * graph.num_edges, graph.interner)
+    return graph
+
+
+def bellman_ford_potentials(graph):
+    """
+    Bellman-Ford (SPFA) from a virtual source with a 0-length edge to every vertex.
+    Only the vertices whose distance changed are queued again, so the run stops as soon as nothing changes,
+    usually long before the n - 1 rounds of plain Bellman-Ford.
+    Inputs:
+    - graph: A CSRGraph with edge weights.
+
+    Output:
+    - array('d') of potentials h, indexed by dense id (all 0 when no edge is negative).
+    Raises NegativeCycleError if a negative cycle is reachable (every cycle is, from the virtual source).
+    """
+    n = graph.num_nodes
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    potentials = array("d", bytes(8 * n))
+    if weights is None or all(weight >= 0 for weight in weights):
+        return potentials
+
+    # every vertex starts at distance 0 from the virtual source, so all of them are queued
+    queue = deque(range(n))
+    in_queue = bytearray(b"\x01") * n
+    # number of edges on the current shortest path of each vertex; n or more means a cycle
+    path_edges = array("i", bytes(4 * n))
+    while queue:
+        u = queue.popleft()
+        in_queue[u] = 0
+        distance_u = potentials[u]
+        for slot in range(offsets[u], offsets[u + 1]):
+            v = targets[slot]
+            distance = distance_u + weights[slot]
+            if distance < potentials[v]:
+                potentials[v] = distance
+                path_edges[v] = path_edges[u] + 1
+                if path_edges[v] >= n:
+                    raise NegativeCycleError(f"negative cycle through vertex {graph.labels[v]}")
+                if not in_queue[v]:
+                    in_queue[v] = 1
+                    queue.append(v)
+    return potentials
+
+
+def johnson(graph, workers=None, chunk_size=16):
+    """
+    All-pairs shortest paths with Johnson's algorithm.
+    Inputs:
+    - graph: A CSRGraph, or a weighted adjacency list (parse_data format). Edges of an unweighted
+      CSRGraph have length 1.
+    - workers, chunk_size: Process pool settings of multi_source_distances.
+
+    Outputs:
+    - (matrix, labels) as multi_source_distances returns them: row i holds the distances from labels[i].
+    Raises NegativeCycleError if the graph has a negative cycle.
+    """
+    graph = _weighted(graph)
+    n = graph.num_nodes
+    potentials = bellman_ford_potentials(graph)
+
+    # reweighted lengths l(u, v) + h(u) - h(v) >= 0, stored as a new CSR graph sharing the structure
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    reweighted = array("d", bytes(8 * graph.num_edges))
+    for u in range(n):
+        h_u = potentials[u]
+        for slot in range(offsets[u], offsets[u + 1]):
+            reweighted[slot] = weights[slot] + h_u - potentials[targets[slot]]
+    reweighted_graph = CSRGraph(offsets, targets, reweighted, graph.interner)
+
+    matrix, labels = multi_source_distances(reweighted_graph, graph.labels, workers=workers, chunk_size=chunk_size)
+    if np is not None:
+        h = np.frombuffer(potentials, dtype=np.float64)
+        matrix = matrix - h[:, None] + h[None, :]
+    else:
+        for i in range(n):
+            h_i = potentials[i]
+            row = i * n
+            for j in range(n):
+                matrix[row + j] += potentials[j] - h_i
+    return matrix, labels
+
+
+def floyd_warshall(graph):
+    """
+    All-pairs shortest paths with a NumPy-vectorized Floyd-Warshall, O(n^3) time and O(n^2) memory.
+    Inputs:
+    - graph: A CSRGraph, or a weighted adjacency list (parse_data format). Edges of an unweighted
+      CSRGraph have length 1.
+
+    Outputs:
+    - (matrix, labels): NumPy array of shape (n, n), row i holds the distances from labels[i].
+    Raises NegativeCycleError if the graph has a negative cycle.
+    """
+    if np is None:
+        raise ImportError("numpy is required for floyd_warshall")
+    graph = _weighted(graph)
+    n = graph.num_nodes
+    offsets, targets, weights = graph.as_numpy()
+    tails = np.repeat(np.arange(n), np.diff(offsets))
+
+    matrix = np.full((n, n), np.inf)
+    # parallel edges: keep the shortest one
+    np.minimum.at(matrix, (tails, targets), weights.astype(np.float64))
+    np.fill_diagonal(matrix, np.minimum(matrix.diagonal(), 0))
+    for k in range(n):
+        # paths through k: row k added to column k, all pairs at once
+        np.minimum(matrix, matrix[:, k, None] + matrix[None, k, :], out=matrix)
+        if matrix[k, k] < 0:
+            raise NegativeCycleError(f"negative cycle through vertex {graph.labels[k]}")
+    return matrix, graph.labels
+
+
+def all_pairs_shortest_paths(graph, method="auto", workers=None, density_threshold=0.1):
+    """
+    All-pairs shortest paths, negative edge lengths allowed.
+    Inputs:
+    - graph: A CSRGraph (unweighted edges have length 1), or a weighted adjacency list (parse_data format).
+    - method: "johnson", "floyd_warshall" or "auto": Floyd-Warshall when numpy is installed and the edge
+      density m / (n * (n - 1)) is at least density_threshold, Johnson otherwise.
+    - workers: Number of worker processes for the Dijkstra runs of Johnson's algorithm.
+
+    Outputs:
+    - (matrix, labels): row i of the matrix holds the distances from labels[i] (NumPy (n, n) array, or a
+      flat row-major array('d') from Johnson without numpy); unreachable vertices have distance inf.
+    Raises NegativeCycleError if the graph has a negative cycle.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_adj_list(graph)
+    if method == "auto":
+        n = graph.num_nodes
+        density = graph.num_edges / (n * (n - 1)) if n > 1 else 1.0
+        method = "floyd_warshall" if np is not None and density >= density_threshold else "johnson"
+    if method == "johnson":
+        return johnson(graph, workers)
+    if method == "floyd_warshall":
+        return floyd_warshall(graph)
+    raise ValueError(f"unknown all-pairs method: {method}")
+
+
+if __name__ == "__main__":
+    prims_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Course3_Greedy_MST_DP",
+                              "Project_scheduling_week1", "Prims_data_edges.txt")
+
+    #the Prim edges read as directed edges: negative lengths, but no negative cycle
+    graph = load_edge_list(prims_file, weighted=True, skip_header=True)
+    matrix, labels = all_pairs_shortest_paths(graph)
+    n = len(labels)
+    print("shortest shortest path:", min(matrix[i * n + j] if np is None else matrix[i, j]
+                                         for i in range(n) for j in range(n) if i != j))
+
+    #read as undirected, every negative edge u - v is a negative cycle u -> v -> u
+    try:
+        all_pairs_shortest_paths(load_edge_list(prims_file, weighted=True, undirected=True, skip_header=True))
+    except NegativeCycleError as error:
+        print("undirected:", error)
@@ -0,0 +1,125 @@
+#! usr/bin/env python3
+
+"""Batched multi-source shortest paths on a process pool.
+
+The graph is converted to a CSRGraph and handed to every worker once, at start up. The sources are split
+into chunks that are spread over the pool, and every chunk comes back as packed float64 distance rows.
+The rows are collected into a compact distance matrix (NumPy if installed, otherwise a flat array('d')),
+or streamed to a binary file when the matrix does not fit in memory."""
+
+import heapq
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+#shared CSR graph core lives in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from csr_graph import CSRGraph, np
+from shared_graph import SharedGraphStore, attach_graph
+
+# graph buffers of the current process, set by _init_worker
+_graph = {}
+
+
+def _init_worker(offsets, targets, weights):
+    """Stores the CSR buffers in the worker process, once per worker."""
+    _graph["offsets"] = offsets
+    _graph["targets"] = targets
+    _graph["weights"] = weights
+
+
+def _init_shared_worker(name):
+    """Attaches the graph from shared memory instead of receiving a pickled copy of the buffers."""
+    graph = attach_graph(name)
+    _init_worker(graph.offsets, graph.targets, graph.weights)
+
+
+def _distance_row(source):
+    """dijkstra_minheap from one dense source id. Output: array('d') of distances (inf if unreachable)."""
+    offsets, targets, weights = _graph["offsets"], _graph["targets"], _graph["weights"]
+    dist = array("d", [float('inf')]) * (len(offsets) - 1)
+    dist[source] = 0
+    visited = bytearray(len(offsets) - 1)
+    heap = [(0, source)]
+    while heap:
+        curr_distance, curr_vertex = heapq.heappop(heap)
+        if visited[curr_vertex]:
+            continue
+        visited[curr_vertex] = 1
+        for slot in range(offsets[curr_vertex], offsets[curr_vertex + 1]):
+            neighbor = targets[slot]
+            distance = curr_distance + weights[slot]
+            if distance < dist[neighbor]:
+                dist[neighbor] = distance
+                heapq.heappush(heap, (distance, neighbor))
+    return dist
+
+
+def _distance_rows(sources):
+    """Distance rows of a chunk of dense source ids, packed as float64 bytes."""
+    return b"".join(_distance_row(source).tobytes() for source in sources)
+
+
+def multi_source_distances(graph, sources, workers=None, chunk_size=16, output_file=None, shared=True):
+    """
+    Shortest path distances from many sources at once (dijkstra_minheap for every source).
+    Inputs:
+    - graph: A dictionary representing the graph as an adjacency list, or a CSRGraph.
+    - sources: The source vertices (labels).
+    - workers: Number of worker processes (default os.cpu_count()). With 1 worker everything runs in-process.
+    - chunk_size: Number of sources sent to a worker at a time.
+    - output_file: If given, the rows are streamed to this file as raw float64 (row i belongs to
+      sources[i]) instead of being kept in memory.
+    - shared: The workers attach to the graph in shared memory (see Common/shared_graph.py) instead of
+      receiving a pickled copy of the buffers each.
+
+    Outputs:
+    - (matrix, labels): matrix is a NumPy array of shape (len(sources), n) if numpy is installed, otherwise
+      a flat row-major array('d'); when output_file is given it is the file path instead. Column j holds
+      the distances to labels[j]; unreachable vertices have distance inf.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_adj_list(graph)
+    workers = workers or os.cpu_count() or 1
+    source_ids = [graph.interner.id_of(source) for source in sources]
+    chunks = [source_ids[i:i + chunk_size] for i in range(0, len(source_ids), chunk_size)]
+    buffers = (graph.offsets, graph.targets, graph.weights)
+
+    matrix = array("d")
+    out = open(output_file, "wb") if output_file is not None else None
+    # rows go straight to the file, or are appended to the in-memory matrix
+    write_rows = out.write if out is not None else matrix.frombytes
+    try:
+        if workers == 1:
+            _init_worker(*buffers)
+            for packed in map(_distance_rows, chunks):
+                write_rows(packed)
+            _graph.clear()
+        elif shared:
+            with SharedGraphStore(graph) as store, \
+                    ProcessPoolExecutor(max_workers=workers, initializer=_init_shared_worker,
+                                        initargs=(store.name,)) as pool:
+                for packed in pool.map(_distance_rows, chunks):
+                    write_rows(packed)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=buffers) as pool:
+                # results come back in source order
+                for packed in pool.map(_distance_rows, chunks):
+                    write_rows(packed)
+    finally:
+        if out is not None:
+            out.close()
+
+    if out is not None:
+        return output_file, graph.labels
+    if np is not None:
+        matrix = np.frombuffer(matrix, dtype=np.float64).reshape(len(source_ids), graph.num_nodes)
+    return matrix, graph.labels
+
+
+def load_distance_rows(output_file, num_nodes):
+    """Memory-maps a file written by multi_source_distances(output_file=...) as a (sources, n) matrix. Needs numpy."""
+    if np is None:
+        raise ImportError("numpy is required to memory-map the distance matrix")
+    return np.memmap(output_file, dtype=np.float64, mode="r").reshape(-1, num_nodes)
@@ -0,0 +1,47 @@
+#! usr/bin/env python3
+
+"""Benchmark of the priority queue backends of dijkstra_minheap: runtime and peak number of queue entries,
+on the course data file and on a larger random graph with small integer lengths."""
+
+import random
+import time
+
+from Project_W2_Graphs import dijkstra_minheap, parse_data
+from priority_queues import QUEUE_BACKENDS, make_queue
+
+
+def random_graph(num_nodes, avg_degree, max_length, seed=0):
+    """Random directed graph as a dict adjacency list with integer lengths in 1..max_length."""
+    rng = random.Random(seed)
+    return {vertex: [(rng.randrange(num_nodes), rng.randint(1, max_length)) for _ in range(avg_degree)]
+            for vertex in range(num_nodes)}
+
+
+def benchmark(graph, source_vertex, name, repeats=3):
+    """Prints the best runtime and the peak queue size of every backend on one graph."""
+    max_length = max(length for edges in graph.values() for _, length in edges)
+    num_edges = sum(len(edges) for edges in graph.values())
+    print(f"{name}: {len(graph)} vertices, {num_edges} edges, max length {max_length}")
+    _, expected = dijkstra_minheap(graph, source_vertex)
+
+    for backend in QUEUE_BACKENDS:
+        best = float("inf")
+        for _ in range(repeats):
+            queue = make_queue(backend, max_length)
+            start = time.perf_counter()
+            # "heapq" runs the inlined heapq loop, the queue object is only used to measure its size
+            _, distances = dijkstra_minheap(graph, source_vertex, backend if backend == "heapq" else queue)
+            best = min(best, time.perf_counter() - start)
+        if backend == "heapq":
+            dijkstra_minheap(graph, source_vertex, queue)
+        assert distances == expected
+        print(f"  {backend:8s} {best * 1000:9.1f} ms   peak queue entries {queue.peak_size}")
+
+
+def main():
+    benchmark(parse_data("dijkstraData_Project_W2.txt"), 1, "dijkstraData_Project_W2.txt")
+    benchmark(random_graph(200000, 8, 100), 0, "random graph")
+
+
+if __name__ == "__main__":
+    main()
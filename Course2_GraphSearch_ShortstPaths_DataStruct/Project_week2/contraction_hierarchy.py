@@ -0,0 +1,269 @@
+#! usr/bin/env python3
+
+"""Contraction hierarchy (CH) index for repeated shortest path queries on a static graph.
+
+Preprocessing (build_contraction_hierarchy) contracts the vertices one by one, least important first
+(edge difference heuristic with lazy updates). Contracting v adds a shortcut u -> x of length
+l(u, v) + l(v, x) whenever a bounded local Dijkstra (witness search) finds no path from u to x that is
+as short without v. Every vertex gets its contraction rank, and every edge (original or shortcut) is
+stored either in the upward graph of its tail or in the downward graph of its head.
+
+A query (ContractionHierarchy.shortest_path) is a bidirectional Dijkstra that only goes up in rank, so it
+settles a small fraction of the graph; shortcuts are unpacked into original edges through their middle
+vertex. The index can be saved to disk and loaded again without preprocessing."""
+
+import heapq
+import os
+import pickle
+import sys
+from array import array
+
+#shared CSR graph core lives in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from csr_graph import CSRGraph, NodeInterner
+
+
+def _witness_distances(out_edges, source, skipped, max_distance, targets, settle_limit):
+    """Bounded Dijkstra from source that avoids the skipped vertex. Output: dict of tentative distances."""
+    distances = {source: 0}
+    heap = [(0, source)]
+    remaining = set(targets)
+    settled = 0
+    while heap and remaining and settled < settle_limit:
+        curr_distance, curr_vertex = heapq.heappop(heap)
+        if curr_distance > distances[curr_vertex]:
+            continue
+        if curr_distance > max_distance:
+            break
+        settled += 1
+        remaining.discard(curr_vertex)
+        for neighbor, length in out_edges[curr_vertex].items():
+            if neighbor == skipped:
+                continue
+            distance = curr_distance + length
+            if distance < distances.get(neighbor, float('inf')):
+                distances[neighbor] = distance
+                heapq.heappush(heap, (distance, neighbor))
+    return distances
+
+
+def _up_graph(tails, heads, lengths, middles, num_nodes):
+    """Packs the edges of one search direction as CSR arrays (offsets, targets, lengths, middles)."""
+    # the edge indices are sorted along with the edges, then used to permute lengths and middles
+    graph = CSRGraph.from_edges(tails, heads, array("q", range(len(tails))), num_nodes=num_nodes)
+    order = graph.weights
+    return (graph.offsets, graph.targets,
+            array("q", (lengths[i] for i in order)), array("i", (middles[i] for i in order)))
+
+
+def build_contraction_hierarchy(graph, witness_settle_limit=50):
+    """
+    Preprocesses a graph into a contraction hierarchy.
+    Inputs:
+    - graph: A dictionary representing the graph as an adjacency list (parse_data format), or a CSRGraph.
+    - witness_settle_limit: Maximum number of vertices settled by a witness search. Smaller limits make
+      preprocessing faster but may add unneeded shortcuts (the queries stay exact).
+
+    Output:
+    - ContractionHierarchy: the query engine.
+    """
+    if isinstance(graph, CSRGraph):
+        graph = graph.to_adj_list()
+    interner = NodeInterner(graph.keys())
+    for edges in graph.values():
+        for neighbor, _ in edges:
+            interner.intern(neighbor)
+    n = len(interner)
+
+    # remaining (not contracted) graph, and the store of every edge and shortcut
+    out_edges = [dict() for _ in range(n)]
+    in_edges = [dict() for _ in range(n)]
+    for vertex, edges in graph.items():
+        u = interner.id_of(vertex)
+        for neighbor, length in edges:
+            x = interner.id_of(neighbor)
+            if u != x and length < out_edges[u].get(x, float('inf')):
+                out_edges[u][x] = length
+                in_edges[x][u] = length
+    all_edges = [dict(edges) for edges in out_edges]
+    middle = {}
+
+    def shortcuts(v, add):
+        """Counts (and with add=True inserts) the shortcuts needed to contract v."""
+        count = 0
+        for u, length_in in list(in_edges[v].items()):
+            via = {x: length_in + length_out for x, length_out in out_edges[v].items() if x != u}
+            if not via:
+                continue
+            witness = _witness_distances(out_edges, u, v, max(via.values()), via, witness_settle_limit)
+            for x, length in via.items():
+                if witness.get(x, float('inf')) <= length:
+                    continue
+                count += 1
+                if add and length < all_edges[u].get(x, float('inf')):
+                    all_edges[u][x] = length
+                    middle[(u, x)] = v
+                    out_edges[u][x] = length
+                    in_edges[x][u] = length
+        return count
+
+    deleted_neighbors = [0] * n
+
+    def priority(v):
+        return shortcuts(v, False) - len(in_edges[v]) - len(out_edges[v]) + deleted_neighbors[v]
+
+    heap = [(priority(v), v) for v in range(n)]
+    heapq.heapify(heap)
+    # vertices whose neighborhood changed since their priority was computed
+    dirty = bytearray(n)
+    rank = array("i", bytes(4 * n))
+    next_rank = 0
+    while heap:
+        _, v = heapq.heappop(heap)
+        # lazy update: contract v only if it is still the least important vertex
+        if dirty[v]:
+            dirty[v] = 0
+            current = priority(v)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, v))
+                continue
+        shortcuts(v, True)
+        for u in in_edges[v]:
+            del out_edges[u][v]
+            deleted_neighbors[u] += 1
+            dirty[u] = 1
+        for x in out_edges[v]:
+            del in_edges[x][v]
+            deleted_neighbors[x] += 1
+            dirty[x] = 1
+        in_edges[v] = {}
+        out_edges[v] = {}
+        rank[v] = next_rank
+        next_rank += 1
+
+    # split the edges into the upward (forward search) and downward (backward search) directions
+    up = (array("i"), array("i"), array("q"), array("i"))
+    down = (array("i"), array("i"), array("q"), array("i"))
+    for u in range(n):
+        for x, length in all_edges[u].items():
+            if rank[x] > rank[u]:
+                tails, heads, lengths, middles = up
+                tails.append(u)
+                heads.append(x)
+            else:
+                tails, heads, lengths, middles = down
+                tails.append(x)
+                heads.append(u)
+            lengths.append(length)
+            middles.append(middle.get((u, x), -1))
+    return ContractionHierarchy(interner.labels, rank, _up_graph(*up, n), _up_graph(*down, n))
+
+
+class ContractionHierarchy:
+    """Query engine of a contraction hierarchy."""
+
+    def __init__(self, labels, rank, forward, backward):
+        """
+        labels: Vertex label of every dense id. rank: Contraction rank of every dense id.
+        forward: (offsets, targets, lengths, middles) of the edges u -> x with rank[x] > rank[u], by u.
+        backward: the same for the edges u -> x with rank[u] > rank[x], grouped by x (targets hold u).
+        middles is -1 for original edges and the contracted vertex for shortcuts.
+        """
+        self.labels = labels
+        self.ids = {label: node_id for node_id, label in enumerate(labels)}
+        self.rank = rank
+        self.forward = forward
+        self.backward = backward
+
+    def save(self, filename):
+        """Saves the index to a file."""
+        with open(filename, "wb") as f:
+            pickle.dump((self.labels, self.rank, self.forward, self.backward), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, filename):
+        """Loads an index saved with save()."""
+        with open(filename, "rb") as f:
+            return cls(*pickle.load(f))
+
+    def _middle(self, u, x):
+        """Middle vertex of the edge u -> x (-1 for an original edge)."""
+        if self.rank[x] > self.rank[u]:
+            offsets, targets, _, middles = self.forward
+            tail, head = u, x
+        else:
+            offsets, targets, _, middles = self.backward
+            tail, head = x, u
+        for slot in range(offsets[tail], offsets[tail + 1]):
+            if targets[slot] == head:
+                return middles[slot]
+        raise KeyError((u, x))
+
+    def _unpack(self, u, x, path):
+        """Appends the original vertices of the edge u -> x (without u) to path."""
+        stack = [(u, x)]
+        while stack:
+            a, b = stack.pop()
+            m = self._middle(a, b)
+            if m == -1:
+                path.append(b)
+            else:
+                # first a -> m, then m -> b
+                stack.append((m, b))
+                stack.append((a, m))
+
+    def shortest_path(self, source_vertex, target_vertex):
+        """
+        Distance and path between two vertices with an upward bidirectional search.
+        Output: (distance, path, settled), path as reconstruct_path returns it ([] if unreachable).
+        """
+        source, target = self.ids[source_vertex], self.ids[target_vertex]
+        searches = (self.forward, self.backward)
+        distances = ({source: 0}, {target: 0})
+        predecessors = ({}, {})
+        heaps = ([(0, source)], [(0, target)])
+        best, meeting = float('inf'), None
+        settled = 0
+
+        side = 0
+        while True:
+            # a direction is finished when its heap is empty or cannot improve the best distance
+            active = [s for s in (0, 1) if heaps[s] and heaps[s][0][0] < best]
+            if not active:
+                break
+            side = 1 - side if (1 - side) in active else active[0]
+            curr_distance, curr_vertex = heapq.heappop(heaps[side])
+            if curr_distance > distances[side][curr_vertex]:
+                continue
+            settled += 1
+            other = distances[1 - side].get(curr_vertex)
+            if other is not None and curr_distance + other < best:
+                best, meeting = curr_distance + other, curr_vertex
+
+            offsets, targets, lengths, _ = searches[side]
+            dist = distances[side]
+            for slot in range(offsets[curr_vertex], offsets[curr_vertex + 1]):
+                neighbor = targets[slot]
+                distance = curr_distance + lengths[slot]
+                if distance < dist.get(neighbor, float('inf')):
+                    dist[neighbor] = distance
+                    predecessors[side][neighbor] = curr_vertex
+                    heapq.heappush(heaps[side], (distance, neighbor))
+
+        if meeting is None:
+            return float('inf'), [], settled
+        # up-path source -> meeting, then the down-path meeting -> target
+        chain = [meeting]
+        while chain[-1] != source:
+            chain.append(predecessors[0][chain[-1]])
+        chain.reverse()
+        while chain[-1] != target:
+            chain.append(predecessors[1][chain[-1]])
+        path = [source]
+        for u, x in zip(chain, chain[1:]):
+            self._unpack(u, x, path)
+        return best, [self.labels[v] for v in path], settled
+
+    def distance(self, source_vertex, target_vertex):
+        """Shortest path distance between two vertices (inf if unreachable)."""
+        return self.shortest_path(source_vertex, target_vertex)[0]
@@ -0,0 +1,324 @@
+#! usr/bin/env python3
+
+"""Delta-stepping single-source shortest paths.
+
+The tentative distances are kept in buckets of width delta. Bucket i is processed as a whole: the light
+edges (length <= delta) of all its vertices are relaxed together, again and again while that puts vertices
+back into bucket i, then the heavy edges of every vertex removed from the bucket are relaxed once. Heavy
+edges cannot land in the current bucket, so the vertices of bucket i are final once it is empty.
+
+The relaxations of a phase are independent, so they run as a batch: either vectorized NumPy operations
+over the CSR arrays (backend "numpy"), or split over the worker processes of a pool that holds the graph
+buffers (backend "pool", the batch_dijkstra set up). delta trades the two extremes: a small delta is
+Dijkstra (one vertex per bucket, no wasted work but tiny batches), a large delta is Bellman-Ford (one
+bucket, big batches but vertices relaxed many times)."""
+
+import os
+import random
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+#shared CSR graph core lives in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from csr_graph import CSRGraph, np
+from shared_graph import SharedGraphStore, attach_graph
+
+# graph buffers of the current process, set by _init_worker
+_graph = {}
+
+
+def _init_worker(offsets, targets, weights, delta):
+    """Stores the CSR buffers and delta in the worker process, once per worker."""
+    _graph["offsets"] = offsets
+    _graph["targets"] = targets
+    _graph["weights"] = weights
+    _graph["delta"] = delta
+
+
+def _init_shared_worker(name, delta):
+    """Attaches the graph from shared memory instead of receiving a pickled copy of the buffers."""
+    graph = attach_graph(name)
+    _init_worker(graph.offsets, graph.targets, graph.weights, delta)
+
+
+def _relax(chunk, light):
+    """
+    Relaxes the light (light=True) or heavy edges of a chunk of (vertex, distance) pairs.
+    Output: list of (neighbor, distance, vertex) requests, the best one per neighbor.
+    """
+    offsets, targets, weights, delta = _graph["offsets"], _graph["targets"], _graph["weights"], _graph["delta"]
+    best = {}
+    for u, distance_u in chunk:
+        for slot in range(offsets[u], offsets[u + 1]):
+            weight = weights[slot]
+            if (weight <= delta) != light:
+                continue
+            v = targets[slot]
+            distance = distance_u + weight
+            if v not in best or distance < best[v][0]:
+                best[v] = (distance, u)
+    return [(v, distance, u) for v, (distance, u) in best.items()]
+
+
+def default_delta(graph):
+    """Delta of the order of the maximum edge length divided by the average degree (Meyer and Sanders)."""
+    if not graph.num_edges:
+        return 1
+    average_degree = graph.num_edges / graph.num_nodes
+    return max(max(graph.weights) / average_degree, 1e-9)
+
+
+def _delta_stepping_pool(graph, source, delta, workers, parallel_cutoff, shared):
+    """Delta-stepping with Python buckets; the relaxation batches are spread over a process pool."""
+    n = graph.num_nodes
+    dist = array("d", [float('inf')]) * n
+    dist[source] = 0
+    pred = array("i", [-1]) * n
+    buckets = {0: {source}}
+
+    pool = store = None
+    if workers > 1 and shared:
+        store = SharedGraphStore(graph)
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_shared_worker, initargs=(store.name, delta))
+    elif workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(graph.offsets, graph.targets, graph.weights, delta))
+    _init_worker(graph.offsets, graph.targets, graph.weights, delta)
+
+    def relax(vertices, light):
+        """Relaxes the edges of a set of vertices and moves the improved vertices between buckets."""
+        items = [(u, dist[u]) for u in vertices]
+        if pool is not None and len(items) >= parallel_cutoff:
+            size = -(-len(items) // workers)
+            results = pool.map(_relax, [items[i:i + size] for i in range(0, len(items), size)],
+                               [light] * workers)
+        else:
+            results = [_relax(items, light)]
+        for requests in results:
+            for v, distance, u in requests:
+                if distance < dist[v]:
+                    if dist[v] != float('inf'):
+                        old = buckets.get(int(dist[v] // delta))
+                        if old is not None:
+                            old.discard(v)
+                    dist[v] = distance
+                    pred[v] = u
+                    buckets.setdefault(int(distance // delta), set()).add(v)
+
+    try:
+        while buckets:
+            i = min(buckets)
+            settled = set()
+            while buckets.get(i):
+                frontier = buckets.pop(i)
+                settled |= frontier
+                relax(frontier, True)
+            buckets.pop(i, None)
+            relax(settled, False)
+            # buckets emptied by moved vertices
+            for index in [index for index, bucket in buckets.items() if not bucket]:
+                del buckets[index]
+    finally:
+        _graph.clear()
+        if pool is not None:
+            pool.shutdown()
+        if store is not None:
+            store.close()
+    return dist, pred
+
+
+def _gather(offsets, targets, weights, frontier):
+    """Edges (tails, heads, lengths) of a frontier of vertices, gathered from CSR arrays in one pass."""
+    starts = offsets[frontier]
+    counts = offsets[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return None
+    # slot of every edge: start of its tail plus its rank within the tail
+    first = np.cumsum(counts) - counts
+    slots = np.repeat(starts - first, counts) + np.arange(total)
+    return np.repeat(frontier, counts), targets[slots], weights[slots]
+
+
+def _split_light_heavy(graph, delta):
+    """Two CSR (offsets, targets, weights) NumPy triples with the light and the heavy edges of the graph."""
+    offsets, targets, weights = graph.as_numpy()
+    tails = np.repeat(np.arange(graph.num_nodes), np.diff(offsets))
+    parts = []
+    for mask in (weights <= delta, weights > delta):
+        counts = np.bincount(tails[mask], minlength=graph.num_nodes)
+        part_offsets = np.zeros(graph.num_nodes + 1, dtype=np.int64)
+        np.cumsum(counts, out=part_offsets[1:])
+        # the mask keeps the edges sorted by tail
+        parts.append((part_offsets, targets[mask], weights[mask].astype(np.float64)))
+    return parts
+
+
+def _delta_stepping_numpy(graph, source, delta):
+    """Delta-stepping with every relaxation phase as vectorized NumPy operations."""
+    n = graph.num_nodes
+    light, heavy = _split_light_heavy(graph, delta)
+    dist = np.full(n, np.inf)
+    dist[source] = 0
+    settled = np.zeros(n, dtype=bool)
+    pred = np.full(n, -1, dtype=np.int64)
+    # reached but not settled vertices; their bucket is recomputed from dist
+    pending = np.array([source], dtype=np.int64)
+
+    def relax(part, frontier):
+        """Relaxes the edges of a frontier; returns the vertices whose distance decreased."""
+        edges = _gather(*part, frontier)
+        if edges is None:
+            return np.empty(0, dtype=np.int64)
+        tails, heads, lengths = edges
+        candidates = dist[tails] + lengths
+        improved = candidates < dist[heads]
+        tails, heads, candidates = tails[improved], heads[improved], candidates[improved]
+        np.minimum.at(dist, heads, candidates)
+        # the predecessor is the tail of a winning candidate, recorded only when dist strictly decreases
+        # (as the pool backend does), so zero-length cycles cannot close a cycle of predecessors
+        won = candidates == dist[heads]
+        pred[heads[won]] = tails[won]
+        return np.unique(heads)
+
+    while pending.size:
+        buckets = np.floor(dist[pending] / delta)
+        i = buckets.min()
+        frontier = pending[buckets == i]
+        pending = pending[buckets != i]
+        removed = [frontier]
+        while frontier.size:
+            improved = relax(light, frontier)
+            in_bucket = np.floor(dist[improved] / delta) == i
+            frontier = improved[in_bucket]
+            removed.append(frontier)
+            pending = np.union1d(pending, improved[~in_bucket])
+        removed = np.unique(np.concatenate(removed))
+        settled[removed] = True
+        pending = np.union1d(pending, relax(heavy, removed))
+        pending = pending[~settled[pending]]
+    return dist, pred
+
+
+def delta_stepping(graph, source_vertex, delta=None, workers=1, backend="auto", parallel_cutoff=1024, shared=True):
+    """
+    Shortest paths from one source with delta-stepping, same results as dijkstra_minheap.
+    Inputs:
+    - graph: A dictionary representing the graph as an adjacency list, or a CSRGraph. Lengths must be >= 0.
+    - source_vertex: The starting vertex.
+    - delta: Bucket width (default: maximum length / average degree).
+    - workers: Number of worker processes of the "pool" backend. With 1 worker everything runs in-process.
+    - backend: "numpy" (vectorized batches), "pool" (process pool) or "auto" ("numpy" if numpy is installed
+      and workers is 1, "pool" otherwise).
+    - parallel_cutoff: Smallest batch of vertices that the "pool" backend sends to the workers.
+    - shared: The workers of the "pool" backend attach to the graph in shared memory (see
+      Common/shared_graph.py) instead of receiving a pickled copy of the buffers each.
+
+    Outputs:
+    - predecessors: A dictionary showing the vertex immediately before each vertex on a shortest path.
+    - distances: A dictionary with the minimum distance from the source to each vertex.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_adj_list(graph)
+    if graph.num_edges and min(graph.weights) < 0:
+        raise ValueError("delta-stepping needs non-negative edge lengths")
+    source = graph.interner.id_of(source_vertex)
+    if delta is None:
+        delta = default_delta(graph)
+    if backend == "auto":
+        backend = "numpy" if np is not None and workers == 1 else "pool"
+
+    if backend == "numpy":
+        if np is None:
+            raise ImportError("numpy is required for the numpy backend")
+        if graph.num_edges:
+            dist, pred = _delta_stepping_numpy(graph, source, delta)
+            dist, pred = dist.tolist(), pred.tolist()
+        else:
+            dist, pred = [float('inf')] * graph.num_nodes, [-1] * graph.num_nodes
+            dist[source] = 0
+    elif backend == "pool":
+        dist, pred = _delta_stepping_pool(graph, source, delta, workers, parallel_cutoff, shared)
+    else:
+        raise ValueError(f"unknown delta-stepping backend: {backend}")
+
+    # integer lengths give integer distances, as in dijkstra_minheap
+    weights = graph.weights
+    integral = weights is None or getattr(weights, "typecode", None) == "q" or getattr(weights, "format", None) == "q"
+    labels = graph.labels
+    distances = {labels[v]: int(dist[v]) if integral and dist[v] != float('inf') else dist[v]
+                 for v in range(graph.num_nodes)}
+    predecessors = {labels[v]: labels[pred[v]] for v in range(graph.num_nodes) if pred[v] != -1}
+    return predecessors, distances
+
+
+def random_graph(num_nodes, avg_degree, max_length, seed=0, min_length=1):
+    """Random directed CSRGraph with integer lengths in min_length..max_length."""
+    rng = random.Random(seed)
+    num_edges = num_nodes * avg_degree
+    tails = array("i", (rng.randrange(num_nodes) for _ in range(num_edges)))
+    heads = array("i", (rng.randrange(num_nodes) for _ in range(num_edges)))
+    weights = array("q", (rng.randint(min_length, max_length) for _ in range(num_edges)))
+    return CSRGraph.from_edges(tails, heads, weights, num_nodes=num_nodes)
+
+
+def check_zero_lengths(num_nodes=2000, avg_degree=4, seed=0):
+    """
+    Cross-check against dijkstra_minheap on a graph where most lengths are 0 (zero-length cycles included):
+    same distances, and every predecessor chain is made of tight edges and ends at the source.
+    """
+    from Project_W2_Graphs import dijkstra_minheap
+
+    graph = random_graph(num_nodes, avg_degree, 1, seed, min_length=0)
+    lengths = {}
+    for tail in range(graph.num_nodes):
+        for head, length in graph.edges(tail):
+            lengths[tail, head] = min(length, lengths.get((tail, head), length))
+    _, expected = dijkstra_minheap(graph, 0)
+    backends = ["pool"] + (["numpy"] if np is not None else [])
+    for backend in backends:
+        predecessors, distances = delta_stepping(graph, 0, backend=backend)
+        assert distances == expected
+        for vertex in predecessors:
+            steps = 0
+            while vertex != 0:
+                pred = predecessors[vertex]
+                assert distances[pred] + lengths[pred, vertex] == distances[vertex]
+                vertex = pred
+                steps += 1
+                assert steps < graph.num_nodes, "cycle of predecessors"
+    print(f"zero-length graph: {', '.join(backends)} agree with dijkstra_minheap")
+
+
+def benchmark(num_nodes=200000, avg_degree=8, max_length=1000, deltas=(0.25, 1, 4, 16), worker_counts=(1, 2, 4)):
+    """
+    Runtime of delta-stepping against dijkstra_minheap, sweeping delta (as multiples of the default delta)
+    and the number of workers of the pool backend. Every run is checked against dijkstra_minheap.
+    """
+    from Project_W2_Graphs import dijkstra_minheap
+
+    check_zero_lengths()
+    graph = random_graph(num_nodes, avg_degree, max_length)
+    base_delta = default_delta(graph)
+    print(f"random graph: {graph.num_nodes} vertices, {graph.num_edges} edges, default delta {base_delta:.1f}")
+    start = time.perf_counter()
+    _, expected = dijkstra_minheap(graph, 0)
+    print(f"  dijkstra_minheap               {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+    runs = [("pool", workers) for workers in worker_counts]
+    if np is not None:
+        runs.insert(0, ("numpy", 1))
+    for factor in deltas:
+        delta = base_delta * factor
+        for backend, workers in runs:
+            start = time.perf_counter()
+            _, distances = delta_stepping(graph, 0, delta, workers, backend)
+            elapsed = time.perf_counter() - start
+            assert distances == expected
+            print(f"  delta {delta:8.1f} {backend:5s} x{workers}   {elapsed * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    benchmark()
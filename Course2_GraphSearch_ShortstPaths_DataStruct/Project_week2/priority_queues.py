@@ -0,0 +1,230 @@
+#! usr/bin/env python3
+
+"""Priority queue backends for dijkstra_minheap.
+
+All backends have the same small interface:
+    - push(item, priority): inserts the item, or lowers its priority if it is already queued
+    - pop(): removes and returns (priority, item) with the smallest priority
+    - len(queue) / bool(queue): number of queued items
+    - peak_size: the largest number of entries the queue stored at once
+
+Backends:
+    - "heapq":   heapq with lazy deletion, a decrease-key pushes a duplicate entry (the heap grows to O(m))
+    - "indexed": binary heap with position tracking and true decrease-key (IndexedHeap, course 2 week 3)
+    - "pairing": pairing heap, O(1) insert and decrease-key, O(log n) amortized pop
+    - "dial":    Dial's bucket queue for small non-negative integer weights, O(1) per operation
+"""
+
+import heapq
+import os
+import sys
+from numbers import Integral
+
+#the indexed heap builds on the Heap class of the week 3 project
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Project_week3"))
+from indexed_heap import IndexedHeap
+
+
+class LazyHeapQueue:
+    """heapq with lazy deletion: stale duplicate entries are skipped when popped."""
+
+    def __init__(self):
+        self.heap = []
+        # item -> its current priority, for queued items only
+        self.priorities = {}
+        self.peak_size = 0
+
+    def __len__(self):
+        return len(self.priorities)
+
+    def push(self, item, priority):
+        self.priorities[item] = priority
+        heapq.heappush(self.heap, (priority, item))
+        if len(self.heap) > self.peak_size:
+            self.peak_size = len(self.heap)
+
+    def pop(self):
+        while True:
+            priority, item = heapq.heappop(self.heap)
+            if self.priorities.get(item) == priority:
+                del self.priorities[item]
+                return priority, item
+
+
+class IndexedHeapQueue:
+    """Binary min-heap with true decrease-key, the heap never holds more than one entry per item."""
+
+    def __init__(self):
+        self.heap = IndexedHeap(is_min_heap=True)
+        self.peak_size = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, item, priority):
+        self.heap.push(item, priority)
+        if len(self.heap) > self.peak_size:
+            self.peak_size = len(self.heap)
+
+    def pop(self):
+        if not self.heap:
+            raise IndexError("pop from an empty queue")
+        return self.heap.remove_root()
+
+
+class _PairingNode:
+    __slots__ = ("priority", "item", "child", "sibling", "prev")
+
+    def __init__(self, priority, item):
+        self.priority = priority
+        self.item = item
+        self.child = None
+        self.sibling = None
+        # parent if this node is the first child, otherwise the previous sibling
+        self.prev = None
+
+
+class PairingHeap:
+    """Pairing min-heap: O(1) push and decrease-key, O(log n) amortized pop."""
+
+    def __init__(self):
+        self.root = None
+        self.nodes = {}
+        self.peak_size = 0
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @staticmethod
+    def _meld(a, b):
+        """Links two heap-ordered trees and returns the new root."""
+        if b.priority < a.priority:
+            a, b = b, a
+        b.prev = a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.prev = b
+        a.child = b
+        return a
+
+    def push(self, item, priority):
+        node = self.nodes.get(item)
+        if node is None:
+            node = _PairingNode(priority, item)
+            self.nodes[item] = node
+            self.root = node if self.root is None else self._meld(self.root, node)
+            if len(self.nodes) > self.peak_size:
+                self.peak_size = len(self.nodes)
+            return
+        if priority >= node.priority:
+            return
+        node.priority = priority
+        if node is self.root:
+            return
+        # cut the subtree of node and meld it with the root
+        if node.prev.child is node:
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = node.prev
+        node.sibling = None
+        node.prev = None
+        self.root = self._meld(self.root, node)
+
+    def pop(self):
+        if self.root is None:
+            raise IndexError("pop from an empty queue")
+        root = self.root
+        del self.nodes[root.item]
+        # two-pass pairing of the children: pair left to right, then meld right to left
+        pairs = []
+        child = root.child
+        while child is not None:
+            first = child
+            second = child.sibling
+            child = second.sibling if second is not None else None
+            first.sibling = first.prev = None
+            if second is not None:
+                second.sibling = second.prev = None
+                first = self._meld(first, second)
+            pairs.append(first)
+        new_root = None
+        for tree in reversed(pairs):
+            new_root = tree if new_root is None else self._meld(new_root, tree)
+        self.root = new_root
+        return root.priority, root.item
+
+
+class BucketQueue:
+    """Dial's bucket queue for non-negative integer priorities that grow monotonically.
+
+    Only max_weight + 1 buckets are kept (a circular array): every queued priority lies within
+    max_weight of the last popped one, as in Dijkstra with integer edge lengths up to max_weight.
+    Priorities outside that range (float or negative edge lengths) raise ValueError, since they would
+    make pop spin forever or return wrong distances.
+    """
+
+    def __init__(self, max_weight):
+        if not isinstance(max_weight, Integral) or max_weight < 0:
+            raise ValueError(f"the dial backend needs non-negative integer edge lengths, got max_weight={max_weight!r}")
+        self.num_buckets = max_weight + 1
+        self.buckets = [[] for _ in range(self.num_buckets)]
+        self.priorities = {}
+        self.current = 0
+        self.entries = 0
+        self.peak_size = 0
+
+    def __len__(self):
+        return len(self.priorities)
+
+    def push(self, item, priority):
+        if not isinstance(priority, Integral):
+            raise ValueError(f"the dial backend needs integer priorities, got {priority!r}")
+        if not self.current <= priority < self.current + self.num_buckets:
+            raise ValueError(f"priority {priority} is outside [{self.current}, {self.current + self.num_buckets}): "
+                             "the dial backend needs non-negative integer edge lengths up to max_weight")
+        old = self.priorities.get(item)
+        if old is not None and old <= priority:
+            return
+        # an older entry stays in its bucket and is skipped when reached
+        self.priorities[item] = priority
+        self.buckets[priority % self.num_buckets].append(item)
+        self.entries += 1
+        if self.entries > self.peak_size:
+            self.peak_size = self.entries
+
+    def pop(self):
+        if not self.priorities:
+            raise IndexError("pop from an empty queue")
+        buckets, priorities = self.buckets, self.priorities
+        while True:
+            bucket = buckets[self.current % self.num_buckets]
+            while bucket:
+                item = bucket.pop()
+                self.entries -= 1
+                if priorities.get(item) == self.current:
+                    del priorities[item]
+                    return self.current, item
+            self.current += 1
+
+
+def make_queue(name, max_weight=None):
+    """Creates a priority queue backend by name ("heapq", "indexed", "pairing" or "dial").
+
+    max_weight (int): Largest edge length, required by the "dial" backend (a non-negative integer).
+    """
+    if name == "heapq":
+        return LazyHeapQueue()
+    if name == "indexed":
+        return IndexedHeapQueue()
+    if name == "pairing":
+        return PairingHeap()
+    if name == "dial":
+        if max_weight is None:
+            raise ValueError("the dial backend needs the largest edge length (max_weight)")
+        return BucketQueue(max_weight)
+    raise ValueError(f"unknown priority queue backend: {name}")
+
+
+QUEUE_BACKENDS = ("heapq", "indexed", "pairing", "dial")
@@ -0,0 +1,117 @@
+#! usr/bin/env python3
+
+"""LRU cache of shortest path trees, invalidated when the graph changes.
+
+ShortestPathTreeCache keeps the (predecessors, distances) result of dijkstra_minheap for the most recently
+used sources, so repeated queries from hot sources cost a dict lookup, and reconstruct_path only walks the
+path itself. The graph is a VersionedGraph: every change through its methods bumps its version counter,
+and the cache drops all trees computed for an older version."""
+
+from collections import OrderedDict
+
+from Project_W2_Graphs import dijkstra_minheap, reconstruct_path
+
+
+class VersionedGraph(dict):
+    """Weighted adjacency list (vertex -> list of (neighbor, length)), as parse_data returns, with a version
+    counter. It is a dict, so dijkstra_minheap and the other functions take it as it is."""
+
+    def __init__(self, adj_list=()):
+        super().__init__(adj_list)
+        self.version = 0
+
+    def add_edge(self, u, v, length):
+        """Adds the directed edge u -> v."""
+        self.setdefault(u, []).append((v, length))
+        self.setdefault(v, [])
+        self.version += 1
+
+    def remove_edge(self, u, v):
+        """Removes all directed edges u -> v."""
+        self[u] = [(neighbor, length) for neighbor, length in self[u] if neighbor != v]
+        self.version += 1
+
+    def set_edges(self, u, edges):
+        """Replaces the edge list of u."""
+        self[u] = list(edges)
+        for neighbor, _ in edges:
+            self.setdefault(neighbor, [])
+        self.version += 1
+
+    def bump_version(self):
+        """Marks the graph as changed, after editing the edge lists directly."""
+        self.version += 1
+
+
+class ShortestPathTreeCache:
+    """Bounded LRU cache of the shortest path trees of a VersionedGraph, with hit/miss statistics."""
+
+    def __init__(self, graph, max_trees=128, max_entries=None, shortest_paths=dijkstra_minheap):
+        """
+        graph: A VersionedGraph (any graph with a version attribute).
+        max_trees: Maximum number of cached sources.
+        max_entries: Optional bound on the total number of cached distance and predecessor entries,
+                     to bound memory on large graphs.
+        shortest_paths: Function (graph, source) -> (predecessors, distances).
+        """
+        self.graph = graph
+        self.max_trees = max_trees
+        self.max_entries = max_entries
+        self.shortest_paths = shortest_paths
+        self.trees = OrderedDict()
+        self.version = graph.version
+        self.entries = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _check_version(self):
+        """Drops every cached tree if the graph changed since they were computed."""
+        if self.graph.version != self.version:
+            self.invalidations += len(self.trees)
+            self.trees.clear()
+            self.entries = 0
+            self.version = self.graph.version
+
+    def tree(self, source_vertex):
+        """Returns (predecessors, distances) of the source, from the cache or computed and cached."""
+        self._check_version()
+        tree = self.trees.get(source_vertex)
+        if tree is not None:
+            self.hits += 1
+            self.trees.move_to_end(source_vertex)
+            return tree
+
+        self.misses += 1
+        tree = self.shortest_paths(self.graph, source_vertex)
+        self.trees[source_vertex] = tree
+        self.entries += len(tree[0]) + len(tree[1])
+        # evict the least recently used trees, but always keep the new one
+        while len(self.trees) > 1 and (len(self.trees) > self.max_trees or
+                                       (self.max_entries is not None and self.entries > self.max_entries)):
+            _, (predecessors, distances) = self.trees.popitem(last=False)
+            self.entries -= len(predecessors) + len(distances)
+            self.evictions += 1
+        return tree
+
+    def distance(self, source_vertex, target_vertex):
+        """Shortest path distance between two vertices."""
+        return self.tree(source_vertex)[1][target_vertex]
+
+    def path(self, source_vertex, target_vertex):
+        """Shortest path between two vertices, as reconstruct_path returns it."""
+        return reconstruct_path(self.tree(source_vertex)[0], source_vertex, target_vertex)
+
+    def stats(self):
+        """Returns the cache statistics as a dict."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "cached_trees": len(self.trees),
+            "cached_entries": self.entries,
+        }
@@ -2,97 +2,17 @@
 
 """Median finder algorithm that claculates median each time,  in a stream of numbers. It returns
 sum of  medians % 10000.
-This script utilizes its own heap class (instead of heapq library) to perform modifications."""
+This script utilizes its own heap class (instead of heapq library) to perform modifications: Heap, in
+Common/heap.py, imported here so that it can still be imported from this module."""
 
+import os
+import sys
 
-
-class Heap:
-    def __init__(self, is_min_heap=True):
-        """
-            Initializes a heap as either a min-heap or max-heap.
-            is_min_heap: If True, the heap acts as a min-heap. If False, it acts as a max-heap.
-        """
-        self.heap = []
-        self.is_min_heap = is_min_heap
-
-    def insert(self, value):
-        """
-            Inserts a value into the heap and maintains the heap property by bubbling it up.
-            value: The value to insert into the heap.
-        """
-        self.heap.append(value)
-        self.bubble_up(len(self.heap) - 1)
-
-    def remove_root(self):
-        """
-        Removes and returns the root element of the heap (min or max depending on the type).
-        Returns the root element, or None if the heap is empty.
-        """
-        if len(self.heap) == 0:
-            return None
-        root = self.heap[0]
-        last_value = self.heap.pop()
-        if len(self.heap) > 0:
-            self.heap[0] = last_value
-            self.bubble_down(0)
-        return root
-
-    def root(self):
-        """
-        Returns the root of the heap (min or max depending on the type), without removing it.
-        Returns None if the heap is empty.
-        """
-        if len(self.heap) == 0:
-            return None
-        return self.heap[0]
-
-    def bubble_up(self, index):
-        """
-        Moves a newly inserted element upwards to restore the heap property.
-        index: The index of the element to bubble up.
-        """
-        while index > 0:
-            parent_index = (index - 1) // 2
-            if (self.heap[index] < self.heap[parent_index]) == self.is_min_heap:
-                self.swap(index, parent_index)
-                index = parent_index
-            else:
-                break
-
-    def bubble_down(self, index):
-        """
-        Moves an element downwards to restore the heap property after removal of the root.
-        index: The index of the element to bubble down.
-        """
-        n = len(self.heap)
-        while True:
-            left = 2 * index + 1
-            right = 2 * index + 2
-            smallest = index
-
-            if left < n and (self.heap[left] < self.heap[smallest]) == self.is_min_heap:
-                smallest = left
-            if right < n and (self.heap[right] < self.heap[smallest]) == self.is_min_heap:
-                smallest = right
-
-            if smallest == index:
-                break
-
-            self.swap(index, smallest)
-            index = smallest
-
-    def swap(self, i, j):
-        """
-        Swaps two elements in the heap.
-        i, j: Indices of the elements to swap.
-        """
-        self.heap[i], self.heap[j] = self.heap[j], self.heap[i]
-
-    def __str__(self):
-        """
-        Returns a string representation of the heap.
-        """
-        return str(self.heap)
+#shared streaming readers and the Heap class live in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from heap import Heap
+from streams import iter_values
+from Project_wk3_median_finder_in_built_heap import BLOCK_SIZE, MedianFinder_me1, add_to_heaps
 
 
 class MedianFinder:
@@ -113,6 +33,7 @@ class MedianFinder:
         """
         Adds a new number to the data structure and maintains the balance between the heaps.
         num: The number to add.
+        Returns the median of the numbers added so far.
         """
         if len(self.max_heap.heap) == 0 or num <= self.max_heap.root():
             self.max_heap.insert(num)
@@ -134,10 +55,50 @@ class MedianFinder:
         # Update cumulative sum of medians
         #print(f"Current Median: {median}")
         self.median_sum += median
+        return median
 
     def get_median_modulo(self):
         return self.median_sum % 10000
 
+    def _batch(self, add):
+        """
+        Runs a batch add of MedianFinder_me1 on the heap lists. Both classes store their heaps with the
+        same array layout, so the lower half only has to be negated into a heapq list and back, once per batch.
+        """
+        max_heap = [-value for value in self.max_heap.heap]
+        min_heap = self.min_heap.heap
+        medians = add(max_heap, min_heap)
+        self.max_heap.heap = [-value for value in max_heap]
+        return medians
+
+    def add_many(self, numbers, return_medians=False):
+        """
+        Adds a batch of numbers, same result as add_num on each of them (see add_to_heaps in
+        Project_wk3_median_finder_in_built_heap.py). The heaps are converted once per call, in time
+        proportional to their size, so a long stream should be passed in one call (an iterator is fine).
+        numbers: The numbers to add.
+        return_medians: Return the list of the medians after every number.
+        """
+        def add(max_heap, min_heap):
+            medians = [] if return_medians else None
+            self.median_sum += add_to_heaps(max_heap, min_heap, numbers, medians)
+            return medians
+        return self._batch(add)
+
+    def add_array(self, values, return_medians=False, block_size=BLOCK_SIZE):
+        """
+        Adds the numbers of a NumPy integer array block by block (see MedianFinder_me1.add_array).
+        values: The numbers to add, in stream order.
+        return_medians: Return the medians after every number (a NumPy array for a NumPy input).
+        """
+        def add(max_heap, min_heap):
+            finder = MedianFinder_me1()
+            finder.max_heap, finder.min_heap = max_heap, min_heap
+            medians = finder.add_array(values, return_medians, block_size)
+            self.median_sum += finder.median_sum
+            return medians
+        return self._batch(add)
+
 
 def main():
     # Create an instance of MedianFinder
@@ -146,14 +107,10 @@ def main():
     # Test input values
     test_values = [1, 666, 10, 667, 100, 2, 3]
 
-    with open("Median_maint_data_wk3_Graphs.txt") as f:
-        numbers = f.readlines()
-
-    for line in numbers:
-        if line.rstrip() != "":
-            line = line.rstrip()
-            median_finder.add_num(int(line))
-            #print(f"Max-Heap: {median_finder.max_heap}, Min-Heap: {median_finder.min_heap}")
+    # Stream the numbers from the file instead of reading all the lines first
+    for num in iter_values("Median_maint_data_wk3_Graphs.txt"):
+        median_finder.add_num(num)
+        #print(f"Max-Heap: {median_finder.max_heap}, Min-Heap: {median_finder.min_heap}")
 
 
 
@@ -6,6 +6,60 @@ This script uses in built library heapq, to perform heap modificatiosn"""
 
 
 import heapq
+import os
+import sys
+
+#shared streaming readers live in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from streams import iter_values, pipeline
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# numbers converted from a NumPy array at a time by add_array
+BLOCK_SIZE = 1 << 16
+
+
+def add_to_heaps(max_heap, min_heap, numbers, medians=None):
+    """
+    Adds a batch of numbers to the two halves of a median finder, with fewer interpreter round-trips than
+    add_num: the halves keep their sizes equal or the lower half one larger, so every number is pushed
+    through the half that must not grow (one heappushpop) and lands in the other one (one heappush),
+    without comparisons or rebalancing in Python.
+    Parameters:
+        max_heap (list): heapq list of the negated lower half.
+        min_heap (list): heapq list of the upper half.
+        numbers (iterable): The numbers to add.
+        medians (list): If given, the median after every number is appended to it.
+    Returns:
+        int: The sum of the medians after every number.
+    """
+    heappush, heappushpop = heapq.heappush, heapq.heappushpop
+    odd = len(max_heap) != len(min_heap)
+    median_sum = 0
+    if medians is None:
+        for num in numbers:
+            if odd:
+                heappush(min_heap, -heappushpop(max_heap, -num))
+            else:
+                heappush(max_heap, -heappushpop(min_heap, num))
+            odd = not odd
+            median_sum -= max_heap[0]
+    else:
+        start = len(medians)
+        append = medians.append
+        for num in numbers:
+            if odd:
+                heappush(min_heap, -heappushpop(max_heap, -num))
+            else:
+                heappush(max_heap, -heappushpop(min_heap, num))
+            odd = not odd
+            append(-max_heap[0])
+        median_sum = sum(medians[start:])
+    return median_sum
+
 
 class MedianFinder_me1:
     """
@@ -27,6 +81,8 @@ class MedianFinder_me1:
         Adds a new number to the data structure and maintains the balance between the two heaps.
         Parameters:
             num (int): The number to add to the data structure.
+        Returns:
+            int: The median of the numbers added so far.
         """
         if len(self.max_heap) == 0 or num <= -self.max_heap[0]:
             heapq.heappush(self.max_heap, -num)
@@ -47,6 +103,7 @@ class MedianFinder_me1:
 
         # Update cumulative sum of medians
         self.median_sum += median
+        return median
 
     def get_median_modulo(self):
         """
@@ -55,20 +112,63 @@ class MedianFinder_me1:
             int: The cumulative sum of medians modulo 10000.
         """
         return self.median_sum % 10000
-def main():
-    # Create an instance of MedianFinder
-    median_finder = MedianFinder_me1()
 
-    with open("test_case_week_3_gaphs.txt") as f:
-        numbers = f.readlines()
+    def add_many(self, numbers, return_medians=False):
+        """
+        Adds a batch of numbers, same result as add_num on each of them but about twice as fast
+        (see add_to_heaps).
+        Parameters:
+            numbers (iterable): The numbers to add.
+            return_medians (bool): Return the median after every number.
+        Returns:
+            list: The medians after every number if return_medians, otherwise None.
+        """
+        medians = [] if return_medians else None
+        self.median_sum += add_to_heaps(self.max_heap, self.min_heap, numbers, medians)
+        return medians
+
+    def add_array(self, values, return_medians=False, block_size=BLOCK_SIZE):
+        """
+        Adds the numbers of a NumPy integer array (or any sequence), block by block so that only one
+        block at a time is converted to Python integers.
+        Parameters:
+            values (ndarray): The numbers to add, in stream order.
+            return_medians (bool): Return the median after every number.
+            block_size (int): Number of values converted at a time.
+        Returns:
+            ndarray: The medians after every number (a list without numpy) if return_medians, otherwise None.
+        """
+        medians = [] if return_medians else None
+        for start in range(0, len(values), block_size):
+            block = values[start:start + block_size]
+            if np is not None and isinstance(block, np.ndarray):
+                block = block.tolist()
+            self.median_sum += add_to_heaps(self.max_heap, self.min_heap, block, medians)
+        if return_medians and np is not None and isinstance(values, np.ndarray):
+            return np.array(medians, dtype=values.dtype)
+        return medians
+
+
+def running_medians(numbers, median_finder=None):
+    """
+    Generator of the running medians of a stream of numbers: yields the median after each number,
+    while the numbers are still being read. Works as a transform stage of streams.pipeline.
+    Parameters:
+        numbers (iterable): The stream of numbers, e.g. streams.iter_values(filename).
+        median_finder: The median finder to feed (MedianFinder_me1 by default, or the MedianFinder of
+                       Median_finder_own_Heap_class.py), any object whose add_num returns the median.
+    """
+    if median_finder is None:
+        median_finder = MedianFinder_me1()
+    for num in numbers:
+        yield median_finder.add_num(num)
 
-    for line in numbers:
-        if line.rstrip() != "":
-            line = line.rstrip()
-            median_finder.add_num(int(line))
 
-    # Calculate the sum of medians modulo 10000
-    result = median_finder.get_median_modulo()
+def main():
+    # The numbers are streamed from the file, one running median per line
+    result = pipeline(iter_values("test_case_week_3_gaphs.txt"),
+                      running_medians,
+                      lambda medians: sum(medians) % 10000)
 
     print(result)
 
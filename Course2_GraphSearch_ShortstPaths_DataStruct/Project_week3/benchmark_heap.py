@@ -0,0 +1,103 @@
+#! usr/bin/env python3
+
+"""Benchmark of the Heap class (Common/heap.py) against heapq: O(n) heapify, push then pop of every value
+(heapsort), and pushpop over a stream (top-k selection), for binary and 4-ary layouts, list and array
+storage, and a key function. Every variant must pop the same values as heapq.
+
+    python benchmark_heap.py            # 10^5 and 10^6 values
+    python benchmark_heap.py 10000000   # other sizes
+"""
+
+import heapq
+import os
+import random
+import sys
+import time
+
+#the Heap class lives in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from heap import Heap
+
+VARIANTS = {
+    "Heap binary (heapq C code)": dict(arity=2),
+    "Heap binary max": dict(arity=2, is_min_heap=False),
+    "Heap 4-ary": dict(arity=4),
+    "Heap 4-ary array('d')": dict(arity=4, typecode="d"),
+    "Heap binary key": dict(arity=2, key=abs),
+}
+
+
+def run_heapq(values, top_k):
+    """heapify, pushpop stream and heapsort with heapq; returns the timings and the popped values."""
+    start = time.perf_counter()
+    heap = list(values)
+    heapq.heapify(heap)
+    heapify_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    top = values[:top_k]
+    heapq.heapify(top)
+    for value in values[top_k:]:
+        heapq.heappushpop(top, value)
+    pushpop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    heap = []
+    for value in values:
+        heapq.heappush(heap, value)
+    popped = [heapq.heappop(heap) for _ in range(len(heap))]
+    sort_time = time.perf_counter() - start
+    return (heapify_time, pushpop_time, sort_time), sorted(top), popped
+
+
+def run_heap(values, top_k, options):
+    """The same operations with the Heap class."""
+    start = time.perf_counter()
+    Heap(values=values, **options)
+    heapify_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    top = Heap(values=values[:top_k], **options)
+    pushpop = top.pushpop
+    for value in values[top_k:]:
+        pushpop(value)
+    pushpop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    heap = Heap(**options)
+    push, pop = heap.push, heap.pop
+    for value in values:
+        push(value)
+    popped = [pop() for _ in range(len(heap))]
+    sort_time = time.perf_counter() - start
+    return (heapify_time, pushpop_time, sort_time), sorted(top), popped
+
+
+def benchmark(size, top_k=1000):
+    """Prints the timings of every variant for one size, relative to heapq."""
+    rng = random.Random(0)
+    # Non-negative, so ordering by abs gives the same order as the values
+    values = [rng.random() for _ in range(size)]
+    print(f"{size} values (top {top_k} by pushpop)")
+    print(f"  {'':26s} {'heapify':>10s} {'pushpop':>10s} {'push+pop':>10s}")
+    baseline, expected_top, expected = run_heapq(values, top_k)
+    print(f"  {'heapq':26s} " + " ".join(f"{t:9.3f}s" for t in baseline))
+    for name, options in VARIANTS.items():
+        times, top, popped = run_heap(values, top_k, options)
+        if options.get("is_min_heap", True):
+            assert top == expected_top and popped == expected
+        else:
+            # A max-heap keeps the top_k smallest values and pops in decreasing order
+            assert top == expected[:top_k] and popped == expected[::-1]
+        print(f"  {name:26s} " + " ".join(f"{t:9.3f}s" for t in times)
+              + "   (x" + " x".join(f"{t / b:.1f}" for t, b in zip(times, baseline)) + " heapq)")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10**5, 10**6]
+    for size in sizes:
+        benchmark(size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#! usr/bin/env python3
+
+"""Benchmark of the ways to feed a stream to the median finders: one add_num call per number, add_many on an
+iterable and add_array on an integer array, all with the exact median after every number (median sum checked).
+
+    python benchmark_median_finders.py                       # streams of 10^5 to 10^7 numbers
+    python benchmark_median_finders.py 100000000             # a 10^8 stream (the heaps then hold 10^8 Python ints,
+                                                             # several GB, and add_num is skipped above 10^7)
+"""
+
+import random
+import sys
+import time
+from itertools import chain
+from array import array
+
+from Median_finder_own_Heap_class import MedianFinder
+from Project_wk3_median_finder_in_built_heap import BLOCK_SIZE, MedianFinder_me1, np
+
+ADD_NUM_LIMIT = 10**7
+
+
+def random_stream(size, seed=0):
+    """Random integers in 0..10^9, as a NumPy int64 array or array('q') without numpy."""
+    if np is not None:
+        return np.random.default_rng(seed).integers(0, 10**9, size, dtype=np.int64)
+    rng = random.Random(seed)
+    stream = array("q")
+    for start in range(0, size, BLOCK_SIZE):
+        stream.extend(rng.randrange(10**9) for _ in range(min(BLOCK_SIZE, size - start)))
+    return stream
+
+
+def add_num(finder, stream):
+    for start in range(0, len(stream), BLOCK_SIZE):
+        for num in stream[start:start + BLOCK_SIZE].tolist():
+            finder.add_num(num)
+
+
+def add_many(finder, stream):
+    #a single call on an iterator over the blocks (MedianFinder converts its heaps once per call)
+    finder.add_many(chain.from_iterable(stream[start:start + BLOCK_SIZE].tolist()
+                                        for start in range(0, len(stream), BLOCK_SIZE)))
+
+
+def add_array(finder, stream):
+    finder.add_array(stream)
+
+
+def benchmark(size):
+    """Prints the runtime and throughput of every way to add the numbers, for both median finders."""
+    stream = random_stream(size)
+    print(f"stream of {size} numbers")
+    expected = None
+    for finder_class in (MedianFinder_me1, MedianFinder):
+        for method in (add_num, add_many, add_array):
+            if method is add_num and size > ADD_NUM_LIMIT:
+                continue
+            finder = finder_class()
+            start = time.perf_counter()
+            method(finder, stream)
+            elapsed = time.perf_counter() - start
+            if expected is None:
+                expected = finder.median_sum
+            assert finder.median_sum == expected
+            print(f"  {finder_class.__name__:17s} {method.__name__:9s} {elapsed:8.2f} s "
+                  f"{size / elapsed / 1e6:6.2f} M numbers/s")
+    print(f"  sum of the medians {expected}")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10**5, 10**6, 10**7]
+    for size in sizes:
+        benchmark(size)
+
+
+if __name__ == "__main__":
+    main()
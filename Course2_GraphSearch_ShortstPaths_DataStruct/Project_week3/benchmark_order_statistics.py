@@ -0,0 +1,63 @@
+#! usr/bin/env python3
+
+"""Benchmark of OrderStatisticMedianFinder against the two-heap median finders (add_num on the same random
+stream, median sum checked), and of its quantile, rank and remove operations.
+
+    python benchmark_order_statistics.py               # streams of 10^5 and 10^6 numbers
+    python benchmark_order_statistics.py 10000000      # other sizes
+"""
+
+import random
+import sys
+import time
+
+from Median_finder_own_Heap_class import MedianFinder
+from Project_wk3_median_finder_in_built_heap import MedianFinder_me1
+from order_statistics import OrderStatisticMedianFinder
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def timed(function, *args):
+    """Returns (result, seconds) of one call."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def benchmark(size, num_queries=100000):
+    """Prints the add_num throughput of every median finder and the cost of the order-statistic queries."""
+    rng = random.Random(0)
+    stream = [rng.randrange(10**9) for _ in range(size)]
+    print(f"stream of {size} numbers")
+
+    expected = None
+    for finder_class in (MedianFinder_me1, MedianFinder, OrderStatisticMedianFinder):
+        finder = finder_class()
+        _, elapsed = timed(lambda: [finder.add_num(num) for num in stream])
+        if expected is None:
+            expected = finder.median_sum
+        assert finder.median_sum == expected
+        print(f"  {finder_class.__name__:27s} add_num  {elapsed:7.2f} s {size / elapsed / 1e6:6.2f} M numbers/s")
+
+    queries = [rng.randrange(10**9) for _ in range(num_queries)]
+    for q in QUANTILES:
+        _, elapsed = timed(lambda: [finder.quantile(q) for _ in range(num_queries)])
+        print(f"  quantile({q})  {elapsed / num_queries * 1e6:6.2f} us   p{round(q * 100)} = {finder.quantile(q)}")
+    _, elapsed = timed(lambda: [finder.rank(x) for x in queries])
+    print(f"  rank           {elapsed / num_queries * 1e6:6.2f} us")
+    _, elapsed = timed(lambda: sorted(stream)[len(stream) // 2])
+    print(f"  (sorting the stream for one quantile: {elapsed * 1e3:.1f} ms)")
+    removed = stream[:num_queries]
+    _, elapsed = timed(lambda: [finder.remove_num(num) for num in removed])
+    print(f"  remove_num     {elapsed / len(removed) * 1e6:6.2f} us")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10**5, 10**6]
+    for size in sizes:
+        benchmark(size)
+
+
+if __name__ == "__main__":
+    main()
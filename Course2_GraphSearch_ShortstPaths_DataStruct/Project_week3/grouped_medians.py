@@ -0,0 +1,226 @@
+#! usr/bin/env python3
+
+"""Running medians of many independent streams at once, one per key (per endpoint latencies, ...).
+
+One MedianFinder_me1 per key costs an object, its __dict__ and two lists of Python ints, even for a key that
+only ever sees a few values. GroupedMedians keeps the state of every key in a slot of shared lists:
+- while a key has at most promote_size values, they are kept sorted in a compact array.array (8 bytes per
+  value, no int objects); insort into it is a short memmove and the median is the middle item;
+- beyond that the sorted buffer is split into the two heaps of MedianFinder_me1 (a negated heapq list for the
+  lower half, a heapq list for the upper half), which is already valid heap order, and the key continues with
+  add_to_heaps in O(log n) per value.
+The records of a batch are grouped by key first (keeping their order within every key), so every key's run
+of values goes through one call."""
+
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+from bisect import insort
+
+from Project_wk3_median_finder_in_built_heap import MedianFinder_me1, add_to_heaps, np
+
+PROMOTE_SIZE = 512
+
+
+class GroupedMedians:
+    """
+    Running medians of the values of every key, with the cumulative sum of the medians of every key.
+    The state of a key is in the slot index[key] of:
+    - buffers: A sorted array.array, or a (max_heap, min_heap) pair once the key has more than promote_size values.
+    - median_sums: The sum of the medians of the key after each of its values.
+    """
+    def __init__(self, promote_size=PROMOTE_SIZE, typecode="q"):
+        """
+            promote_size: Number of values of a key kept in a sorted buffer before switching to two heaps.
+            typecode: array typecode of the values ("q" for integers, "d" for floats).
+        """
+        self.promote_size = promote_size
+        self.typecode = typecode
+        self.index = {}
+        self.buffers = []
+        self.median_sums = []
+
+    def __len__(self):
+        """Number of keys."""
+        return len(self.index)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def keys(self):
+        return self.index.keys()
+
+    def _slot(self, key):
+        """
+        Returns the slot of a key, creating an empty one for a new key.
+        """
+        slot = self.index.get(key)
+        if slot is None:
+            slot = self.index[key] = len(self.buffers)
+            self.buffers.append(array(self.typecode))
+            self.median_sums.append(0)
+        return slot
+
+    def _promote(self, slot):
+        """
+        Replaces the sorted buffer of a slot with the two heaps. A sorted list is a valid heap, so the lower
+        half only needs to be negated in reverse order (the max-heap keeps the extra value of an odd count).
+        """
+        buffer = self.buffers[slot]
+        half = (len(buffer) + 1) // 2
+        heaps = self.buffers[slot] = ([-value for value in reversed(buffer[:half])], buffer[half:].tolist())
+        return heaps
+
+    def _add_run(self, slot, values):
+        """
+        Adds a run of values (a sequence, in stream order) to one slot.
+        """
+        buffer = self.buffers[slot]
+        median_sum = 0
+        if type(buffer) is array:
+            promote_size = self.promote_size
+            i, n = 0, len(values)
+            while i < n and len(buffer) < promote_size:
+                insort(buffer, values[i])
+                median_sum += buffer[(len(buffer) - 1) // 2]
+                i += 1
+            if i == n:
+                self.median_sums[slot] += median_sum
+                return
+            buffer = self._promote(slot)
+            values = values[i:]
+        max_heap, min_heap = buffer
+        median_sum += add_to_heaps(max_heap, min_heap, values)
+        self.median_sums[slot] += median_sum
+
+    def add(self, key, value):
+        """
+        Adds one value to the stream of a key.
+        Returns the median of the values of the key so far.
+        """
+        slot = self._slot(key)
+        self._add_run(slot, (value,))
+        return self._median(slot)
+
+    def add_many(self, records):
+        """
+        Adds a batch of (key, value) records. Only the order of the records of the same key matters.
+        Parameters:
+            records (iterable): (key, value) pairs, e.g. streams.iter_rows(filename).
+        """
+        runs = {}
+        for key, value in records:
+            run = runs.get(key)
+            if run is None:
+                run = runs[key] = []
+            run.append(value)
+        for key, run in runs.items():
+            self._add_run(self._slot(key), run)
+
+    def add_arrays(self, keys, values):
+        """
+        Adds a batch given as two NumPy arrays of the same length (a record per position), grouping the
+        records with a stable sort by key instead of a Python loop.
+        Parameters:
+            keys (ndarray): The key of every record.
+            values (ndarray): The value of every record.
+        """
+        if np is None or not isinstance(keys, np.ndarray):
+            self.add_many(zip(keys, values))
+            return
+        if len(keys) == 0:
+            return
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        sorted_values = values[order]
+        starts = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+        bounds = [0] + starts.tolist() + [len(keys)]
+        for key, start, end in zip(sorted_keys[bounds[:-1]].tolist(), bounds[:-1], bounds[1:]):
+            self._add_run(self._slot(key), sorted_values[start:end].tolist())
+
+    def _median(self, slot):
+        buffer = self.buffers[slot]
+        if type(buffer) is array:
+            return buffer[(len(buffer) - 1) // 2]
+        return -buffer[0][0]
+
+    def median(self, key):
+        """
+        Returns the current median of a key (the lower median for an even count).
+        Raises KeyError for a key without values.
+        """
+        return self._median(self.index[key])
+
+    def median_sum(self, key):
+        """
+        Returns the sum of the medians of a key after each of its values.
+        Raises KeyError for a key without values.
+        """
+        return self.median_sums[self.index[key]]
+
+    def count(self, key):
+        """
+        Returns the number of values of a key (0 for an unknown key).
+        """
+        slot = self.index.get(key)
+        if slot is None:
+            return 0
+        buffer = self.buffers[slot]
+        return len(buffer) if type(buffer) is array else len(buffer[0]) + len(buffer[1])
+
+
+def random_records(num_keys, num_records, seed=0):
+    """Random (key, value) records, key popularity skewed so that a few keys get most of the values."""
+    rng = random.Random(seed)
+    return [(int(rng.paretovariate(1.2) * 7919) % num_keys, rng.randrange(10**6)) for _ in range(num_records)]
+
+
+def measure(build):
+    """Returns (result, seconds, MiB held by the result) of build(); the memory is traced in a second run."""
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    traced = build()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del traced
+    return result, elapsed, memory / 2**20
+
+
+def finders_per_key(records):
+    """The alternative: one MedianFinder_me1 per key."""
+    finders = {}
+    for key, value in records:
+        finder = finders.get(key)
+        if finder is None:
+            finder = finders[key] = MedianFinder_me1()
+        finder.add_num(value)
+    return finders
+
+
+def grouped_medians(records):
+    grouped = GroupedMedians()
+    grouped.add_many(records)
+    return grouped
+
+
+def main():
+    num_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    num_records = int(sys.argv[2]) if len(sys.argv) > 2 else 2000000
+    records = random_records(num_keys, num_records)
+
+    grouped, elapsed, memory = measure(lambda: grouped_medians(records))
+    finders, finders_elapsed, finders_memory = measure(lambda: finders_per_key(records))
+
+    assert all(grouped.median_sum(key) == finder.median_sum for key, finder in finders.items())
+    assert all(grouped.median(key) == -finder.max_heap[0] for key, finder in finders.items())
+    print(f"{num_records} records, {len(grouped)} keys")
+    print(f"  GroupedMedians.add_many      {elapsed:6.2f} s {memory:8.1f} MiB")
+    print(f"  MedianFinder_me1 per key     {finders_elapsed:6.2f} s {finders_memory:8.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#! usr/bin/env python3
+
+"""Indexed heap: the Heap class of Median_finder_own_Heap_class.py with position tracking.
+
+Every entry is a (priority, item) pair and the heap remembers where each item is stored, so the
+priority of an item can be changed (decrease-key) or the item removed in O(log n), instead of pushing
+duplicates and skipping stale entries later."""
+
+from Median_finder_own_Heap_class import Heap
+
+
+class IndexedHeap(Heap):
+    def __init__(self, is_min_heap=True):
+        """
+            Initializes an empty indexed heap as either a min-heap or max-heap.
+            is_min_heap: If True, the heap acts as a min-heap. If False, it acts as a max-heap.
+        """
+        super().__init__(is_min_heap)
+        # item -> index of its entry in self.heap
+        self.position = {}
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, item):
+        return item in self.position
+
+    def insert(self, item, priority):
+        """
+            Inserts an item with the given priority. The item must not be in the heap yet.
+        """
+        self.position[item] = len(self.heap)
+        super().insert((priority, item))
+
+    def remove_root(self):
+        """
+        Removes and returns the root entry (priority, item), or None if the heap is empty.
+        """
+        if len(self.heap) == 0:
+            return None
+        root = self.heap[0]
+        del self.position[root[1]]
+        last_value = self.heap.pop()
+        if len(self.heap) > 0:
+            self.heap[0] = last_value
+            self.position[last_value[1]] = 0
+            self.bubble_down(0)
+        return root
+
+    def heapify(self, entries):
+        """
+        Replaces the contents of the heap with (priority, item) entries in O(n), and rebuilds the positions.
+        Raises ValueError if an item appears twice.
+        """
+        self.heap = list(entries)
+        self.position = {item: index for index, (_, item) in enumerate(self.heap)}
+        if len(self.position) != len(self.heap):
+            raise ValueError("an item can only be in an indexed heap once")
+        for index in reversed(range(len(self.heap) // 2)):
+            self.bubble_down(index)
+
+    def pushpop(self, item, priority):
+        """
+        Inserts an item (not in the heap yet) then removes and returns the root entry (priority, item),
+        with one sift. Returns the new entry itself if it belongs before the current root.
+        """
+        entry = (priority, item)
+        if len(self.heap) == 0 or not self.higher(self.heap[0], entry):
+            return entry
+        return self.replace(item, priority)
+
+    def replace(self, item, priority):
+        """
+        Removes and returns the root entry (priority, item), then inserts an item (not in the heap yet),
+        with one sift. Raises IndexError if the heap is empty.
+        """
+        if len(self.heap) == 0:
+            raise IndexError("replace on an empty heap")
+        root = self.heap[0]
+        del self.position[root[1]]
+        self.heap[0] = (priority, item)
+        self.position[item] = 0
+        self.bubble_down(0)
+        return root
+
+    def priority(self, item):
+        """
+        Returns the current priority of an item in the heap.
+        """
+        return self.heap[self.position[item]][0]
+
+    def update(self, item, priority):
+        """
+        Changes the priority of an item in the heap (decrease-key or increase-key), O(log n).
+        """
+        index = self.position[item]
+        self.heap[index] = (priority, item)
+        self.bubble_up(index)
+        self.bubble_down(self.position[item])
+
+    def push(self, item, priority):
+        """
+        Inserts the item, or updates its priority if it is already in the heap.
+        """
+        if item in self.position:
+            self.update(item, priority)
+        else:
+            self.insert(item, priority)
+
+    def remove(self, item):
+        """
+        Removes an arbitrary item from the heap, O(log n). Returns its priority.
+        """
+        index = self.position.pop(item)
+        priority = self.heap[index][0]
+        last_value = self.heap.pop()
+        if index < len(self.heap):
+            self.heap[index] = last_value
+            self.position[last_value[1]] = index
+            self.bubble_up(index)
+            self.bubble_down(self.position[last_value[1]])
+        return priority
+
+    def bubble_up(self, index):
+        """
+        Moves an entry upwards to restore the heap property, keeping the positions up to date.
+        """
+        heap, higher, position = self.heap, self.higher, self.position
+        entry = heap[index]
+        while index > 0:
+            parent_index = (index - 1) // 2
+            parent = heap[parent_index]
+            if not higher(entry, parent):
+                break
+            heap[index] = parent
+            position[parent[1]] = index
+            index = parent_index
+        heap[index] = entry
+        position[entry[1]] = index
+
+    def bubble_down(self, index):
+        """
+        Moves an entry downwards to restore the heap property, keeping the positions up to date.
+        """
+        heap, higher, position = self.heap, self.higher, self.position
+        n = len(heap)
+        entry = heap[index]
+        while True:
+            best = 2 * index + 1
+            if best >= n:
+                break
+            if best + 1 < n and higher(heap[best + 1], heap[best]):
+                best += 1
+            child = heap[best]
+            if not higher(child, entry):
+                break
+            heap[index] = child
+            position[child[1]] = index
+            index = best
+        heap[index] = entry
+        position[entry[1]] = index
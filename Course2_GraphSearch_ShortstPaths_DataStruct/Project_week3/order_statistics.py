@@ -0,0 +1,278 @@
+#! usr/bin/env python3
+
+"""Order-statistic container for streams: insert, delete, k-th smallest, rank and any quantile.
+
+The two heaps of MedianFinder only expose the middle of the stream. OrderStatisticList keeps all the values
+sorted in a list of blocks (sorted Python lists of load to 2 * load values) and a Fenwick tree (binary indexed
+tree) over the block lengths:
+- insert/remove: bisect on the largest value of every block, then insort/del inside one block.
+- select(k) and quantile(q): descend the Fenwick tree to the block holding the k-th value, O(log n).
+- rank(x): bisect to the block, prefix sum of the lengths of the blocks before it, bisect inside it, O(log n).
+Moving values inside a block of at most 2 * load values is a memmove, so insert and remove are O(log n) plus
+a small constant block shift. Blocks are split when they grow beyond 2 * load and merged with a neighbor
+below load / 2, which rebuilds the block index in O(n / load), once every ~load updates.
+
+OrderStatisticMedianFinder wraps it with the interface of MedianFinder (add_num, median_sum,
+get_median_modulo), plus remove_num, quantile and rank."""
+
+from bisect import bisect_left, bisect_right, insort
+from math import ceil
+
+DEFAULT_LOAD = 512
+# Relative tolerance under which q * n is taken as the integer it rounds to
+RANK_TOLERANCE = 1e-9
+
+
+def nearest_rank(q, n):
+    """
+    Returns the 1-based nearest rank ceil(q * n) of the q-quantile of n values (at least 1). q * n within
+    float rounding error of an integer counts as that integer, so 0.07 * 100 = 7.000000000000001 gives 7.
+    """
+    rank = q * n
+    nearest = round(rank)
+    if abs(rank - nearest) <= RANK_TOLERANCE * max(nearest, 1):
+        rank = nearest
+    return max(ceil(rank), 1)
+
+
+class OrderStatisticList:
+    def __init__(self, values=(), load=DEFAULT_LOAD):
+        """
+            Initializes the container with the given values (sorted once, in O(n log n)).
+            values: Initial values, any iterable of mutually comparable values.
+            load: Target block size.
+        """
+        self.load = load
+        values = sorted(values)
+        self.blocks = [values[i:i + load] for i in range(0, len(values), load)]
+        self._reindex()
+
+    def _reindex(self):
+        """
+        Rebuilds the largest value of every block and the Fenwick tree of the block lengths, O(number of blocks).
+        """
+        self.maxes = [block[-1] for block in self.blocks]
+        tree = [0] + [len(block) for block in self.blocks]
+        num_blocks = len(self.blocks)
+        for i in range(1, num_blocks + 1):
+            parent = i + (i & -i)
+            if parent <= num_blocks:
+                tree[parent] += tree[i]
+        self.tree = tree
+        self.size = sum(len(block) for block in self.blocks)
+        # Highest power of two <= number of blocks, start of the descent in _locate
+        self.top_bit = 1 << (num_blocks.bit_length() - 1) if num_blocks else 0
+
+    def _add_length(self, block_index, delta):
+        """
+        Adds delta to the length of a block in the Fenwick tree.
+        """
+        tree = self.tree
+        num_nodes = len(tree)
+        i = block_index + 1
+        while i < num_nodes:
+            tree[i] += delta
+            i += i & -i
+        self.size += delta
+
+    def _prefix_length(self, block_index):
+        """
+        Returns the number of values in the blocks before block_index.
+        """
+        tree = self.tree
+        total = 0
+        i = block_index
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, k):
+        """
+        Returns (block index, index in the block) of the k-th smallest value, 0 <= k < len(self).
+        """
+        tree = self.tree
+        num_blocks = len(self.blocks)
+        position = 0
+        bit = self.top_bit
+        while bit:
+            following = position + bit
+            if following <= num_blocks and tree[following] <= k:
+                position = following
+                k -= tree[following]
+            bit >>= 1
+        return position, k
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for block in self.blocks:
+            yield from block
+
+    def __contains__(self, value):
+        i = bisect_left(self.maxes, value)
+        if i == len(self.maxes):
+            return False
+        block = self.blocks[i]
+        return block[bisect_left(block, value)] == value
+
+    def insert(self, value):
+        """
+        Inserts a value (duplicates are kept), O(log n).
+        """
+        if not self.blocks:
+            self.blocks.append([value])
+            self._reindex()
+            return
+        i = bisect_left(self.maxes, value)
+        if i == len(self.maxes):
+            # Larger than everything: goes at the end of the last block
+            i -= 1
+        block = self.blocks[i]
+        insort(block, value)
+        self.maxes[i] = block[-1]
+        if len(block) > 2 * self.load:
+            self.blocks[i:i + 1] = [block[:self.load], block[self.load:]]
+            self._reindex()
+        else:
+            self._add_length(i, 1)
+
+    def remove(self, value):
+        """
+        Removes one occurrence of a value, O(log n).
+        Raises ValueError if the value is not in the container.
+        """
+        i = bisect_left(self.maxes, value)
+        if i == len(self.maxes):
+            raise ValueError(f"{value!r} is not in the container")
+        block = self.blocks[i]
+        j = bisect_left(block, value)
+        if block[j] != value:
+            raise ValueError(f"{value!r} is not in the container")
+        del block[j]
+        if len(block) < self.load // 2 and len(self.blocks) > 1:
+            self._merge(i)
+        elif not block:
+            del self.blocks[i]
+            self._reindex()
+        else:
+            self.maxes[i] = block[-1]
+            self._add_length(i, -1)
+
+    def _merge(self, i):
+        """
+        Merges a small block with a neighbor, and splits the result again if it is too large.
+        """
+        if i == len(self.blocks) - 1:
+            i -= 1
+        merged = self.blocks[i] + self.blocks[i + 1]
+        if len(merged) > 2 * self.load:
+            half = len(merged) // 2
+            self.blocks[i:i + 2] = [merged[:half], merged[half:]]
+        else:
+            self.blocks[i:i + 2] = [merged]
+        self._reindex()
+
+    def select(self, k):
+        """
+        Returns the k-th smallest value (0-based, negative k counts from the largest), O(log n).
+        Raises IndexError if k is out of range.
+        """
+        if k < 0:
+            k += self.size
+        if not 0 <= k < self.size:
+            raise IndexError("order statistic out of range")
+        i, j = self._locate(k)
+        return self.blocks[i][j]
+
+    __getitem__ = select
+
+    def rank(self, value):
+        """
+        Returns the number of values strictly smaller than value, O(log n).
+        """
+        i = bisect_left(self.maxes, value)
+        if i == len(self.maxes):
+            return self.size
+        return self._prefix_length(i) + bisect_left(self.blocks[i], value)
+
+    def rank_right(self, value):
+        """
+        Returns the number of values smaller than or equal to value, O(log n).
+        """
+        i = bisect_right(self.maxes, value)
+        if i == len(self.maxes):
+            return self.size
+        return self._prefix_length(i) + bisect_right(self.blocks[i], value)
+
+    def quantile(self, q):
+        """
+        Returns the q-quantile with the nearest-rank definition: the smallest value such that at least a
+        fraction q of the values are <= it. quantile(0.5) is the lower median, like MedianFinder.
+        q: Fraction between 0 and 1 (0.9 for p90).
+        Raises IndexError if the container is empty.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        return self.select(nearest_rank(q, self.size) - 1)
+
+    def quantiles(self, qs):
+        """
+        Returns the list of the quantiles for every fraction in qs.
+        """
+        return [self.quantile(q) for q in qs]
+
+
+class OrderStatisticMedianFinder:
+    """
+    Drop-in replacement for MedianFinder backed by an OrderStatisticList, so the same stream can also be
+    queried for any quantile or rank, and values can be removed.
+    Also keeps the cumulative sum of medians (median_sum).
+    """
+    def __init__(self, load=DEFAULT_LOAD):
+        self.values = OrderStatisticList(load=load)
+        self.median_sum = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def add_num(self, num):
+        """
+        Adds a new number.
+        num: The number to add.
+        Returns the median of the numbers added so far.
+        """
+        self.values.insert(num)
+        median = self.values.quantile(0.5)
+        self.median_sum += median
+        return median
+
+    def add_many(self, numbers):
+        """
+        Adds a batch of numbers, same result as add_num on each of them.
+        """
+        for num in numbers:
+            self.add_num(num)
+
+    def remove_num(self, num):
+        """
+        Removes one occurrence of a number added before (median_sum is not changed).
+        Raises ValueError if the number is not present.
+        """
+        self.values.remove(num)
+
+    def get_median(self):
+        """
+        Returns the current median, or None if there are no numbers.
+        """
+        return self.values.quantile(0.5) if len(self.values) else None
+
+    def quantile(self, q):
+        return self.values.quantile(q)
+
+    def rank(self, num):
+        return self.values.rank(num)
+
+    def get_median_modulo(self):
+        return self.median_sum % 10000
@@ -0,0 +1,263 @@
+#! usr/bin/env python3
+
+"""Approximate quantiles of unbounded streams in bounded memory: the KLL sketch (Karnin, Lang, Liberty 2016).
+
+The exact median finders keep every number of the stream in their heaps. A KLLSketch keeps a few hundred
+values whatever the length of the stream: a stack of compactors, where level h holds values that each stand
+for 2^h values of the stream. When a level is full it is sorted and every other value (random offset) moves
+up one level with twice the weight. The rank of any value is then known up to an additive error of about
+error * n with high probability, and the memory (max_size values) grows only with log(n / k).
+
+Sketches of different shards of a stream merge into a sketch of the whole stream, and they serialize to
+bytes (JSON), so shards can be summarized by separate worker processes and combined by the parent:
+
+    sketches = pool.map(sketch_of_shard, shards)          # each returns KLLSketch(...).to_bytes()
+    total = merge_sketches(KLLSketch.from_bytes(data) for data in sketches)
+    total.quantile(0.5), total.quantile(0.99)
+"""
+
+import json
+import random
+import sys
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+
+from Project_wk3_median_finder_in_built_heap import MedianFinder_me1
+from order_statistics import nearest_rank
+
+DEFAULT_K = 200
+# Capacity ratio between consecutive levels
+DECAY = 2 / 3
+# Measured rank error is at most about 1.7 / k, the constant leaves a margin
+ERROR_CONSTANT = 2.0
+
+
+def k_for_error(error):
+    """
+    Returns the k parameter of a KLLSketch whose rank error stays within error (fraction of n).
+    """
+    if not 0 < error < 1:
+        raise ValueError("error must be between 0 and 1")
+    return max(ceil(ERROR_CONSTANT / error), 8)
+
+
+class KLLSketch:
+    def __init__(self, k=DEFAULT_K, error=None, seed=None):
+        """
+            Initializes an empty sketch.
+            k: Capacity of the top compactor, the memory and the accuracy grow with it.
+            error: Target rank error instead of k (see k_for_error), e.g. 0.01 for 1% of n.
+            seed: Seed of the coin flips, for reproducible sketches.
+        """
+        self.k = k_for_error(error) if error is not None else k
+        self.compactors = [[]]
+        # Number of stream values summarized
+        self.n = 0
+        self.rng = random.Random(seed)
+        self._update_capacity()
+
+    def _capacity(self, level):
+        """
+        Returns the capacity of a level: k at the top, decreasing by DECAY towards the bottom.
+        """
+        depth = len(self.compactors) - level - 1
+        return int(ceil(self.k * DECAY ** depth)) + 1
+
+    def _update_capacity(self):
+        self.num_retained = sum(len(compactor) for compactor in self.compactors)
+        self.max_size = sum(self._capacity(level) for level in range(len(self.compactors)))
+
+    def __len__(self):
+        return self.n
+
+    def update(self, value):
+        """
+        Adds one value of the stream.
+        """
+        self.compactors[0].append(value)
+        self.n += 1
+        self.num_retained += 1
+        if self.num_retained >= self.max_size:
+            self._compress()
+
+    def update_many(self, values):
+        """
+        Adds the values of an iterable.
+        """
+        for value in values:
+            self.update(value)
+
+    def _compress(self):
+        """
+        Compacts the lowest full level into the next one, until the sketch is within max_size.
+        """
+        while self.num_retained >= self.max_size:
+            for level, compactor in enumerate(self.compactors):
+                if len(compactor) >= self._capacity(level):
+                    if level + 1 == len(self.compactors):
+                        self.compactors.append([])
+                    compactor.sort()
+                    # An odd value out stays at this level
+                    keep = [compactor.pop()] if len(compactor) % 2 else []
+                    self.compactors[level + 1].extend(compactor[self.rng.randrange(2)::2])
+                    self.compactors[level] = keep
+                    break
+            self._update_capacity()
+
+    def merge(self, other):
+        """
+        Adds the values summarized by another sketch (the error bound of the larger k of the two holds).
+        Returns the sketch itself.
+        """
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, compactor in enumerate(other.compactors):
+            self.compactors[level].extend(compactor)
+        self.n += other.n
+        self._update_capacity()
+        self._compress()
+        return self
+
+    def _weighted_values(self):
+        """
+        Returns the retained values in sorted order, and the cumulative weights (number of stream values
+        each of them and the smaller ones stand for).
+        """
+        pairs = sorted((value, 1 << level) for level, compactor in enumerate(self.compactors)
+                       for value in compactor)
+        values = [value for value, _ in pairs]
+        cumulative = []
+        total = 0
+        for _, weight in pairs:
+            total += weight
+            cumulative.append(total)
+        return values, cumulative
+
+    def rank(self, value):
+        """
+        Returns the estimated number of stream values <= value.
+        """
+        return sum(sum(1 for item in compactor if item <= value) << level
+                   for level, compactor in enumerate(self.compactors))
+
+    def quantile(self, q):
+        """
+        Returns the estimated q-quantile (nearest rank, so quantile(0.5) estimates the lower median of
+        MedianFinder), or None if the sketch is empty.
+        q: Fraction between 0 and 1.
+        """
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs):
+        """
+        Returns the list of the estimated quantiles for every fraction in qs, sorting the sketch once.
+        """
+        if any(not 0 <= q <= 1 for q in qs):
+            raise ValueError("q must be between 0 and 1")
+        if self.n == 0:
+            return [None] * len(qs)
+        values, cumulative = self._weighted_values()
+        total = cumulative[-1]
+        return [values[min(bisect_left(cumulative, nearest_rank(q, total)), len(values) - 1)] for q in qs]
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def to_bytes(self):
+        """
+        Serializes the sketch (the values must be JSON numbers or strings).
+        """
+        return json.dumps({"k": self.k, "n": self.n, "compactors": self.compactors}).encode()
+
+    @classmethod
+    def from_bytes(cls, data, seed=None):
+        """
+        Rebuilds a sketch serialized by to_bytes.
+        """
+        state = json.loads(data)
+        sketch = cls(k=state["k"], seed=seed)
+        sketch.compactors = state["compactors"]
+        sketch.n = state["n"]
+        sketch._update_capacity()
+        return sketch
+
+
+def merge_sketches(sketches):
+    """
+    Merges an iterable of sketches into a new sketch of the union of their streams.
+    """
+    sketches = list(sketches)
+    merged = KLLSketch(k=max((sketch.k for sketch in sketches), default=DEFAULT_K))
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
+
+
+def sketch_of_values(values, error, seed=None):
+    """
+    Serialized sketch of a list of values, the task of a worker process in parallel_sketch.
+    """
+    sketch = KLLSketch(error=error, seed=seed)
+    sketch.update_many(values)
+    return sketch.to_bytes()
+
+
+def parallel_sketch(values, error=0.01, workers=4):
+    """
+    Sketches a list of values in workers shards, one process per shard, and merges the shard sketches.
+    """
+    shard_size = ceil(len(values) / workers) or 1
+    shards = [values[start:start + shard_size] for start in range(0, len(values), shard_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        data = list(pool.map(sketch_of_values, shards, [error] * len(shards), range(len(shards))))
+    return merge_sketches(KLLSketch.from_bytes(shard) for shard in data)
+
+
+def rank_error(sorted_values, value, q):
+    """
+    Returns how far (as a fraction of n) the nearest rank of q is from the ranks value occupies in the data.
+    """
+    n = len(sorted_values)
+    target = nearest_rank(q, n)
+    low, high = bisect_left(sorted_values, value) + 1, bisect_right(sorted_values, value)
+    return max(low - target, target - high, 0) / n
+
+
+def check_error_bound(size=10**6, error=0.01, workers=4, seed=0):
+    """
+    Compares the sketch against the exact results: the median of MedianFinder_me1 and the exact quantiles of
+    the sorted stream, for a sketch built in one process and one merged from worker shards.
+    Returns the largest rank error observed, asserts that it stays within error.
+    """
+    rng = random.Random(seed)
+    values = [int(rng.lognormvariate(10, 2)) for _ in range(size)]
+    median_finder = MedianFinder_me1()
+    median_finder.add_many(values)
+    exact_median = -median_finder.max_heap[0]
+    sorted_values = sorted(values)
+
+    single = KLLSketch(error=error, seed=seed)
+    single.update_many(values)
+    merged = parallel_sketch(values, error, workers)
+    qs = [i / 100 for i in range(101)]
+    worst = 0
+    for name, sketch in (("single", single), ("merged", merged)):
+        estimates = sketch.quantiles(qs)
+        errors = [rank_error(sorted_values, value, q) for value, q in zip(estimates, qs)]
+        worst = max(worst, max(errors))
+        print(f"{name}: k={sketch.k}, {sketch.num_retained} values kept for {sketch.n}, median {sketch.median()} "
+              f"(exact {exact_median}), largest rank error {max(errors):.4f} (bound {error})")
+        assert rank_error(sorted_values, sketch.median(), 0.5) <= error
+        assert max(errors) <= error
+    return worst
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+    for error in (0.05, 0.01, 0.002):
+        check_error_bound(size, error)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#! usr/bin/env python3
+
+"""Running median over a sliding window: the median of the last window_size numbers of a stream.
+
+Same two heaps as MedianFinder (max-heap for the lower half, min-heap for the upper half), but they are
+IndexedHeaps (indexed_heap.py) keyed by the position of each number in the stream, so the number that falls
+out of the window can be removed from whichever heap holds it. Every slide is one insertion, one removal and
+at most one move between the heaps: O(log window_size), whatever the length of the stream."""
+
+import os
+import sys
+
+#shared streaming readers live in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from streams import iter_values
+from indexed_heap import IndexedHeap
+
+
+class WindowMedianFinder:
+    """
+    Median of the last window_size numbers added:
+    - max_heap: An indexed max-heap with the smaller half of the window.
+    - min_heap: An indexed min-heap with the larger half of the window.
+    The items of both heaps are the positions of the numbers in the stream, their priorities the numbers.
+    Also keeps the cumulative sum of the window medians (median_sum).
+    """
+    def __init__(self, window_size):
+        if window_size < 1:
+            raise ValueError("window_size must be at least 1")
+        self.window_size = window_size
+        self.max_heap = IndexedHeap(is_min_heap=False)
+        self.min_heap = IndexedHeap(is_min_heap=True)
+        # Number of numbers added so far, also the position of the next one
+        self.count = 0
+        self.median_sum = 0
+
+    def __len__(self):
+        """Number of values in the window."""
+        return len(self.max_heap) + len(self.min_heap)
+
+    def add_num(self, num):
+        """
+        Adds a new number, removes the number that leaves the window and re-balances the heaps.
+        num: The number to add.
+        Returns the median of the window (the lower median when the window holds an even count).
+        """
+        position = self.count
+        self.count += 1
+        if len(self.max_heap) == 0 or num <= self.max_heap.root()[0]:
+            self.max_heap.insert(position, num)
+        else:
+            self.min_heap.insert(position, num)
+
+        # The number added window_size steps ago expires
+        expired = position - self.window_size
+        if expired >= 0:
+            if expired in self.max_heap:
+                self.max_heap.remove(expired)
+            else:
+                self.min_heap.remove(expired)
+
+        # Re-balance heaps if necessary, the max-heap keeps the extra number of an odd window
+        if len(self.max_heap) > len(self.min_heap) + 1:
+            priority, item = self.max_heap.remove_root()
+            self.min_heap.insert(item, priority)
+        elif len(self.min_heap) > len(self.max_heap):
+            priority, item = self.min_heap.remove_root()
+            self.max_heap.insert(item, priority)
+
+        median = self.max_heap.root()[0]
+        self.median_sum += median
+        return median
+
+    def get_median(self):
+        """
+        Returns the median of the current window, or None if nothing was added.
+        """
+        root = self.max_heap.root()
+        return None if root is None else root[0]
+
+    def get_median_modulo(self):
+        return self.median_sum % 10000
+
+
+def window_medians(numbers, window_size):
+    """
+    Generator of the sliding window medians of a stream: yields the median of the last window_size numbers
+    after each number (of all the numbers so far while the first window fills up). Works as a transform
+    stage of streams.pipeline.
+    Parameters:
+        numbers (iterable): The stream of numbers, e.g. streams.iter_values(filename).
+        window_size (int): Number of most recent numbers the median is taken over.
+    """
+    median_finder = WindowMedianFinder(window_size)
+    for num in numbers:
+        yield median_finder.add_num(num)
+
+
+def main():
+    window_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    median_finder = WindowMedianFinder(window_size)
+    for num in iter_values("Median_maint_data_wk3_Graphs.txt"):
+        median_finder.add_num(num)
+    print(f"window of {window_size}: sum of the medians % 10000 = {median_finder.get_median_modulo()}")
+
+
+if __name__ == '__main__':
+    main()
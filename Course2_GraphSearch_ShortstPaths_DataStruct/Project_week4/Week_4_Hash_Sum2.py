@@ -4,6 +4,12 @@ Author: Haris Spyridis
 Description:
 This script is for the project for the course 2 (Graph Search, Week 4) for Algorithmm Specialization  offered by
 Stanford in Coursera."""
+import os
+import sys
+
+#shared bulk integer reader lives in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from int_reader import read_int_column
 
 
 def parse_file(file_name):
@@ -17,9 +23,9 @@ def parse_file(file_name):
         List[int]: A list of integers parsed from the file.
     """
 
-    with open(file_name, "r") as f:
-        data = f.readlines()
-    numbers = [int(line.rstrip()) for line in data if line.strip() !=""]
+    #one number per line, read in bulk (empty lines are skipped)
+    _, numbers = read_int_column(file_name)
+    numbers = numbers.tolist()
 
     return numbers
 
@@ -1,8 +1,15 @@
 """A script for the project in Algorithms Specialization (Stanford), course 3 (greedy algorithms) week 2
 In the script both q1 and q2 are solved"""
 import math
+import os
+import sys
 import unittest
 
+#shared bulk integer reader lives in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from int_reader import read_int_columns
+from result_cache import ResultCache
+
 
 class Unionfind:
     """Union-Find data structure for efficient union and find operations."""
@@ -59,17 +66,10 @@ def parse_file_q1(filename):
               and values are lists of tuples (neighbor, edge_cost).
     """
     adj_list = {}
-    with open(filename, "r") as f:
-        #skip number of nodes (first line)
-        next(f)
-        data = f.readlines()
-
-    for line in data:
-        line = line.rstrip().split()
+    #skip number of nodes (first line), the three columns are read in bulk
+    _, (tails, heads, costs) = read_int_columns(filename, 3, header_lines=1)
 
-        u = int(line[0])
-        v = int(line[1])
-        edge_cost = int(line[2])
+    for u, v, edge_cost in zip(tails.tolist(), heads.tolist(), costs.tolist()):
 
         if u in adj_list:
             adj_list[u].append((v,edge_cost))
@@ -292,8 +292,15 @@ def largest_k_clustering_using_bitmasks(nodes_to_int,ints_to_idx,bits = 24):
     return clusters
 
 
-def main():
-    """Main function to run the clustering algorithms for both questions."""
+def main(use_cache=True):
+    """Main function to run the clustering algorithms for both questions.
+
+    Args:
+        use_cache (bool): Reuse the parsed nodes and the answer of question 2 from the on-disk result cache
+                          (see Common/result_cache.py) when the input file did not change.
+    """
+    cache = ResultCache(enabled=use_cache)
+
     # Question 1
     adj_list_data = parse_file_q1("clustering1_q1.txt")
     num_clusters = 4
@@ -301,11 +308,17 @@ def main():
     print(f'Maximum spacing for clustering: {max_spacing}')
 
     # Question 2
-    nodes_to_int, ints_to_idx = parseq2_to_ints("clustering_big_q2.txt")
-    largest_clusters = largest_k_clustering_using_bitmasks(nodes_to_int, ints_to_idx, bits=24)
+    def clusters_q2():
+        # the parsed nodes are cached too, for other runs on the same file
+        nodes_to_int, ints_to_idx = cache.cached("parseq2_to_ints:v1", "clustering_big_q2.txt", {},
+                                                 lambda: parseq2_to_ints("clustering_big_q2.txt"))
+        return largest_k_clustering_using_bitmasks(nodes_to_int, ints_to_idx, bits=24)
+
+    largest_clusters = cache.cached("largest_k_clustering_using_bitmasks:v1", "clustering_big_q2.txt", {"bits": 24},
+                                    clusters_q2)
     print(f'Largest clusters based on Hamming distance: {largest_clusters}')
 
 
 if __name__ == "__main__":
-    main()
+    main(use_cache="--no-cache" not in sys.argv)
 
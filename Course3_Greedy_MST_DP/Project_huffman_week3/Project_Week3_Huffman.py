@@ -1,4 +1,11 @@
 import heapq
+import os
+import sys
+
+#shared bulk integer reader lives in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from int_reader import read_int_column
+from result_cache import ResultCache
 
 def parse_data_q1(filename):
     """Parse weights from a file.
@@ -10,12 +17,9 @@ def parse_data_q1(filename):
         list: A list of integer weights (frequencies of symbols).
     """
 
-    with open(filename) as f:
-        #skip the number of symbols
-        next(f)
-        data = f.readlines()
-
-    lis_weights = [int(line.strip()) for line in data]
+    #skip the number of symbols, the weights are read in bulk
+    _, weights = read_int_column(filename, header_lines=1)
+    lis_weights = weights.tolist()
 
     return lis_weights
 
@@ -71,12 +75,9 @@ def read_weights_from_file(filename):
     Returns:
         list: A list of integer weights (frequencies of symbols).
     """
-    with open(filename) as f:
-        next(f)  # Skip the number of symbols
-        data = f.readlines()
-
-    # Convert lines to integers and strip whitespace
-    weights = [int(line.strip()) for line in data]
+    # Skip the number of symbols and read the weights in bulk
+    _, weights = read_int_column(filename, header_lines=1)
+    weights = weights.tolist()
     return weights
 
 def compute_max_weights(weights):
@@ -135,11 +136,17 @@ def generate_binary_string(included_indices, target_vertices):
     """
     return "".join("1" if vertex in included_indices else "0" for vertex in target_vertices)
 
-def main():
-    """Main function to execute the Huffman coding implementation."""
+def main(use_cache=True):
+    """Main function to execute the Huffman coding implementation.
+
+    Args:
+        use_cache (bool): Take the codeword lengths from the on-disk result cache (see Common/result_cache.py)
+                          when the input file did not change.
+    """
+    cache = ResultCache(enabled=use_cache)
     #Q1 and Q2 for max and min length of a codeword
-    weights = parse_data_q1("test_case.txt")
-    max_depth, min_depth = huffman_implem(weights)
+    max_depth, min_depth = cache.cached("huffman_implem:v1", "test_case.txt", {},
+                                        lambda: huffman_implem(parse_data_q1("test_case.txt")))
 
     #question 3
     weights2 = read_weights_from_file('q3_data_w3_DP.txt')
@@ -154,4 +161,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main(use_cache="--no-cache" not in sys.argv)
\ No newline at end of file
@@ -1,6 +1,12 @@
 #! usr/bin/env python3
+import os
 import sys
 
+#shared bulk integer reader lives in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from int_reader import read_int_columns
+from result_cache import ResultCache
+
 
 def parse_knapsack_file(filename):
     """Parses the input file. First line has knapsack size and number of items.
@@ -12,18 +18,10 @@ def parse_knapsack_file(filename):
     Returns:
         tuple: Knapsack size, number of items, list of values, list of weights.
     """
-    with open(filename) as f:
-        #read first line
-        first_line = f.readline().rstrip().split()
-        knapsack_size, items = int(first_line[0]), int(first_line[1])
-
-        data = f.readlines()
-    values = []
-    weights = []
-    for line in data:
-        line = line.rstrip().split()
-        values.append(int(line[0]))
-        weights.append(int(line[1]))
+    #first line is the header, the value and weight columns are read in bulk
+    (first_line,), (values, weights) = read_int_columns(filename, 2, header_lines=1)
+    knapsack_size, items = first_line[0], first_line[1]
+    values, weights = values.tolist(), weights.tolist()
 
     return knapsack_size,items, values, weights
 
@@ -97,7 +95,10 @@ def knapsack_recursive_memoization(knapsack_capacity, no_items, values, weights,
     memo[(no_items, knapsack_capacity)] = result
 
     return result
-def main():
+def main(use_cache=True):
+    """Solves both questions. With use_cache the answer of question 2 comes from the on-disk result cache
+    (see Common/result_cache.py) when the input file did not change."""
+    cache = ResultCache(enabled=use_cache)
 
     knapsack_capacity, no_items, values, weights  = parse_knapsack_file("knapsack1_input.txt")
     max_value_q1 = knapsack_q1(knapsack_capacity, no_items,values, weights)
@@ -107,12 +108,15 @@ def main():
 
     #Question 2
     sys.setrecursionlimit(3000)
-    knapsack_capacity, no_items, values, weights  = parse_knapsack_file("knapsack_big_wk2_project_q2.txt")
 
-    # Calculate maximum value using recursive memoization
-    max_value_q2 = knapsack_recursive_memoization(knapsack_capacity,no_items,values,weights)
+    def max_value():
+        knapsack_capacity, no_items, values, weights  = parse_knapsack_file("knapsack_big_wk2_project_q2.txt")
+        # Calculate maximum value using recursive memoization
+        return knapsack_recursive_memoization(knapsack_capacity,no_items,values,weights)
+
+    max_value_q2 = cache.cached("knapsack_recursive_memoization:v1", "knapsack_big_wk2_project_q2.txt", {}, max_value)
     print(max_value_q2)
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main(use_cache="--no-cache" not in sys.argv)
\ No newline at end of file
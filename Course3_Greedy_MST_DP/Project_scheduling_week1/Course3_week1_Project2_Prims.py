@@ -1,4 +1,12 @@
 import heapq
+import os
+import sys
+
+#shared CSR graph core lives in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from csr_graph import CSRGraph, load_edge_list
+from binary_graph import BINARY_EXTENSION, load_binary_graph
+from int_reader import read_int_columns
 
 
 def parse_graph(filename):
@@ -14,31 +22,39 @@ def parse_graph(filename):
               and its value is a list of tuples (neighbor, cost).
     """
     adj_list = {}
-    with open(filename, 'r') as f:
-
-        #skip first line
-        #next(f)
-
+    #read the three columns in bulk, the vertices are kept as strings
+    _, (tails, heads, costs) = read_int_columns(filename, 3)
+
+    for u, v, cost in zip(map(str, tails.tolist()), map(str, heads.tolist()), costs.tolist()):
+        if u in adj_list:
+            adj_list[u].append((v, cost))
+        else:
+            adj_list[u] = [(v, cost)]
+
+        # Add the edge in reverse direction for undirected graph
+        if v in adj_list:
+            adj_list[v].append((u, cost))
+        else:
+            adj_list[v] = [(u, cost)]
+    return adj_list
 
-        data = f.readlines()
 
-        for line in data:
-            line = line.rstrip().split()
-            u = line[0]
-            v = line[1]
-            cost = int(line[2])
+def parse_graph_csr(filename, skip_header=False):
+    """
+    Parses a graph from a specified file into an undirected CSRGraph (see Common/csr_graph.py).
 
-            if u in adj_list:
-                adj_list[u].append((v, cost))
-            else:
-                adj_list[u] = [(v, cost)]
+    Input:
+        filename (str): The name of the file containing the graph data.
+                        Each line contains two vertices and the cost of the edge between them.
+                        A .csrg file is memory-mapped instead (see Common/binary_graph.py).
+        skip_header (bool): Skip the first line (number of vertices and edges), as in Prims_data_edges.txt.
 
-            # Add the edge in reverse direction for undirected graph
-            if v in adj_list:
-                adj_list[v].append((u, cost))
-            else:
-                adj_list[v] = [(u, cost)]
-    return adj_list
+    Output:
+        CSRGraph: The graph, with the vertex labels kept as strings like parse_graph.
+    """
+    if filename.endswith(BINARY_EXTENSION):
+        return load_binary_graph(filename)
+    return load_edge_list(filename, weighted=True, undirected=True, skip_header=skip_header, label_type=str)
 
 
 def prims_algortihm(adj_list):
@@ -111,12 +127,15 @@ def prim_heap(adj_list):
     Implements Prim's algorithm using a priority queue (heap) for better performance.
 
     Input:
-        adj_list (dict): A graph represented as an adjacency list.
+        adj_list (dict or CSRGraph): A graph represented as an adjacency list.
 
     Output:
         list: A list of tuples representing the edges of the MST,
               where each tuple is (node1, node2, weight).
     """
+    if isinstance(adj_list, CSRGraph):
+        return prim_heap_csr(adj_list)
+
     #a list to store edge of mst
     mst = []
     #a dic to keep track of min cost
@@ -155,6 +174,51 @@ def prim_heap(adj_list):
 
     return mst
 
+
+def prim_heap_csr(graph):
+    """
+    prim_heap on a CSRGraph, using dense vertex ids and flat lists instead of dicts.
+
+    Input:
+        graph (CSRGraph): An undirected graph (every edge stored in both directions).
+
+    Output:
+        list: A list of [node1, node2, weight] edges of the MST, with the original vertex labels.
+    """
+    n = graph.num_nodes
+    if n == 0:
+        return []
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    labels = graph.labels
+
+    mst = []
+    min_cost = [float('Inf')] * n
+    parent = [-1] * n
+    included = bytearray(n)
+
+    #start with the first vertex, like next(iter(adj_list))
+    min_cost[0] = 0
+    priority_queue = [(0, 0)]
+
+    while priority_queue:
+        cost, u = heapq.heappop(priority_queue)
+        if included[u]:
+            continue
+        included[u] = 1
+
+        if parent[u] != -1:
+            mst.append([labels[parent[u]], labels[u], cost])
+
+        for slot in range(offsets[u], offsets[u + 1]):
+            neighbor = targets[slot]
+            cost = weights[slot]
+            if not included[neighbor] and cost < min_cost[neighbor]:
+                min_cost[neighbor] = cost
+                parent[neighbor] = u
+                heapq.heappush(priority_queue, (cost, neighbor))
+
+    return mst
+
 def main():
     adj_list = parse_graph('test.txt')
 
@@ -1,4 +1,13 @@
 #! usr/bin/env python3
+import heapq
+import os
+import sys
+
+#shared bulk integer reader lives in the Common folder at the root of the repo
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Common"))
+from int_reader import read_int_columns
+from streams import iter_rows, pipeline
+
 
 def parse_file(file_name):
     """
@@ -15,17 +24,11 @@ def parse_file(file_name):
             b) Each tuple contains (weight, length, weight/length ratio).
     """
 
-    jobs_diff = []
-    jobs_ratio = []
-    with open(file_name, 'r') as f:
-        #skip the first line
-        next(f)
-        for line in f:
-            weight, length = map(int, line.split())
-            diff = weight - length
-            ratio = weight /length
-            jobs_diff.append((weight, length, diff))
-            jobs_ratio.append((weight, length, ratio))
+    #read both columns in bulk, skipping the first line
+    _, (weights, lengths) = read_int_columns(file_name, 2, header_lines=1)
+    jobs = list(zip(weights.tolist(), lengths.tolist()))
+    jobs_diff = [(weight, length, weight - length) for weight, length in jobs]
+    jobs_ratio = [(weight, length, weight / length) for weight, length in jobs]
 
     return jobs_diff, jobs_ratio
 
@@ -64,12 +67,75 @@ def computeSumWeightsCompletion(sorted_jobs):
 
 
         # Update cumulative completion time with the current job's length
+        completion_time += length
         weighted_completion_time = weight *completion_time
 
         # Accumulate the total weighted completion time
         total_weight_comp_time +=weighted_completion_time
     return total_weight_comp_time
 
+def iter_jobs(file_name, criterion="diff"):
+    """
+    Streams the jobs of a job data file, one job per line read (constant memory).
+
+    Input:
+        file_name (str): The name of the text file containing job data (same format as parse_file).
+        criterion (str): "diff" for the weight-length difference, "ratio" for the weight/length ratio.
+
+    Output:
+        Iterator[Tuple[int, int, float]]: (weight, length, difference or ratio) for every job.
+    """
+    for weight, length in iter_rows(file_name, header_lines=1):
+        yield weight, length, (weight - length if criterion == "diff" else weight / length)
+
+
+def schedule_stream(jobs):
+    """
+    Schedules a stream of jobs in the order of schedule_job. Every job goes into a heap as soon as it
+    is read, so the jobs are ordered while the file is still being read, and the first job is
+    available right after the last one has been read.
+
+    Input:
+        jobs (Iterable[Tuple[int, int, float]]): Jobs as iter_jobs yields them.
+
+    Output:
+        Iterator[Tuple[int, int, float]]: The jobs in schedule order.
+    """
+    heap = []
+    for index, job in enumerate(jobs):
+        # same order as schedule_job; the index keeps equal jobs in input order
+        heapq.heappush(heap, (-job[2], -job[0], index, job))
+    while heap:
+        yield heapq.heappop(heap)[3]
+
+
+def completion_time_sums(scheduled_jobs):
+    """
+    Streams the running total weighted completion time of scheduled jobs.
+
+    Input:
+        scheduled_jobs (Iterable[Tuple[int, int, float]]): Jobs in schedule order.
+
+    Output:
+        Iterator[int]: The total weighted completion time after each job; the last value equals
+        computeSumWeightsCompletion.
+    """
+    completion_time = 0
+    total_weight_comp_time = 0
+    for weight, length, _ in scheduled_jobs:
+        completion_time += length
+        total_weight_comp_time += weight * completion_time
+        yield total_weight_comp_time
+
+
+def last(values):
+    """Consumes an iterator and returns its last value (None if it is empty)."""
+    value = None
+    for value in values:
+        pass
+    return value
+
+
 def main():
     """
     Main function to execute the scheduling algorithm for jobs.
@@ -86,5 +152,10 @@ def main():
     totalWeightDiff = print(f"Total sum weight for Diff: {computeSumWeightsCompletion(sorted_list_diff)}")
     totalWeightRatio = print(f"Total sum weight for Ratio: {computeSumWeightsCompletion(sorted_list_ratio)}")
 
+    # same computation as a pipeline: the jobs are streamed from the file into the scheduler
+    for criterion in ("diff", "ratio"):
+        total = pipeline(iter_jobs('jobs_data.txt', criterion), schedule_stream, completion_time_sums, last)
+        print(f"Total sum weight for {criterion} (streamed): {total}")
+
 if __name__ == '__main__':
     main()
\ No newline at end of file